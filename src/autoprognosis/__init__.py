@@ -8,6 +8,7 @@ import optuna
 
 # autoprognosis relative
 from . import logger  # noqa: F401
+from .utils.parallel import n_worker_threads
 
 optuna.logging.set_verbosity(optuna.logging.FATAL)
 optuna.logging.disable_propagation()
@@ -18,8 +19,12 @@ logger.add(sink=sys.stderr, level="CRITICAL")
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
-os.environ["OMP_NUM_THREADS"] = "2"
-os.environ["OPENBLAS_NUM_THREADS"] = "2"
-os.environ["MKL_NUM_THREADS"] = "2"
-os.environ["VECLIB_MAXIMUM_THREADS"] = "2"
-os.environ["NUMEXPR_NUM_THREADS"] = "2"
+# Inherited by the optimizer workers. The explicit settings are kept.
+for var in [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]:
+    os.environ.setdefault(var, str(n_worker_threads()))
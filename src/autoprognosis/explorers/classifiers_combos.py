@@ -1,5 +1,4 @@
 # stdlib
-import copy
 from typing import List, Optional, Tuple
 
 # third party
@@ -16,6 +15,7 @@ from autoprognosis.explorers.core.defaults import (
     default_feature_selection_names,
 )
 from autoprognosis.explorers.core.optimizer import EnsembleOptimizer
+from autoprognosis.explorers.core.warm_start import WarmStartStore
 from autoprognosis.hooks import DefaultHooks, Hooks
 import autoprognosis.logger as log
 from autoprognosis.plugins.ensemble.classifiers import (
@@ -24,6 +24,7 @@ from autoprognosis.plugins.ensemble.classifiers import (
     StackingEnsemble,
     WeightedEnsemble,
 )
+import autoprognosis.utils.serialization as serialization
 from autoprognosis.utils.tester import evaluate_estimator
 
 # autoprognosis relative
@@ -122,6 +123,16 @@ class EnsembleSeeker:
                 - 'gain'
         hooks: Hooks.
             Custom callbacks to be notified about the search progress.
+        progressive_search: bool.
+            Evaluate the base estimator trials on a successive-halving schedule of nested stratified subsets of the data, up to the full data. Requires the "bayesian" optimizer.
+        min_search_sample_size: int.
+            Size of the smallest subset, if `progressive_search` is True.
+        sample_growth_rate: int.
+            Growth rate of the subsets, if `progressive_search` is True.
+        time_budget: Optional int.
+            Wall-clock budget(seconds) of the base estimators search, shared by all the estimators instead of the per-estimator "timeout".
+        warm_start_store: Optional WarmStartStore.
+            Store of the best configurations of past searches, used for warm-starting the base estimators search.
         random_state: int:
             Random seed
     """
@@ -142,6 +153,11 @@ class EnsembleSeeker:
         imputers: List[str] = [],
         hooks: Hooks = DefaultHooks(),
         optimizer_type: str = "bayesian",
+        progressive_search: bool = False,
+        min_search_sample_size: int = 1000,
+        sample_growth_rate: int = 3,
+        time_budget: Optional[int] = None,
+        warm_start_store: Optional[WarmStartStore] = None,
         random_state: int = 0,
     ) -> None:
         ensemble_size = min(ensemble_size, len(classifiers))
@@ -169,6 +185,11 @@ class EnsembleSeeker:
             hooks=hooks,
             imputers=imputers,
             optimizer_type=optimizer_type,
+            progressive_search=progressive_search,
+            min_search_sample_size=min_search_sample_size,
+            sample_growth_rate=sample_growth_rate,
+            time_budget=time_budget,
+            warm_start_store=warm_start_store,
             random_state=self.random_state,
         )
 
@@ -202,7 +223,7 @@ class EnsembleSeeker:
 
             local_fold = []
             for estimator in ensemble:
-                model = copy.deepcopy(estimator)
+                model = serialization.clone_model(estimator)
                 model.fit(X_train, Y_train)
                 local_fold.append(model)
             folds.append(local_fold)
@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, Callable, List, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
 # third party
 from pydantic import validate_arguments
@@ -18,7 +18,12 @@ class Optimizer:
         optimizer_type: str = "bayesian",
         n_trials: int = 50,  # bayesian: number of trials
         timeout: int = 60,  # bayesian: timeout per search
-        eta: int = 3,  # hyperband: defines configuration downsampling rate (default = 3)
+        n_rungs: int = 1,  # bayesian: number of data rungs per trial, for successive halving
+        eta: int = 3,  # bayesian/hyperband: defines configuration downsampling rate (default = 3)
+        fold_pruner: str = "median",  # bayesian: pruner of the per-fold scores
+        warm_start_trials: list = [],  # bayesian: trials of a previous run to resume
+        baseline_score: Optional[float] = None,  # bayesian: known default score
+        warm_start_configs: List[dict] = [],  # bayesian: configurations to try first
         random_state: int = 0,
     ):
         if optimizer_type not in ["bayesian", "hyperband"]:
@@ -31,6 +36,12 @@ class Optimizer:
                 evaluation_cbk=evaluation_cbk,
                 n_trials=n_trials,
                 timeout=timeout,
+                n_rungs=n_rungs,
+                eta=eta,
+                fold_pruner=fold_pruner,
+                warm_start_trials=warm_start_trials,
+                baseline_score=baseline_score,
+                warm_start_configs=warm_start_configs,
                 random_state=random_state,
             )
         elif optimizer_type == "hyperband":
@@ -49,6 +60,14 @@ class Optimizer:
     ) -> Tuple[List[float], List[dict]]:
         return self.optimizer.evaluate()
 
+    def trials(self) -> list:
+        """The trials of the last evaluation, for resuming it."""
+        return getattr(self.optimizer, "trials", [])
+
+    def stopped(self) -> bool:
+        """If the last evaluation stopped early, instead of running out of trials or time."""
+        return getattr(self.optimizer, "stopped", True)
+
 
 class EnsembleOptimizer:
     def __init__(
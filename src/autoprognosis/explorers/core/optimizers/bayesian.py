@@ -1,6 +1,6 @@
 # stdlib
 import copy
-from typing import Any, Callable, List, Optional, Tuple
+from typing import Any, Callable, List, Optional, Set, Tuple
 
 # third party
 import numpy as np
@@ -9,6 +9,7 @@ from pydantic import validate_arguments
 
 # autoprognosis absolute
 import autoprognosis.logger as log
+from autoprognosis.plugins.core.params import ConfigKey, Params, config_key
 from autoprognosis.utils.redis import RedisBackend
 
 threshold = 100
@@ -19,16 +20,33 @@ class EarlyStoppingExceeded(optuna.exceptions.OptunaError):
     pass
 
 
+def report_intermediate_score(
+    trial: Optional[optuna.trial.Trial], score: float, step: int
+) -> None:
+    """Report an intermediate score of a trial, e.g. after a cross-validation fold, and raise `optuna.exceptions.TrialPruned` if the study pruner stops the trial."""
+    if trial is None:
+        return
+
+    trial.report(score, step)
+    if trial.should_prune():
+        raise optuna.exceptions.TrialPruned()
+
+
 class ParamRepeatPruner:
-    """Prunes reapeated trials, which means trials with the same paramters won't waste time/resources."""
+    """Prunes reapeated trials, which means trials with the same paramters won't waste time/resources.
+
+    The trials are compared by their `config_key`: with the hyperparameter `space`, the floats closer than the resolution of their `Params` are repeats.
+    """
 
     def __init__(
         self,
         study: optuna.study.Study,
         patience: int,
+        space: Optional[List[Params]] = None,
     ) -> None:
         self.study = study
-        self.seen: set = set()
+        self.space = space
+        self.seen: Set[ConfigKey] = set()
 
         self.best_score: float = -1
         self.no_improvement_for = 0
@@ -46,7 +64,13 @@ class ParamRepeatPruner:
                 self.no_improvement_for = 0
             else:
                 self.no_improvement_for += 1
-            self.seen.add(hash(frozenset(trial_past.params.items())))
+            self.seen.add(config_key(trial_past.params, self.space))
+
+        # Pruned trials only have partial scores: they are not retried, but do not set the best score.
+        for trial_past in self.study.get_trials(
+            states=[optuna.trial.TrialState.PRUNED]
+        ):
+            self.seen.add(config_key(trial_past.params, self.space))
 
     def check_patience(
         self,
@@ -61,13 +85,11 @@ class ParamRepeatPruner:
     ) -> None:
         self.check_patience(trial)
 
-        params = frozenset(trial.params.items())
-
-        current_val = hash(params)
-        if current_val in self.seen:
+        key = config_key(trial.params, self.space)
+        if key in self.seen:
             raise optuna.exceptions.TrialPruned()
 
-        self.seen.add(current_val)
+        self.seen.add(key)
 
     def report_score(self, score: float) -> None:
         if score > self.best_score:
@@ -76,6 +98,9 @@ class ParamRepeatPruner:
         else:
             self.no_improvement_for += 1
 
+    def report_pruned(self) -> None:
+        self.no_improvement_for += 1
+
 
 class BayesianOptimizer:
     """Optimization helper based on Bayesian Optimization.
@@ -83,6 +108,18 @@ class BayesianOptimizer:
     Args:
         patience: int
             maximum iterations without any gain
+        n_rungs: int
+            Number of data rungs each trial is evaluated on. With more than one rung, the evaluation callback receives a `search_rung` argument for all but the last rung (the full data), and the unpromising trials are pruned using successive halving.
+        eta: int
+            Reduction factor of the successive halving, matching the growth rate of the data rungs.
+        fold_pruner: str
+            "median", "percentile" or "none". Pruner applied to the per-fold intermediate scores, when the trials are evaluated on the full data (`n_rungs` == 1). The evaluation callback receives the optuna trial as a `trial` argument, and reports the scores using `report_intermediate_score`.
+        warm_start_trials: list
+            Trials of a previous run of the same search, resumed by this one. Ignored if the study storage already has trials.
+        baseline_score: Optional float
+            Score of the default configuration, if already evaluated.
+        warm_start_configs: list
+            Configurations evaluated first, e.g. the best ones from past searches on similar datasets.
         random_state: int
             random seed
     """
@@ -97,8 +134,17 @@ class BayesianOptimizer:
         n_trials: int = 50,
         timeout: int = 60,
         skip_recap: bool = False,
+        n_rungs: int = 1,
+        eta: int = 3,
+        fold_pruner: str = "median",
+        warm_start_trials: list = [],
+        baseline_score: Optional[float] = None,
+        warm_start_configs: List[dict] = [],
         random_state: int = 0,
     ):
+        if fold_pruner not in ["median", "percentile", "none"]:
+            raise ValueError(f"Invalid fold pruner {fold_pruner}")
+
         self.study_name = study_name
         self.estimator = estimator
         self.ensemble_len = ensemble_len
@@ -106,8 +152,18 @@ class BayesianOptimizer:
         self.n_trials = n_trials
         self.timeout = timeout
         self.skip_recap = skip_recap
+        self.n_rungs = n_rungs
+        self.eta = eta
+        self.fold_pruner = fold_pruner
+        self.warm_start_trials = warm_start_trials
+        self.baseline_score = baseline_score
+        self.warm_start_configs = warm_start_configs
         self.random_state = random_state
 
+        # State of the last search, used for resuming it.
+        self.trials: list = []
+        self.stopped = False
+
     def create_study(
         self,
         study_name: str,
@@ -141,6 +197,23 @@ class BayesianOptimizer:
                 storage_obj = None
 
         sampler = optuna.samplers.TPESampler(seed=self.random_state)
+
+        # The intermediate values are reported at step eta ** rung, the relative size of the rung data.
+        # Otherwise, they are the running means of the fold scores, reported at step fold.
+        optuna_pruner: optuna.pruners.BasePruner = optuna.pruners.NopPruner()
+        if self.n_rungs > 1:
+            optuna_pruner = optuna.pruners.SuccessiveHalvingPruner(
+                min_resource=1, reduction_factor=self.eta
+            )
+        elif self.fold_pruner == "median":
+            optuna_pruner = optuna.pruners.MedianPruner(
+                n_startup_trials=5, n_warmup_steps=1
+            )
+        elif self.fold_pruner == "percentile":
+            optuna_pruner = optuna.pruners.PercentilePruner(
+                25.0, n_startup_trials=5, n_warmup_steps=1
+            )
+
         try:
             study = optuna.create_study(
                 direction=direction,
@@ -148,6 +221,7 @@ class BayesianOptimizer:
                 storage=storage_obj,
                 load_if_exists=load_if_exists,
                 sampler=sampler,
+                pruner=optuna_pruner,
             )
         except BaseException as e:
             log.debug(f"create_study failed {e}")
@@ -155,9 +229,17 @@ class BayesianOptimizer:
                 direction=direction,
                 study_name=study_name,
                 sampler=sampler,
+                pruner=optuna_pruner,
             )
 
-        return study, ParamRepeatPruner(study, patience=patience)
+        if len(self.warm_start_trials) > 0 and len(study.trials) == 0:
+            study.add_trials(self.warm_start_trials)
+
+        space = None
+        if self.estimator is not None:
+            space = self.estimator.hyperparameter_space()
+
+        return study, ParamRepeatPruner(study, patience=patience, space=space)
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def evaluate(
@@ -167,7 +249,12 @@ class BayesianOptimizer:
             raise ValueError("Invalid estimator")
         study, pruner = self.create_study(study_name=self.study_name)
 
-        baseline_score = self.evaluation_cbk()
+        self.trials = []
+        self.stopped = True
+
+        baseline_score = self.baseline_score
+        if baseline_score is None:
+            baseline_score = self.evaluation_cbk()
         pruner.report_score(baseline_score)
 
         log.info(f"baseline score for {self.estimator.name()} {baseline_score}")
@@ -175,20 +262,38 @@ class BayesianOptimizer:
         if len(self.estimator.hyperparameter_space()) == 0:
             return [baseline_score], [{}]
 
+        for config in self.warm_start_configs:
+            study.enqueue_trial(config, skip_if_exists=True)
+
         def objective(trial: optuna.Trial) -> float:
             args = self.estimator.sample_hyperparameters(trial)
             pruner.check_trial(trial)
 
-            score = self.evaluation_cbk(**args)
+            try:
+                for rung in range(self.n_rungs - 1):
+                    rung_score = self.evaluation_cbk(search_rung=rung, **args)
+                    report_intermediate_score(trial, rung_score, self.eta**rung)
+
+                if self.n_rungs > 1:
+                    score = self.evaluation_cbk(**args)
+                else:
+                    score = self.evaluation_cbk(trial=trial, **args)
+            except optuna.exceptions.TrialPruned:
+                pruner.report_pruned()
+                raise
 
             pruner.report_score(score)
 
             return score
 
+        self.stopped = False
         try:
             study.optimize(objective, n_trials=self.n_trials, timeout=self.timeout)
         except EarlyStoppingExceeded:
             log.info("Early stopping triggered for search")
+            self.stopped = True
+
+        self.trials = study.get_trials(deepcopy=False)
 
         scores = [baseline_score]
         params = [{}]
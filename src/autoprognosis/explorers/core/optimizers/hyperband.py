@@ -1,7 +1,6 @@
 # stdlib
-import json
 import math
-from typing import Any, Callable, List, Optional, Set, Tuple
+from typing import Any, Callable, List, Optional, Set, Tuple, Union
 
 # third party
 import numpy as np
@@ -9,6 +8,7 @@ from pydantic import validate_arguments
 
 # autoprognosis absolute
 import autoprognosis.logger as log
+from autoprognosis.plugins.core.params import ConfigKey, config_key
 
 EPS = 1e-8
 
@@ -62,25 +62,32 @@ class HyperbandOptimizer:
         self._reset()
 
     def _reset(self) -> None:
-        self.visited: Set[str] = set()
+        self.visited: Set[ConfigKey] = set()
+        self.space = None
+        if self.estimator is not None:
+            self.space = self.estimator.hyperparameter_space()
 
-    def _hash_dict(self, dict_val: dict) -> str:
-        return json.dumps(dict_val, sort_keys=True, cls=NpEncoder)
+    def _config_key(self, params: Union[dict, np.ndarray]) -> ConfigKey:
+        if not isinstance(params, dict):
+            params = {f"weight_{idx}": weight for idx, weight in enumerate(params)}
+
+        return config_key(params, self.space)
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def _sample(self, n: int) -> list:
-        configurations = []
+        # The candidates are drawn in one batch, and the duplicates are dropped.
+        if self.estimator is not None:
+            candidates = self.estimator.sample_hyperparameters_np_batch(n)
+        elif self.ensemble_len is not None:
+            weights = np.random.rand(n, self.ensemble_len)
+            candidates = list(weights / (weights.sum(axis=1, keepdims=True) + EPS))
+        else:
+            raise RuntimeError("need to provide estimator of ensemble len")
 
-        for t in range(n):
-            if self.estimator is not None:
-                params = self.estimator.sample_hyperparameters_np()
-            elif self.ensemble_len is not None:
-                params = np.random.rand(self.ensemble_len)
-                params = params / (np.sum(params) + EPS)
-            else:
-                raise RuntimeError("need to provide estimator of ensemble len")
+        configurations = []
 
-            hashed = self._hash_dict(params)
+        for params in candidates:
+            hashed = self._config_key(params)
 
             if hashed in self.visited:
                 continue
@@ -199,15 +206,3 @@ class HyperbandOptimizer:
 
         return score, out_weights
 
-
-class NpEncoder(json.JSONEncoder):
-    def default(self, obj: Any) -> Any:
-        if isinstance(obj, np.integer):
-            return int(obj)
-        if isinstance(obj, np.floating):
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, np.bool):
-            return int(obj)
-        return super(NpEncoder, self).default(obj)
@@ -0,0 +1,66 @@
+# stdlib
+from typing import List, Optional
+
+# third party
+import numpy as np
+import pandas as pd
+
+
+class DataSchedule:
+    """Successive-halving data schedule for the hyperparameter search.
+
+    The search data is split in nested, stratified subsets, growing by a factor of `eta` from `min_size` rows up to the full data. A trial is evaluated on the rungs in order, and the optimizer prunes it after any rung where it is not promising, so only the surviving configurations pay for the larger subsets.
+
+    Args:
+        Y: pd.Series
+            The labels used for the stratification: the classes for classification, the event indicator for risk estimation.
+        min_size: int
+            Number of rows in the first rung.
+        eta: int
+            Growth rate of the rungs, and reduction factor of the surviving trials.
+        random_state: int
+            Random seed
+    """
+
+    def __init__(
+        self,
+        Y: pd.Series,
+        min_size: int = 1000,
+        eta: int = 3,
+        random_state: int = 0,
+    ) -> None:
+        if min_size <= 0 or eta <= 1:
+            raise ValueError(
+                f"invalid schedule min_size = {min_size}, eta = {eta}. min_size should be positive and eta greater than 1"
+            )
+
+        labels = np.asarray(Y)
+        n = len(labels)
+        rng = np.random.default_rng(random_state)
+
+        # A row's key is its (jittered) relative rank within its class, so any prefix of the order keeps the class ratios.
+        keys = np.empty(n)
+        for label in np.unique(labels):
+            pos = np.flatnonzero(labels == label)
+            ranks = rng.permutation(len(pos))
+            keys[pos] = (ranks + rng.uniform(size=len(pos))) / len(pos)
+
+        self.order = np.argsort(keys, kind="stable")
+        self.eta = eta
+
+        self.sizes: List[int] = []
+        size = min_size
+        while size < n:
+            self.sizes.append(size)
+            size *= eta
+        self.sizes.append(n)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def subset(self, rung: Optional[int] = None) -> np.ndarray:
+        """Positional indices of the rows in a rung, in the original order. The last rung, or `None`, is the full data."""
+        if rung is None or rung >= len(self.sizes) - 1:
+            return np.arange(len(self.order))
+
+        return np.sort(self.order[: self.sizes[rung]])
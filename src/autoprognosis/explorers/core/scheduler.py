@@ -0,0 +1,206 @@
+# stdlib
+import itertools
+import math
+import time
+from typing import Any, Callable, Collection, Dict, List, Optional
+
+# third party
+import numpy as np
+
+# autoprognosis absolute
+from autoprognosis.hooks import Hooks
+
+MIN_SLICE_DURATION = 5
+
+
+class EstimatorSearchState:
+    """Progress of the hyperparameter search of one estimator, carried between the time slices of a budgeted search."""
+
+    def __init__(self) -> None:
+        self.trials: list = []
+        self.baseline_score: Optional[float] = None
+        self.scores: List[float] = []
+        self.params: List[dict] = []
+        self.finished = False
+        self.duration = 0.0
+
+    def update(
+        self,
+        scores: List[float],
+        params: List[dict],
+        trials: list,
+        finished: bool,
+        duration: float,
+    ) -> None:
+        self.baseline_score = scores[0]
+        self.scores = scores
+        self.params = params
+        self.trials = trials
+        self.finished = finished
+        self.duration = duration
+
+    def best_score(self) -> float:
+        if len(self.scores) == 0:
+            return -np.inf
+
+        return max(self.scores)
+
+
+class BudgetScheduler:
+    """Bandit over the estimators of a search, sharing a single wall-clock budget.
+
+    The search runs in time slices. Whenever a worker is free, it goes to the estimator with the highest upper confidence bound on its improvement rate, which is the gain of its best score per second of search, among the estimators not being searched. The estimators not searched yet come first. An estimator is retired once its search is finished, i.e. it ran out of trials or stopped early.
+
+    Args:
+        names: list
+            The estimator names.
+        budget: float
+            Wall-clock budget, in seconds. A slice which starts before the deadline can overrun it by the duration of one trial.
+        n_workers: int
+            Number of estimators searched in parallel.
+        slice_duration: Optional float
+            Duration of a time slice, in seconds. Defaults to a quarter of the time each estimator would get from an even split of the budget.
+        exploration: float
+            Weight of the exploration term of the upper confidence bound.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        budget: float,
+        n_workers: int,
+        slice_duration: Optional[float] = None,
+        exploration: float = 1.0,
+    ) -> None:
+        self.names = names
+        self.budget = budget
+        self.n_workers = max(1, n_workers)
+        self.exploration = exploration
+
+        if slice_duration is None:
+            n_rounds = math.ceil(len(names) / self.n_workers)
+            slice_duration = max(MIN_SLICE_DURATION, budget / (4 * n_rounds))
+        self.slice_duration = slice_duration
+
+        self.start = time.time()
+        self.pulls = np.zeros(len(names))
+        self.spent = np.zeros(len(names))
+        self.rates: List[List[float]] = [[] for _ in names]
+        self.best = np.full(len(names), -np.inf)
+        self.retired: set = set()
+
+    def remaining(self) -> float:
+        return max(0.0, self.budget - (time.time() - self.start))
+
+    def done(self) -> bool:
+        return self.remaining() <= 0 or len(self.retired) == len(self.names)
+
+    def _ucb(self, idx: int) -> float:
+        if self.pulls[idx] == 0:
+            return np.inf
+
+        scale = max([abs(rate) for rates in self.rates for rate in rates] + [1e-8])
+        exploit = np.mean(self.rates[idx]) / scale
+        explore = np.sqrt(2 * np.log(self.pulls.sum()) / self.pulls[idx])
+
+        return exploit + self.exploration * explore
+
+    def allocate(self, running: Collection[int] = ()) -> Dict[int, float]:
+        """The time slices of the free workers, by estimator index.
+
+        Args:
+            running: list
+                The estimators being searched, which hold a worker each and are skipped.
+        """
+        active = [
+            idx
+            for idx in range(len(self.names))
+            if idx not in self.retired and idx not in running
+        ]
+        ranked = sorted(active, key=lambda idx: -self._ucb(idx))
+
+        duration = min(self.slice_duration, self.remaining())
+
+        return {idx: duration for idx in ranked[: self.n_workers - len(running)]}
+
+    def update(self, idx: int, state: EstimatorSearchState) -> None:
+        best = state.best_score()
+        previous = self.best[idx]
+        if self.pulls[idx] == 0 and state.baseline_score is not None:
+            previous = state.baseline_score
+
+        self.rates[idx].append(max(0, best - previous) / max(state.duration, 1e-8))
+        self.pulls[idx] += 1
+        self.spent[idx] += state.duration
+        self.best[idx] = best
+
+        if state.finished:
+            self.retired.add(idx)
+
+    def allocation(self) -> Dict[str, Any]:
+        """Summary of the budget allocation, for the hooks."""
+        return {
+            "remaining": self.remaining(),
+            "searched": {
+                name: float(self.spent[idx]) for idx, name in enumerate(self.names)
+            },
+            "retired": [self.names[idx] for idx in sorted(self.retired)],
+        }
+
+
+def budgeted_search(
+    scheduler: BudgetScheduler,
+    search_slice: Callable,
+    dispatcher: Any,
+    hooks: Hooks,
+    topic: str,
+    **kwargs: Any,
+) -> List[EstimatorSearchState]:
+    """Run the searches of all the estimators within the budget of `scheduler`. The slices are dispatched one at a time: each worker which finishes a slice gets the next one, without waiting for the other workers.
+
+    Args:
+        scheduler: BudgetScheduler
+            The budget allocation.
+        search_slice: Callable
+            `search_slice(idx, state, duration)` returns the delayed joblib call, which resumes the search of the estimator `idx` from `state` for `duration` seconds and returns the new state.
+        dispatcher: MemoryAwareDispatcher
+            The dispatcher of the slices.
+        hooks: Hooks
+            Notified of the budget allocation before each slice.
+        topic: str
+            The topic of the heartbeats.
+
+    Returns:
+        The search states, by estimator index.
+    """
+    states = [EstimatorSearchState() for _ in scheduler.names]
+    positions = itertools.count()
+    running: Dict[int, int] = {}
+
+    def next_slice() -> Any:
+        if scheduler.done():
+            return None
+
+        slices = scheduler.allocate(running.values())
+        if len(slices) == 0:
+            return None
+
+        idx, duration = next(iter(slices.items()))
+        hooks.heartbeat(
+            topic=topic,
+            subtopic="model_search",
+            event_type="allocation",
+            slices={scheduler.names[idx]: duration},
+            **scheduler.allocation(),
+            **kwargs,
+        )
+        running[next(positions)] = idx
+
+        return search_slice(idx, states[idx], duration)
+
+    for position, state in dispatcher.as_completed(next_slice):
+        idx = running.pop(position)
+        states[idx] = state
+        scheduler.update(idx, state)
+
+    return states
@@ -148,9 +148,20 @@ class PipelineSelector:
 
         return result
 
+    def sample_hyperparameters_np_batch(self, n: int) -> List[Dict]:
+        """Draw `n` configurations at once."""
+        return params.sample_np_configs(self.hyperparameter_space(), n)
+
     def name(self) -> str:
         return self.classifier.name()
 
+    def memory_footprint(self, n_rows: int, n_features: int) -> int:
+        """Estimated peak memory of fitting the pipeline, in bytes: the largest footprint of its stages."""
+        stages = [self.classifier] + self.imputers + self.feature_scaling
+        stages += self.feature_selection
+
+        return max(stage.memory_footprint(n_rows, n_features) for stage in stages)
+
     def get_pipeline_template(
         self, search_domains: List[params.Params], hyperparams: List
     ) -> Tuple[List, Dict]:
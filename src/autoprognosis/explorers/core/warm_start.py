@@ -0,0 +1,206 @@
+# stdlib
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# third party
+from filelock import FileLock, Timeout
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+import autoprognosis.plugins.core.params as params
+from autoprognosis.utils.serialization import load_from_file, save_to_file
+
+META_FEATURES = ["rows", "columns", "missingness", "class_balance", "censoring_rate"]
+
+# Seconds to wait for the other studies updating the store.
+LOCK_TIMEOUT = 60
+
+
+def dataset_meta_features(
+    X: pd.DataFrame, Y: pd.Series, censoring: bool = False
+) -> Dict[str, float]:
+    """Meta-features describing a dataset, for finding the past searches on similar ones.
+
+    Args:
+        X: pd.DataFrame
+            The covariates
+        Y: pd.Series
+            The labels, or the event indicator if `censoring` is True.
+        censoring: bool
+            If `Y` is an event indicator.
+    """
+    frequencies = Y.value_counts(normalize=True)
+
+    return {
+        "rows": float(np.log10(max(len(X), 1))),
+        "columns": float(np.log10(max(X.shape[1], 1))),
+        "missingness": float(X.isnull().values.mean()) if X.size > 0 else 0.0,
+        "class_balance": float(frequencies.min()) if len(frequencies) > 0 else 0.0,
+        "censoring_rate": float(1 - (Y == 1).mean()) if censoring else 0.0,
+    }
+
+
+def _in_space(value: Any, param: params.Params) -> bool:
+    if isinstance(param, params.Float):
+        return param.low <= value <= param.high
+
+    return value in param.choices
+
+
+class WarmStartStore:
+    """Meta-learning store of the best hyperparameters found by past searches.
+
+    For each search, the store keeps the top configurations of every estimator, together with the meta-features of the dataset: rows and columns(log10 scale), missingness, class balance and censoring rate. A new search starts with the best configurations of the nearest past datasets, so a retraining on a slightly changed dataset does not search from scratch.
+
+    Args:
+        path: Path
+            The store file.
+        n_configs: int
+            Number of configurations kept for each estimator of a search.
+        max_records: int
+            Maximum number of searches kept in the store. The oldest ones are dropped first.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        n_configs: int = 5,
+        max_records: int = 200,
+    ) -> None:
+        self.path = Path(path)
+        self.n_configs = n_configs
+        self.max_records = max_records
+
+    def _load(self) -> List[Dict]:
+        if not self.path.is_file():
+            return []
+
+        try:
+            return load_from_file(self.path)
+        except BaseException as e:
+            log.error(f"failed to load the warm start store {self.path}: {e}")
+            return []
+
+    def _lock(self) -> FileLock:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return FileLock(str(self.path) + ".lock", timeout=LOCK_TIMEOUT)
+
+    def _save(self, records: List[Dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Readers never see a partial file.
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        save_to_file(tmp_path, records)
+        os.replace(tmp_path, self.path)
+
+    def add(
+        self,
+        key: str,
+        meta_features: Dict[str, float],
+        estimator: str,
+        scores: List[float],
+        configs: List[dict],
+        horizon: Optional[int] = None,
+    ) -> None:
+        """Record the results of the search of `estimator`, for the dataset `key`. A previous record for the same dataset, estimator and horizon is replaced. The update holds a file lock, so the studies sharing the store do not overwrite each other.
+
+        Args:
+            key: str
+                The dataset ID, e.g. the study name.
+            meta_features: dict
+                The dataset meta-features, from `dataset_meta_features`.
+            estimator: str
+                The estimator name.
+            scores: list
+                The scores of the evaluated configurations.
+            configs: list
+                The evaluated configurations.
+            horizon: int
+                The time horizon of the search, for the risk estimation.
+        """
+        top = [
+            (score, config)
+            for score, config in sorted(
+                zip(scores, configs), key=lambda item: -item[0]
+            )
+            if len(config) > 0
+        ][: self.n_configs]
+        if len(top) == 0:
+            return
+
+        try:
+            with self._lock():
+                records = [
+                    record
+                    for record in self._load()
+                    if record["key"] != key
+                    or record["estimator"] != estimator
+                    or record.get("horizon") != horizon
+                ]
+                records.append(
+                    {
+                        "key": key,
+                        "estimator": estimator,
+                        "meta_features": meta_features,
+                        "configs": top,
+                        "horizon": horizon,
+                    }
+                )
+
+                self._save(records[-self.max_records :])
+        except Timeout:
+            log.error(f"failed to lock the warm start store {self.path}")
+
+    def suggest(
+        self,
+        meta_features: Dict[str, float],
+        estimator: str,
+        space: Optional[List[params.Params]] = None,
+        n_neighbours: int = 3,
+        horizon: Optional[int] = None,
+    ) -> List[dict]:
+        """The best configurations of `estimator` on the nearest past datasets, best first. Only the searches for the same `horizon` are used.
+
+        Args:
+            meta_features: dict
+                The meta-features of the new dataset.
+            estimator: str
+                The estimator name.
+            space: list
+                Optional hyperparameter space of the new search. The hyperparameters missing from it, or out of its bounds, are dropped from the configurations.
+            n_neighbours: int
+                Number of past datasets to use.
+            horizon: int
+                The time horizon of the search, for the risk estimation.
+        """
+        target = np.asarray([meta_features[name] for name in META_FEATURES])
+
+        candidates = []
+        for record in self._load():
+            if record["estimator"] != estimator or record.get("horizon") != horizon:
+                continue
+
+            past = np.asarray([record["meta_features"][name] for name in META_FEATURES])
+            candidates.append((np.linalg.norm(target - past), record))
+
+        candidates = sorted(candidates, key=lambda item: item[0])[:n_neighbours]
+
+        space_by_name = {param.name: param for param in space or []}
+
+        result: List[dict] = []
+        for _, record in candidates:
+            for _, config in record["configs"]:
+                if space is not None:
+                    config = {
+                        name: value
+                        for name, value in config.items()
+                        if name in space_by_name
+                        and _in_space(value, space_by_name[name])
+                    }
+                if len(config) > 0 and config not in result:
+                    result.append(config)
+
+        return result
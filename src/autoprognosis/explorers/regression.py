@@ -1,10 +1,11 @@
 # stdlib
 import time
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 # third party
-from joblib import Parallel, delayed
+from joblib import delayed
 import numpy as np
+import optuna
 import pandas as pd
 from pydantic import validate_arguments
 
@@ -16,13 +17,18 @@ from autoprognosis.explorers.core.defaults import (
     default_regressors_names,
 )
 from autoprognosis.explorers.core.optimizer import Optimizer
+from autoprognosis.explorers.core.optimizers.bayesian import report_intermediate_score
 from autoprognosis.explorers.core.selector import PipelineSelector
 from autoprognosis.hooks import DefaultHooks, Hooks
 import autoprognosis.logger as log
-from autoprognosis.utils.parallel import n_opt_jobs
+from autoprognosis.utils.parallel import MemoryAwareDispatcher, budgeted, n_opt_jobs
+import autoprognosis.utils.profiling as profiling
+from autoprognosis.utils.shared import attach, broadcast
 from autoprognosis.utils.tester import evaluate_regression
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=n_opt_jobs())
+dispatcher = MemoryAwareDispatcher(
+    max_nbytes=None, backend="loky", n_jobs=n_opt_jobs()
+)
 
 
 class RegressionSeeker:
@@ -160,16 +166,34 @@ class RegressionSeeker:
     ) -> Tuple[List[float], List[float]]:
         self._should_continue()
 
-        def evaluate_args(**kwargs: Any) -> float:
+        X, Y, group_ids = attach(X), attach(Y), attach(group_ids)
+
+        def evaluate_args(
+            trial: Optional[optuna.trial.Trial] = None, **kwargs: Any
+        ) -> float:
             self._should_continue()
 
             start = time.time()
 
+            fold_scores: List[float] = []
+
+            def report_fold(fold: int, scores: Dict) -> None:
+                fold_scores.append(scores[self.metric])
+                report_intermediate_score(trial, np.mean(fold_scores), fold)
+
             model = estimator.get_pipeline_from_named_args(**kwargs)
             try:
-                metrics = evaluate_regression(
-                    model, X, Y, self.n_folds_cv, group_ids=group_ids
-                )
+                with profiling.record() as timings:
+                    metrics = evaluate_regression(
+                        model,
+                        X,
+                        Y,
+                        self.n_folds_cv,
+                        group_ids=group_ids,
+                        fold_callback=report_fold if trial is not None else None,
+                    )
+            except optuna.exceptions.TrialPruned:
+                raise
             except BaseException as e:
                 log.error(f"evaluate_regression failed: {e}")
 
@@ -183,6 +207,14 @@ class RegressionSeeker:
                 eval_metrics[metric] = metrics["raw"][metric][0]
                 eval_metrics[f"{metric}_str"] = metrics["str"][metric]
 
+            self.hooks.heartbeat(
+                topic="regression",
+                subtopic="model_search",
+                event_type="timings",
+                scope="trial",
+                name=model.name(),
+                timings=timings.summary(),
+            )
             self.hooks.heartbeat(
                 topic="regression",
                 subtopic="model_search",
@@ -204,7 +236,19 @@ class RegressionSeeker:
             timeout=self.timeout,
             random_state=self.random_state,
         )
-        return study.evaluate()
+        with profiling.record(reuse=True) as timings:
+            result = study.evaluate()
+
+        self.hooks.heartbeat(
+            topic="regression",
+            subtopic="model_search",
+            event_type="timings",
+            scope="estimator",
+            name=estimator.name(),
+            timings=timings.summary(),
+        )
+
+        return result
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def search(
@@ -212,12 +256,19 @@ class RegressionSeeker:
     ) -> List:
         self._should_continue()
 
-        search_results = dispatcher(
-            delayed(self.search_best_args_for_estimator)(
-                estimator, X, Y, group_ids=group_ids
+        # The workers map the data from shared files, instead of a copy per task.
+        with broadcast(X, Y, group_ids, enabled=n_opt_jobs() > 1) as shared:
+            X_shared, Y_shared, group_ids_shared = shared
+
+            search_results = dispatcher(
+                delayed(
+                    budgeted(
+                        self.search_best_args_for_estimator,
+                        memory=estimator.memory_footprint(*X.shape),
+                    )
+                )(estimator, X_shared, Y_shared, group_ids=group_ids_shared)
+                for estimator in self.estimators
             )
-            for estimator in self.estimators
-        )
 
         all_scores = []
         all_args = []
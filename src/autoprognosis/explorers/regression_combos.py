@@ -1,5 +1,4 @@
 # stdlib
-import copy
 from typing import List, Optional, Tuple
 
 # third party
@@ -22,6 +21,7 @@ from autoprognosis.plugins.ensemble.regression import (
     BaseRegressionEnsemble,
     WeightedRegressionEnsemble,
 )
+import autoprognosis.utils.serialization as serialization
 from autoprognosis.utils.tester import evaluate_regression
 
 # autoprognosis relative
@@ -175,7 +175,7 @@ class RegressionEnsembleSeeker:
 
             local_fold = []
             for estimator in ensemble:
-                model = copy.deepcopy(estimator)
+                model = serialization.clone_model(estimator)
                 model.fit(X_train, Y_train)
                 local_fold.append(model)
             folds.append(local_fold)
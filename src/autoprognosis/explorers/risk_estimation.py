@@ -1,11 +1,12 @@
 # stdlib
 import time
 import traceback
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 # third party
-from joblib import Parallel, delayed
+from joblib import delayed
 import numpy as np
+import optuna
 import pandas as pd
 from pydantic import validate_arguments
 
@@ -17,13 +18,28 @@ from autoprognosis.explorers.core.defaults import (
     default_risk_estimation_names,
 )
 from autoprognosis.explorers.core.optimizer import Optimizer
+from autoprognosis.explorers.core.optimizers.bayesian import report_intermediate_score
+from autoprognosis.explorers.core.schedule import DataSchedule
+from autoprognosis.explorers.core.scheduler import (
+    BudgetScheduler,
+    EstimatorSearchState,
+    budgeted_search,
+)
 from autoprognosis.explorers.core.selector import PipelineSelector
+from autoprognosis.explorers.core.warm_start import (
+    WarmStartStore,
+    dataset_meta_features,
+)
 from autoprognosis.hooks import DefaultHooks, Hooks
 import autoprognosis.logger as log
-from autoprognosis.utils.parallel import n_opt_jobs
+from autoprognosis.utils.parallel import MemoryAwareDispatcher, budgeted, n_opt_jobs
+import autoprognosis.utils.profiling as profiling
+from autoprognosis.utils.shared import attach, broadcast
 from autoprognosis.utils.tester import evaluate_survival_estimator
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=n_opt_jobs())
+dispatcher = MemoryAwareDispatcher(
+    max_nbytes=None, backend="loky", n_jobs=n_opt_jobs()
+)
 
 
 class RiskEstimatorSeeker:
@@ -91,6 +107,16 @@ class RiskEstimatorSeeker:
             Plugins to use in the pipeline for risk prediction.
         hooks: Hooks.
             Custom callbacks to be notified about the search progress.
+        progressive_search: bool.
+            Evaluate the trials on a successive-halving schedule of nested subsets of the data, stratified by event. Only the promising configurations are evaluated on the larger subsets, up to the full data. Requires the "bayesian" optimizer.
+        min_search_sample_size: int.
+            Size of the smallest subset, if `progressive_search` is True.
+        sample_growth_rate: int.
+            Growth rate of the subsets, and reduction factor of the surviving trials, if `progressive_search` is True.
+        time_budget: Optional int.
+            Wall-clock budget(seconds) of a search, shared by all the estimators and time horizons. Replaces the per-estimator "timeout": the search runs in time slices, and a bandit over the estimators gives the slices and the workers to the estimators improving the fastest. The allocation is reported to the hooks. Requires the "bayesian" optimizer.
+        warm_start_store: Optional WarmStartStore.
+            Store of the best configurations of past searches. The search of each estimator and horizon starts with the best configurations found on the most similar past datasets, and its own results are added to the store.
         random_state: int:
             Random seed
     """
@@ -111,8 +137,22 @@ class RiskEstimatorSeeker:
         hooks: Hooks = DefaultHooks(),
         optimizer_type: str = "bayesian",
         strict: bool = False,
+        progressive_search: bool = False,
+        min_search_sample_size: int = 1000,
+        sample_growth_rate: int = 3,
+        time_budget: Optional[int] = None,
+        warm_start_store: Optional[WarmStartStore] = None,
         random_state: int = 0,
     ) -> None:
+        if progressive_search and optimizer_type == "hyperband":
+            raise ValueError(
+                "progressive_search requires the bayesian optimizer: hyperband does not evaluate the data rungs"
+            )
+        if time_budget is not None and optimizer_type == "hyperband":
+            raise ValueError(
+                "time_budget requires the bayesian optimizer: hyperband searches cannot be resumed"
+            )
+
         self.time_horizons = time_horizons
 
         self.num_iter = num_iter
@@ -123,6 +163,11 @@ class RiskEstimatorSeeker:
         self.optimizer_type = optimizer_type
         self.strict = strict
         self.n_folds_cv = n_folds_cv
+        self.progressive_search = progressive_search
+        self.min_search_sample_size = min_search_sample_size
+        self.sample_growth_rate = sample_growth_rate
+        self.time_budget = time_budget
+        self.warm_start_store = warm_start_store
         self.random_state = random_state
 
         self.estimators = [
@@ -141,7 +186,20 @@ class RiskEstimatorSeeker:
         if self.hooks.cancel():
             raise StudyCancelled("risk estimation search cancelled")
 
-    def search_best_args_for_estimator(
+    def _report_timings(
+        self, estimator: Any, time_horizon: int, timings: profiling.Timings
+    ) -> None:
+        self.hooks.heartbeat(
+            topic="risk_estimation",
+            subtopic="model_search",
+            event_type="timings",
+            scope="estimator",
+            name=estimator.name(),
+            horizon=time_horizon,
+            timings=timings.summary(),
+        )
+
+    def _estimator_study(
         self,
         estimator: Any,
         X: pd.DataFrame,
@@ -149,20 +207,58 @@ class RiskEstimatorSeeker:
         Y: pd.DataFrame,
         time_horizon: int,
         group_ids: Optional[pd.Series] = None,
-    ) -> Tuple[List[float], List[float]]:
-        self._should_continue()
+        n_trials: Optional[int] = None,
+        timeout: Optional[int] = None,
+        warm_start_trials: list = [],
+        baseline_score: Optional[float] = None,
+        warm_start_configs: List[dict] = [],
+    ) -> Optimizer:
+        schedule = None
+        if self.progressive_search:
+            schedule = DataSchedule(
+                Y,
+                min_size=self.min_search_sample_size,
+                eta=self.sample_growth_rate,
+                random_state=self.random_state,
+            )
 
-        def evaluate_estimator(**kwargs: Any) -> float:
+        def evaluate_estimator(
+            search_rung: Optional[int] = None,
+            trial: Optional[optuna.trial.Trial] = None,
+            **kwargs: Any,
+        ) -> float:
             self._should_continue()
             start = time.time()
             time_horizons = [time_horizon]
 
+            X_eval, T_eval, Y_eval, group_ids_eval = X, T, Y, group_ids
+            if schedule is not None and search_rung is not None:
+                rows = schedule.subset(search_rung)
+                X_eval, T_eval, Y_eval = X.iloc[rows], T.iloc[rows], Y.iloc[rows]
+                if group_ids is not None:
+                    group_ids_eval = group_ids.iloc[rows]
+
+            fold_scores: List[float] = []
+
+            def report_fold(fold: int, scores: Dict) -> None:
+                fold_scores.append(scores["c_index"] - scores["brier_score"])
+                report_intermediate_score(trial, np.mean(fold_scores), fold)
+
             model = estimator.get_pipeline_from_named_args(**kwargs)
 
             try:
-                metrics = evaluate_survival_estimator(
-                    model, X, T, Y, time_horizons, group_ids=group_ids
-                )
+                with profiling.record() as timings:
+                    metrics = evaluate_survival_estimator(
+                        model,
+                        X_eval,
+                        T_eval,
+                        Y_eval,
+                        time_horizons,
+                        group_ids=group_ids_eval,
+                        fold_callback=report_fold if trial is not None else None,
+                    )
+            except optuna.exceptions.TrialPruned:
+                raise
             except BaseException as e:
                 log.error(f"evaluate_survival_estimator failed {e}")
 
@@ -178,6 +274,16 @@ class RiskEstimatorSeeker:
 
             score = metrics["raw"]["c_index"][0] - metrics["raw"]["brier_score"][0]
 
+            self.hooks.heartbeat(
+                topic="risk_estimation",
+                subtopic="model_search",
+                event_type="timings",
+                scope="trial",
+                name=model.name(),
+                horizon=time_horizon,
+                search_rung=search_rung,
+                timings=timings.summary(),
+            )
             self.hooks.heartbeat(
                 topic="risk_estimation",
                 subtopic="model_search",
@@ -186,6 +292,7 @@ class RiskEstimatorSeeker:
                 model_args=kwargs,
                 duration=time.time() - start,
                 horizon=time_horizon,
+                search_rung=search_rung,
                 score=score,
                 **eval_metrics,
             )
@@ -196,11 +303,87 @@ class RiskEstimatorSeeker:
             estimator=estimator,
             evaluation_cbk=evaluate_estimator,
             optimizer_type=self.optimizer_type,
-            n_trials=self.num_iter,
-            timeout=self.timeout,
+            n_trials=n_trials if n_trials is not None else self.num_iter,
+            timeout=timeout if timeout is not None else self.timeout,
+            n_rungs=len(schedule) if schedule is not None else 1,
+            eta=self.sample_growth_rate,
+            warm_start_trials=warm_start_trials,
+            baseline_score=baseline_score,
+            warm_start_configs=warm_start_configs,
             random_state=self.random_state,
         )
-        return study.evaluate()
+        return study
+
+    def search_best_args_for_estimator(
+        self,
+        estimator: Any,
+        X: pd.DataFrame,
+        T: pd.DataFrame,
+        Y: pd.DataFrame,
+        time_horizon: int,
+        group_ids: Optional[pd.Series] = None,
+        warm_start_configs: List[dict] = [],
+    ) -> Tuple[List[float], List[float]]:
+        self._should_continue()
+
+        X, T, Y, group_ids = attach(X), attach(T), attach(Y), attach(group_ids)
+
+        with profiling.record(reuse=True) as timings:
+            result = self._estimator_study(
+                estimator,
+                X,
+                T,
+                Y,
+                time_horizon,
+                group_ids=group_ids,
+                warm_start_configs=warm_start_configs,
+            ).evaluate()
+
+        self._report_timings(estimator, time_horizon, timings)
+
+        return result
+
+    def search_slice_for_estimator(
+        self,
+        estimator: Any,
+        X: pd.DataFrame,
+        T: pd.DataFrame,
+        Y: pd.DataFrame,
+        time_horizon: int,
+        group_ids: Optional[pd.Series],
+        state: EstimatorSearchState,
+        duration: float,
+        warm_start_configs: List[dict] = [],
+    ) -> EstimatorSearchState:
+        """Resume the search of an estimator from `state`, for `duration` seconds."""
+        self._should_continue()
+
+        X, T, Y, group_ids = attach(X), attach(T), attach(Y), attach(group_ids)
+
+        start = time.time()
+        study = self._estimator_study(
+            estimator,
+            X,
+            T,
+            Y,
+            time_horizon,
+            group_ids=group_ids,
+            n_trials=max(1, self.num_iter - len(state.trials)),
+            timeout=max(1, int(duration)),
+            warm_start_trials=state.trials,
+            baseline_score=state.baseline_score,
+            warm_start_configs=warm_start_configs,
+        )
+        with profiling.record(reuse=True) as timings:
+            scores, params = study.evaluate()
+
+        self._report_timings(estimator, time_horizon, timings)
+
+        trials = study.trials()
+        finished = study.stopped() or len(trials) >= self.num_iter
+        state.update(scores, params, trials, finished, time.time() - start)
+
+        return state
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def search_estimator(
@@ -211,25 +394,117 @@ class RiskEstimatorSeeker:
         time_horizon: int,
         group_ids: Optional[pd.Series] = None,
     ) -> List:
+        with broadcast(X, T, Y, group_ids, enabled=n_opt_jobs() > 1) as shared:
+            return self._search_estimator(X, T, Y, time_horizon, group_ids, shared)
+
+    def _search_estimator(
+        self,
+        X: pd.DataFrame,
+        T: pd.Series,
+        Y: pd.Series,
+        time_horizon: int,
+        group_ids: Optional[pd.Series],
+        shared: Tuple,
+    ) -> List:
+        """Search the estimators for `time_horizon`. The tasks get the `shared` handles of (X, T, Y, group_ids), published by `broadcast`."""
         self._should_continue()
 
         log.info(f"Searching estimators for horizon {time_horizon}")
-        try:
-            search_results = dispatcher(
-                delayed(self.search_best_args_for_estimator)(
-                    estimator, X, T, Y, time_horizon, group_ids=group_ids
+
+        X_shared, T_shared, Y_shared, group_ids_shared = shared
+
+        warm_start_configs: List[List[dict]] = [[] for _ in self.estimators]
+        if self.warm_start_store is not None:
+            meta_features = dataset_meta_features(X, Y, censoring=True)
+            warm_start_configs = [
+                self.warm_start_store.suggest(
+                    meta_features,
+                    estimator.name(),
+                    space=estimator.hyperparameter_space(),
+                    horizon=time_horizon,
                 )
                 for estimator in self.estimators
-            )
+            ]
+
+        footprints = [
+            estimator.memory_footprint(*X.shape) for estimator in self.estimators
+        ]
+
+        try:
+            if self.time_budget is None:
+                search_results = dispatcher(
+                    delayed(
+                        budgeted(
+                            self.search_best_args_for_estimator,
+                            memory=footprints[idx],
+                        )
+                    )(
+                        estimator,
+                        X_shared,
+                        T_shared,
+                        Y_shared,
+                        time_horizon,
+                        group_ids=group_ids_shared,
+                        warm_start_configs=configs,
+                    )
+                    for idx, (estimator, configs) in enumerate(
+                        zip(self.estimators, warm_start_configs)
+                    )
+                )
+            else:
+                # The budget is shared by the horizons.
+                scheduler = BudgetScheduler(
+                    [estimator.name() for estimator in self.estimators],
+                    budget=self.time_budget / len(self.time_horizons),
+                    n_workers=n_opt_jobs(),
+                )
+                states = budgeted_search(
+                    scheduler,
+                    lambda idx, state, duration: delayed(
+                        budgeted(
+                            self.search_slice_for_estimator, memory=footprints[idx]
+                        )
+                    )(
+                        self.estimators[idx],
+                        X_shared,
+                        T_shared,
+                        Y_shared,
+                        time_horizon,
+                        group_ids_shared,
+                        state,
+                        duration,
+                        warm_start_configs=warm_start_configs[idx],
+                    ),
+                    dispatcher,
+                    self.hooks,
+                    topic="risk_estimation",
+                    horizon=time_horizon,
+                )
+                search_results = [(state.scores, state.params) for state in states]
         except BaseException as e:
             print(traceback.format_exc())
             raise e
 
+        if self.warm_start_store is not None:
+            for estimator, (scores, args) in zip(self.estimators, search_results):
+                self.warm_start_store.add(
+                    self.study_name,
+                    meta_features,
+                    estimator.name(),
+                    scores,
+                    args,
+                    horizon=time_horizon,
+                )
+
         all_scores = []
         all_args = []
         all_estimators = []
 
         for idx, (best_scores, best_args) in enumerate(search_results):
+            if len(best_scores) == 0:
+                # Not searched before the time budget ran out.
+                continue
+
             best_idx = np.argmax(best_scores)
             all_scores.append(best_scores[best_idx])
             all_args.append(best_args[best_idx])
@@ -265,13 +540,15 @@ class RiskEstimatorSeeker:
         self._should_continue()
 
         result = []
-        for time_horizon in self.time_horizons:
-            best_estimators_template = self.search_estimator(
-                X, T, Y, time_horizon, group_ids=group_ids
-            )
-            horizon_result = []
-            for est, args in best_estimators_template:
-                horizon_result.append(est.get_pipeline_from_named_args(**args))
-            result.append(horizon_result)
+        # The data is published once, for all the horizons.
+        with broadcast(X, T, Y, group_ids, enabled=n_opt_jobs() > 1) as shared:
+            for time_horizon in self.time_horizons:
+                best_estimators_template = self._search_estimator(
+                    X, T, Y, time_horizon, group_ids, shared
+                )
+                horizon_result = []
+                for est, args in best_estimators_template:
+                    horizon_result.append(est.get_pipeline_from_named_args(**args))
+                result.append(horizon_result)
 
         return result
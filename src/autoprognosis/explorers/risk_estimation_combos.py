@@ -1,5 +1,4 @@
 # stdlib
-import copy
 import time
 from typing import List, Optional
 
@@ -17,9 +16,11 @@ from autoprognosis.explorers.core.defaults import (
     default_risk_estimation_names,
 )
 from autoprognosis.explorers.core.optimizer import EnsembleOptimizer
+from autoprognosis.explorers.core.warm_start import WarmStartStore
 from autoprognosis.hooks import DefaultHooks, Hooks
 import autoprognosis.logger as log
 from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble
+import autoprognosis.utils.serialization as serialization
 from autoprognosis.utils.tester import evaluate_survival_estimator
 
 # autoprognosis relative
@@ -91,6 +92,16 @@ class RiskEnsembleSeeker:
              - 'coxnet'
         hooks: Hooks.
             Custom callbacks to be notified about the search progress.
+        progressive_search: bool.
+            Evaluate the base estimator trials on a successive-halving schedule of nested stratified subsets of the data, up to the full data. Requires the "bayesian" optimizer.
+        min_search_sample_size: int.
+            Size of the smallest subset, if `progressive_search` is True.
+        sample_growth_rate: int.
+            Growth rate of the subsets, if `progressive_search` is True.
+        time_budget: Optional int.
+            Wall-clock budget(seconds) of the base estimators search, shared by all the estimators instead of the per-estimator "timeout".
+        warm_start_store: Optional WarmStartStore.
+            Store of the best configurations of past searches, used for warm-starting the base estimators search.
         random_state: int:
             Random seed
     """
@@ -111,6 +122,11 @@ class RiskEnsembleSeeker:
         feature_selection: List[str] = default_feature_selection_names,
         hooks: Hooks = DefaultHooks(),
         optimizer_type: str = "bayesian",
+        progressive_search: bool = False,
+        min_search_sample_size: int = 1000,
+        sample_growth_rate: int = 3,
+        time_budget: Optional[int] = None,
+        warm_start_store: Optional[WarmStartStore] = None,
         random_state: int = 0,
     ) -> None:
         ensemble_size = min(ensemble_size, len(estimators))
@@ -140,6 +156,11 @@ class RiskEnsembleSeeker:
             feature_selection=feature_selection,
             imputers=imputers,
             optimizer_type=optimizer_type,
+            progressive_search=progressive_search,
+            min_search_sample_size=min_search_sample_size,
+            sample_growth_rate=sample_growth_rate,
+            time_budget=time_budget,
+            warm_start_store=warm_start_store,
             random_state=self.random_state,
         )
 
@@ -178,7 +199,7 @@ class RiskEnsembleSeeker:
 
             local_fold = []
             for estimator in ensemble:
-                model = copy.deepcopy(estimator)
+                model = serialization.clone_model(estimator)
                 model.fit(X_train, T_train, Y_train)
                 local_fold.append(model)
             ensemble_folds.append(local_fold)
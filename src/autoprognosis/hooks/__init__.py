@@ -1,3 +1,4 @@
 # autoprognosis relative
 from .base import Hooks  # noqa: F401
 from .default import DefaultHooks  # noqa: F401
+from .profiling import ProfilingHooks  # noqa: F401
@@ -0,0 +1,52 @@
+# stdlib
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# autoprognosis absolute
+from autoprognosis.utils.profiling import append_jsonl, read_jsonl, write_prometheus
+
+# autoprognosis relative
+from .base import Hooks
+from .default import DefaultHooks
+
+
+class ProfilingHooks(Hooks):
+    """Hooks exporting the "timings" events of the search, for telling whether a slow study is bound by the training, the metrics or the dispatch of the tasks.
+
+    The events are appended to a JSONL file, by the search workers directly, and all the events are forwarded to `hooks`. Each event has a scope: "trial", the stages of one trial, or "estimator", the stages of a whole estimator search, including the dispatch wait of its task.
+
+    Args:
+        path: str or Path
+            The JSONL file of the events.
+        prometheus_path: Optional str or Path
+            Prometheus text file of the stage totals by estimator, written when the study finishes.
+        hooks: Hooks
+            The hooks receiving all the events, e.g. for the cancellation.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        prometheus_path: Optional[Union[str, Path]] = None,
+        hooks: Hooks = DefaultHooks(),
+    ) -> None:
+        self.path = Path(path)
+        self.prometheus_path = prometheus_path
+        self.hooks = hooks
+
+    def cancel(self) -> bool:
+        return self.hooks.cancel()
+
+    def heartbeat(
+        self, topic: str, subtopic: str, event_type: str, **kwargs: Any
+    ) -> None:
+        if event_type == "timings":
+            append_jsonl(self.path, {"topic": topic, "subtopic": subtopic, **kwargs})
+
+        self.hooks.heartbeat(topic, subtopic, event_type, **kwargs)
+
+    def finish(self) -> None:
+        if self.prometheus_path is not None and self.path.exists():
+            write_prometheus(read_jsonl(self.path), self.prometheus_path)
+
+        self.hooks.finish()
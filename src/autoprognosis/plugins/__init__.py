@@ -1,4 +1,5 @@
 # stdlib
+import threading
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 # autoprognosis absolute
@@ -11,6 +12,9 @@ import autoprognosis.plugins.utils  # noqa: F401,E402
 # autoprognosis relative
 from .core import base_plugin  # noqa: F401,E402
 
+_plugin_types: Dict[str, Type] = {}
+_plugin_types_lock = threading.RLock()
+
 
 class Plugins:
     def __init__(self) -> None:
@@ -75,15 +79,25 @@ class Plugins:
 
 
 def group(names: List[str]) -> Tuple[Type, ...]:
+    """Plugin types for a list of fqdns.
+
+    The lookups are memoized by fqdn, so that a plugin always resolves to the same class object, and a pipeline does not load the plugin modules again.
+    """
     res = []
 
-    plugins = Plugins()
-    for fqdn in names:
-        if "." not in fqdn:
-            raise RuntimeError("invalid fqdn")
+    with _plugin_types_lock:
+        plugins: Optional[Plugins] = None
+        for fqdn in names:
+            if "." not in fqdn:
+                raise RuntimeError("invalid fqdn")
+
+            if fqdn not in _plugin_types:
+                if plugins is None:
+                    plugins = Plugins()
 
-        cat, subtype, name = fqdn.split(".")
+                cat, subtype, name = fqdn.split(".")
+                _plugin_types[fqdn] = plugins.get_type(cat, subtype, name)
 
-        res.append(plugins.get_type(cat, subtype, name))
+            res.append(_plugin_types[fqdn])
 
     return tuple(res)
@@ -15,9 +15,11 @@ from sklearn.preprocessing import LabelEncoder
 # autoprognosis absolute
 import autoprognosis.logger as log
 import autoprognosis.plugins.utils.cast as cast
+from autoprognosis.utils.data_source import DataSource
+import autoprognosis.utils.profiling as profiling
 
 # autoprognosis relative
-from .params import Params
+from .params import Params, sample_np_configs
 
 
 class Plugin(metaclass=ABCMeta):
@@ -87,6 +89,13 @@ class Plugin(metaclass=ABCMeta):
 
         return results
 
+    @classmethod
+    def sample_hyperparameters_np_batch(
+        cls, n: int, *args: Any, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Sample `n` hyperparameter dicts at once."""
+        return sample_np_configs(cls.hyperparameter_space(*args, **kwargs), n)
+
     @classmethod
     def hyperparameter_space_fqdn(cls, *args: Any, **kwargs: Any) -> List[Params]:
         """The hyperparameter domain using they fully-qualified name."""
@@ -132,6 +141,16 @@ class Plugin(metaclass=ABCMeta):
         """The type of the plugin, e.g.: classifier"""
         ...
 
+    @staticmethod
+    def supports_data_source() -> bool:
+        """If the plugin trains and predicts from a `DataSource` in mini-batches. The other plugins get the data source as a DataFrame."""
+        return False
+
+    @staticmethod
+    def memory_footprint(n_rows: int, n_features: int) -> int:
+        """Estimated peak memory of fitting the plugin on `n_rows` x `n_features` data, in bytes. The default allows a few float64 copies of the data."""
+        return 4 * n_rows * n_features * 8
+
     @classmethod
     def fqdn(cls) -> str:
         """The fully-qualified name of the plugin: type->subtype->name"""
@@ -154,8 +173,13 @@ class Plugin(metaclass=ABCMeta):
 
     def _preprocess_training_data(self, X: pd.DataFrame) -> pd.DataFrame:
         """Encode the input"""
-        X = cast.to_dataframe(X).copy()
         self._backup_encoders = {}
+        if isinstance(X, DataSource):
+            if self.supports_data_source():
+                return X
+            X = X.to_dataframe()
+
+        X = cast.to_dataframe(X).copy()
 
         for col in X.columns:
             if X[col].dtype.name not in ["object", "category"]:
@@ -171,6 +195,11 @@ class Plugin(metaclass=ABCMeta):
 
     def _preprocess_inference_data(self, X: pd.DataFrame) -> pd.DataFrame:
         """Encode the inference input"""
+        if isinstance(X, DataSource):
+            if self.supports_data_source():
+                return X
+            X = X.to_dataframe()
+
         X = cast.to_dataframe(X).copy()
 
         if self._backup_encoders is None:
@@ -198,7 +227,8 @@ class Plugin(metaclass=ABCMeta):
         X = self._preprocess_training_data(X)
 
         log.debug(f"Training {self.fqdn()}, input shape = {X.shape}")
-        self._fit(X, *args, **kwargs)
+        with profiling.stage(f"{self.type()}.fit"):
+            self._fit(X, *args, **kwargs)
         log.debug(f"Done Training {self.fqdn()}, input shape = {X.shape}")
 
         self._fitted = True
@@ -220,7 +250,8 @@ class Plugin(metaclass=ABCMeta):
             raise RuntimeError("Fit the model first")
         X = self._preprocess_inference_data(X)
         log.debug(f"Transforming using {self.fqdn()}, input shape = {X.shape}")
-        return self.output(self._transform(X))
+        with profiling.stage(f"{self.type()}.transform"):
+            return self.output(self._transform(X))
 
     @abstractmethod
     def _transform(self, X: pd.DataFrame) -> pd.DataFrame:
@@ -237,7 +268,8 @@ class Plugin(metaclass=ABCMeta):
             raise RuntimeError("Fit the model first")
         X = self._preprocess_inference_data(X)
         log.debug(f"Predicting using {self.fqdn()}, input shape = {X.shape}")
-        return self.output(self._predict(X, *args, *kwargs))
+        with profiling.stage(f"{self.type()}.predict"):
+            return self.output(self._predict(X, *args, *kwargs))
 
     @abstractmethod
     def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
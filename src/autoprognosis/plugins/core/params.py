@@ -1,11 +1,32 @@
 # stdlib
 from abc import ABCMeta, abstractmethod
-from typing import Any, List, Tuple
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 # third party
 import numpy as np
 from optuna.trial import Trial
 
+# Significant digits kept for the floats outside a known space.
+FLOAT_DIGITS = 6
+
+# Positive float ranges spanning this many decades are quantized on a log scale.
+LOG_SCALE_DECADES = 2
+
+ConfigKey = Tuple[Tuple[str, Hashable], ...]
+
+
+def _hashable(value: Any) -> Hashable:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return float(f"{value:.{FLOAT_DIGITS}g}")
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _hashable(val)) for key, val in value.items()))
+
+    return value
+
 
 class Params(metaclass=ABCMeta):
     """
@@ -28,6 +49,17 @@ class Params(metaclass=ABCMeta):
     def sample_np(self) -> Any:
         ...
 
+    def canonical(self, value: Any) -> Hashable:
+        """Hashable form of `value`, equal for the values which are equivalent for the search."""
+        return _hashable(value)
+
+    def sample_np_batch(self, n: int) -> np.ndarray:
+        """Draw `n` values at once."""
+        values = np.empty(n, dtype=object)
+        values[:] = [self.sample_np() for _ in range(n)]
+
+        return values
+
 
 class Categorical(Params):
     """Sample from a categorical distribution."""
@@ -37,6 +69,10 @@ class Categorical(Params):
         self.name = name
         self.choices = choices
 
+        self._positions: Dict[Hashable, int] = {}
+        for pos, choice in enumerate(choices):
+            self._positions.setdefault(_hashable(choice), pos)
+
     def get(self) -> List[Any]:
         return [self.name, self.choices]
 
@@ -46,11 +82,32 @@ class Categorical(Params):
     def sample_np(self) -> Any:
         return np.random.choice(self.choices, 1)[0]
 
+    def sample_np_batch(self, n: int) -> np.ndarray:
+        choices = np.empty(len(self.choices), dtype=object)
+        choices[:] = self.choices
+
+        return choices[np.random.randint(len(self.choices), size=n)]
+
+    def canonical(self, value: Any) -> Hashable:
+        """The position of the choice equal to `value`, so the equivalent forms of a choice, e.g. a numpy scalar, a list or a tuple, have the same key. The other values are only made hashable."""
+        value = _hashable(value)
+        if value in self._positions:
+            return ("choice", self._positions[value])
+
+        return value
+
 
 class Float(Params):
-    """Sample from a float distribution."""
+    """Sample from a float distribution.
+
+    Args:
+        resolution: float
+            Values closer than `resolution` x (high - low) have the same canonical form, and are repeats for the search. For the positive ranges spanning `LOG_SCALE_DECADES` decades or more, e.g. a regularization strength in [1e-4, 1e3], the resolution is relative: a fraction of the range in log scale.
+    """
 
-    def __init__(self, name: str, low: float, high: float) -> None:
+    def __init__(
+        self, name: str, low: float, high: float, resolution: float = 1e-3
+    ) -> None:
         low = float(low)
         high = float(high)
 
@@ -58,6 +115,7 @@ class Float(Params):
         self.name = name
         self.low = low
         self.high = high
+        self.resolution = resolution
 
     def get(self) -> List[Any]:
         return [self.name, self.low, self.high]
@@ -68,6 +126,27 @@ class Float(Params):
     def sample_np(self) -> Any:
         return np.random.uniform(self.low, self.high)
 
+    def sample_np_batch(self, n: int) -> np.ndarray:
+        return np.random.uniform(self.low, self.high, size=n)
+
+    def _log_scale(self) -> bool:
+        return self.low > 0 and self.high >= self.low * 10**LOG_SCALE_DECADES
+
+    def canonical(self, value: Any) -> Hashable:
+        value = float(value)
+        if self._log_scale():
+            if value <= 0:
+                return _hashable(value)
+
+            step = self.resolution * np.log(self.high / self.low)
+            return int(round(np.log(value / self.low) / step))
+
+        step = self.resolution * (self.high - self.low)
+        if step <= 0:
+            return _hashable(value)
+
+        return int(round((value - self.low) / step))
+
 
 class Integer(Params):
     """Sample from an integer distribution."""
@@ -92,3 +171,43 @@ class Integer(Params):
 
     def sample_np(self) -> Any:
         return np.random.choice(self.choices, 1)[0]
+
+    def sample_np_batch(self, n: int) -> np.ndarray:
+        return np.random.choice(self.choices, n)
+
+    def canonical(self, value: Any) -> Hashable:
+        return int(value)
+
+
+def sample_np_configs(space: List[Params], n: int) -> List[Dict[str, Any]]:
+    """Draw `n` configurations of the hyperparameter `space`, with one batch per parameter instead of one call per value."""
+    if len(space) == 0:
+        return [{} for _ in range(n)]
+
+    names = [param.name for param in space]
+    columns = [param.sample_np_batch(n).tolist() for param in space]
+
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def config_key(
+    config: Dict[str, Any], space: Optional[List[Params]] = None
+) -> ConfigKey:
+    """Canonical key of a configuration, for O(1) repeat lookups: the items sorted by name, with the values of the parameters of `space` quantized by `Params.canonical`.
+
+    Args:
+        config: dict
+            The configuration, e.g. the params of a trial.
+        space: Optional list
+            The hyperparameter space of the configuration. The other values are only made hashable, with the floats rounded to `FLOAT_DIGITS` significant digits.
+    """
+    params = {param.name: param for param in space or []}
+
+    items = []
+    for name, value in config.items():
+        if name in params:
+            items.append((name, params[name].canonical(value)))
+        else:
+            items.append((name, _hashable(value)))
+
+    return tuple(sorted(items))
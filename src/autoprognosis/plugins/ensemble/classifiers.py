@@ -4,25 +4,24 @@ import copy
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 # third party
-from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator
 from sklearn.model_selection import StratifiedKFold
 
 # autoprognosis absolute
+from autoprognosis.hooks import DefaultHooks, Hooks
 import autoprognosis.logger as log
 from autoprognosis.plugins.ensemble.combos import SimpleClassifierAggregator, Stacking
+from autoprognosis.plugins.ensemble.inference import predict_models
+from autoprognosis.plugins.ensemble.training import fit_models
 from autoprognosis.plugins.explainers import Explainers
 from autoprognosis.plugins.imputers import Imputers
 from autoprognosis.plugins.pipeline import Pipeline, PipelineMeta
 from autoprognosis.plugins.prediction.classifiers import Classifiers
-from autoprognosis.utils.parallel import n_opt_jobs
 import autoprognosis.utils.serialization as serialization
 from autoprognosis.utils.tester import classifier_metrics
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=n_opt_jobs())
-
 
 class BaseEnsemble(BaseEstimator, metaclass=ABCMeta):
     """
@@ -89,6 +88,8 @@ class WeightedEnsemble(BaseEnsemble):
         models: list. List of base models.
         weights: list. The weights for each base model.
         explainer_plugins: list. List of explainers attached to the ensemble.
+        n_jobs: Optional int. Maximum number of models evaluated concurrently at inference. Defaults to `n_inference_jobs()`.
+        hooks: Hooks. Custom callbacks for training progress and cancellation.
     """
 
     def __init__(
@@ -98,6 +99,8 @@ class WeightedEnsemble(BaseEnsemble):
         explainer_plugins: list = [],
         explainers: Optional[Dict] = None,
         explanations_nepoch: int = 10000,
+        n_jobs: Optional[int] = None,
+        hooks: Hooks = DefaultHooks(),
     ) -> None:
         super().__init__()
 
@@ -106,6 +109,8 @@ class WeightedEnsemble(BaseEnsemble):
         self.explainer_plugins = explainer_plugins
         self.explanations_nepoch = explanations_nepoch
         self.explainers = explainers
+        self.n_jobs = n_jobs
+        self.hooks = hooks
 
         for idx, weight in enumerate(weights):
             if weight == 0:
@@ -120,13 +125,28 @@ class WeightedEnsemble(BaseEnsemble):
 
         return _fitted
 
-    def fit(self, X: pd.DataFrame, Y: pd.DataFrame) -> "WeightedEnsemble":
-        def fit_model(k: int) -> Any:
-            return self.models[k].fit(X, Y)
+    def clone(self) -> "WeightedEnsemble":
+        """Copy of the ensemble, without the explainers. The unfitted models are rebuilt from their parameters."""
+        return WeightedEnsemble(
+            [serialization.clone_model(model) for model in self.models],
+            list(self.weights),
+            explainer_plugins=self.explainer_plugins,
+            explanations_nepoch=self.explanations_nepoch,
+            n_jobs=getattr(self, "n_jobs", None),
+            hooks=getattr(self, "hooks", DefaultHooks()),
+        )
 
+    def fit(self, X: pd.DataFrame, Y: pd.DataFrame) -> "WeightedEnsemble":
         log.debug("Fitting the WeightedEnsemble")
-        self.models = dispatcher(delayed(fit_model)(k) for k in range(len(self.models)))
+        self.models = fit_models(
+            [(model, (X, Y)) for model in self.models],
+            hooks=getattr(self, "hooks", DefaultHooks()),
+            topic="weighted_ensemble",
+        )
+
+        return self._fit_explainers(X, Y)
 
+    def _fit_explainers(self, X: pd.DataFrame, Y: pd.DataFrame) -> "WeightedEnsemble":
         if self.explainers:
             return self
 
@@ -146,16 +166,26 @@ class WeightedEnsemble(BaseEnsemble):
 
         return self
 
+    def _aggregate(self, preds: List[np.ndarray]) -> np.ndarray:
+        preds_ = []
+        for k in range(len(self.models)):
+            preds_.append(preds[k] * self.weights[k])
+
+        return np.sum(np.array(preds_), axis=0)
+
     def predict_proba(self, X: pd.DataFrame, *args: Any) -> pd.DataFrame:
         if not self.is_fitted():
             raise RuntimeError("Fit the model first")
 
-        preds_ = []
-        for k in range(len(self.models)):
-            preds_.append(self.models[k].predict_proba(X, *args) * self.weights[k])
-        pred_ens = np.sum(np.array(preds_), axis=0)
+        preds = predict_models(
+            self.models,
+            X,
+            "predict_proba",
+            *args,
+            n_jobs=getattr(self, "n_jobs", None),
+        )
 
-        return pd.DataFrame(pred_ens)
+        return pd.DataFrame(self._aggregate(preds))
 
     def explain(self, X: pd.DataFrame, *args: Any) -> pd.DataFrame:
         if self.explainers is None:
@@ -202,6 +232,8 @@ class WeightedEnsembleCV(BaseEnsemble):
         models: list. List of base models.
         weights: list. The weights for each base model.
         explainer_plugins: list. List of explainers attached to the ensemble.
+        n_jobs: Optional int. Maximum number of fold models evaluated concurrently at inference. Defaults to `n_inference_jobs()`.
+        hooks: Hooks. Custom callbacks for training progress and cancellation.
     """
 
     def __init__(
@@ -213,6 +245,8 @@ class WeightedEnsembleCV(BaseEnsemble):
         explainer_plugins: list = [],
         explainers: Optional[dict] = None,
         explanations_nepoch: int = 10000,
+        n_jobs: Optional[int] = None,
+        hooks: Hooks = DefaultHooks(),
     ) -> None:
         super().__init__()
 
@@ -240,6 +274,8 @@ class WeightedEnsembleCV(BaseEnsemble):
         self.explainer_plugins = explainer_plugins
         self.explainers = explainers
         self.explanations_nepoch = explanations_nepoch
+        self.n_jobs = n_jobs
+        self.hooks = hooks
 
         self.n_folds = n_folds
         self.seed = 42
@@ -251,17 +287,47 @@ class WeightedEnsembleCV(BaseEnsemble):
 
         return _fitted
 
+    def clone(self) -> "WeightedEnsembleCV":
+        """Copy of the ensemble, without the explainers. The unfitted folds are rebuilt from their parameters."""
+        return WeightedEnsembleCV(
+            ensembles=[serialization.clone_model(fold) for fold in self.models],
+            n_folds=self.n_folds,
+            explainer_plugins=self.explainer_plugins,
+            explanations_nepoch=self.explanations_nepoch,
+            n_jobs=getattr(self, "n_jobs", None),
+            hooks=getattr(self, "hooks", DefaultHooks()),
+        )
+
     def fit(self, X: pd.DataFrame, Y: pd.DataFrame) -> "WeightedEnsembleCV":
         skf = StratifiedKFold(
             n_splits=self.n_folds, shuffle=True, random_state=self.seed
         )
-        cv_idx = 0
-        for train_index, test_index in skf.split(X, Y):
+        hooks = getattr(self, "hooks", DefaultHooks())
+
+        # Submit the members of all the folds at once to the shared pool.
+        tasks = []
+        folds_data = []
+        for fold, (train_index, test_index) in zip(self.models, skf.split(X, Y)):
             X_train = X.loc[X.index[train_index]]
             Y_train = Y.loc[Y.index[train_index]]
 
-            self.models[cv_idx].fit(X_train, Y_train)
-            cv_idx += 1
+            folds_data.append((X_train, Y_train))
+            for model in self._members(fold):
+                tasks.append((model, (X_train, Y_train)))
+
+        fitted = fit_models(tasks, hooks=hooks, topic="weighted_ensemble_cv")
+
+        offset = 0
+        for cv_idx, fold in enumerate(self.models):
+            members = len(self._members(fold))
+            fold_fitted = fitted[offset : offset + members]
+            offset += members
+
+            if isinstance(fold, WeightedEnsemble):
+                fold.models = fold_fitted
+                fold._fit_explainers(*folds_data[cv_idx])
+            else:
+                self.models[cv_idx] = fold_fitted[0]
 
         if self.explainers:
             return self
@@ -281,6 +347,12 @@ class WeightedEnsembleCV(BaseEnsemble):
 
         return self
 
+    def _members(self, fold: Any) -> List:
+        if isinstance(fold, WeightedEnsemble):
+            return fold.models
+
+        return [fold]
+
     def predict_proba(self, X: pd.DataFrame, *args: Any) -> pd.DataFrame:
         result, _ = self.predict_proba_with_uncertainity(X)
 
@@ -289,10 +361,29 @@ class WeightedEnsembleCV(BaseEnsemble):
     def predict_proba_with_uncertainity(
         self, X: pd.DataFrame, *args: Any
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        if not self.is_fitted():
+            raise RuntimeError("Fit the model first")
+
+        # Evaluate the fold x model grid at once, instead of fold by fold.
+        fold_models = [model for fold in self.models for model in self._members(fold)]
+        preds = predict_models(
+            fold_models,
+            X,
+            "predict_proba",
+            n_jobs=getattr(self, "n_jobs", None),
+        )
+
         results = []
+        offset = 0
+        for fold in self.models:
+            members = len(self._members(fold))
+            fold_preds = preds[offset : offset + members]
+            offset += members
 
-        for model in self.models:
-            results.append(np.asarray(model.predict_proba(X)))
+            if isinstance(fold, WeightedEnsemble):
+                results.append(fold._aggregate(fold_preds))
+            else:
+                results.append(fold_preds[0])
 
         results = np.asarray(results)
         calibrated_result = np.mean(results, axis=0)
@@ -354,7 +445,7 @@ class StackingEnsemble(BaseEnsemble):
                     Classifiers().get_type("logistic_regression").fqdn(),
                 ]
             )()
-        meta_model = copy.deepcopy(meta_model)
+        meta_model = serialization.clone_model(meta_model)
         meta_model.change_output("numpy")
 
         self.meta_model = meta_model
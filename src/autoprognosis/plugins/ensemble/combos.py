@@ -8,7 +8,6 @@ for more information.
 # stdlib
 from abc import ABC, abstractmethod
 from collections import defaultdict
-import copy
 from inspect import signature
 import warnings
 
@@ -34,6 +33,9 @@ from sklearn.utils.extmath import weighted_mode
 from sklearn.utils.multiclass import check_classification_targets
 from sklearn.utils.validation import check_is_fitted
 
+# autoprognosis absolute
+import autoprognosis.utils.serialization as serialization
+
 
 class BaseAggregator(ABC):
     """Abstract class for all combination classes.
@@ -475,7 +477,7 @@ class Stacking(BaseAggregator):
         self.n_folds = n_folds
 
         if meta_clf is not None:
-            self.meta_clf = copy.deepcopy(meta_clf)
+            self.meta_clf = serialization.clone_model(meta_clf)
         else:
             self.meta_clf = Pipeline(
                 ("imputer", IterativeImputer()), ("output", LogisticRegression())
@@ -555,7 +557,7 @@ class Stacking(BaseAggregator):
                 X_test, _ = X_new[test_idx, :], y_new[test_idx]
 
                 # train the classifier
-                clf = copy.deepcopy(raw_clf)
+                clf = serialization.clone_model(raw_clf)
                 clf.fit(X_train, y_train)
 
                 # generate the new features on the pseudo test set
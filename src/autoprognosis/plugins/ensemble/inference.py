@@ -0,0 +1,88 @@
+# stdlib
+from typing import Any, Callable, Dict, List, Optional
+
+# third party
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+from autoprognosis.utils.parallel import inference_pool
+
+SUPPORTED_METHODS = ["predict", "predict_proba"]
+
+
+def _map(fn: Callable, items: list, n_jobs: Optional[int]) -> list:
+    if n_jobs == 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    return list(inference_pool(n_jobs).map(fn, items))
+
+
+def _prefix_key(model: Any) -> Optional[str]:
+    if not hasattr(model, "prefix_fingerprint"):
+        return None
+
+    return model.prefix_fingerprint()
+
+
+def predict_models(
+    models: List[Any],
+    X: pd.DataFrame,
+    method: str,
+    *args: Any,
+    n_jobs: Optional[int] = None,
+) -> List[np.ndarray]:
+    """Run inference for a flat list of models, concurrently.
+
+    The preprocessing prefix of the pipelines is evaluated once for every distinct fitted prefix, then the predictors run on the shared transformed data.
+
+    Args:
+        models: list
+            Fitted pipelines or plugins.
+        X: pd.DataFrame
+            The covariates
+        method: str
+            predict/predict_proba
+        args:
+            Extra arguments forwarded to the predictor, e.g. the time horizons.
+        n_jobs: Optional int
+            Maximum concurrency. `n_jobs = 1` disables the worker pool.
+
+    Returns:
+        The predictions for each model, in the input order.
+    """
+    if method not in SUPPORTED_METHODS:
+        raise ValueError(f"invalid inference method {method}")
+
+    keys = [_prefix_key(model) for model in models]
+
+    prefixes: Dict[str, Any] = {}
+    for model, key in zip(models, keys):
+        if key is not None and key not in prefixes:
+            prefixes[key] = model
+
+    log.debug(
+        f"[inference] {len(models)} models, {len(prefixes)} distinct preprocessing prefixes"
+    )
+
+    prefix_keys = list(prefixes.keys())
+    transformed = dict(
+        zip(
+            prefix_keys,
+            _map(lambda key: prefixes[key].transform(X), prefix_keys, n_jobs),
+        )
+    )
+
+    def _predict(idx: int) -> np.ndarray:
+        model = models[idx]
+        key = keys[idx]
+
+        if key is None:
+            return np.asarray(getattr(model, method)(X, *args))
+
+        return np.asarray(
+            getattr(model, f"{method}_transformed")(transformed[key], *args)
+        )
+
+    return _map(_predict, list(range(len(models))), n_jobs)
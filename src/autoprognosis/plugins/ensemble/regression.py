@@ -4,7 +4,7 @@ import copy
 from typing import Any, Dict, List, Optional
 
 # third party
-from joblib import Parallel, delayed
+from joblib import delayed
 import numpy as np
 import pandas as pd
 
@@ -12,10 +12,15 @@ import pandas as pd
 import autoprognosis.logger as log
 from autoprognosis.plugins.explainers import Explainers
 from autoprognosis.plugins.pipeline import PipelineMeta
-from autoprognosis.utils.parallel import n_opt_jobs
+from autoprognosis.utils.parallel import (
+    MemoryAwareDispatcher,
+    budgeted,
+    n_opt_jobs,
+    set_learner_threads,
+)
 import autoprognosis.utils.serialization as serialization
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=n_opt_jobs())
+dispatcher = MemoryAwareDispatcher(max_nbytes=None, backend="loky", n_jobs=n_opt_jobs())
 
 
 class BaseRegressionEnsemble(metaclass=ABCMeta):
@@ -95,10 +100,16 @@ class WeightedRegressionEnsemble(BaseRegressionEnsemble):
 
     def fit(self, X: pd.DataFrame, Y: pd.DataFrame) -> "WeightedRegressionEnsemble":
         def fit_model(k: int) -> Any:
-            return self.models[k].fit(X, Y)
+            # The model was built in the parent process, outside of the thread budget.
+            return set_learner_threads(self.models[k]).fit(X, Y)
 
         log.debug("Fitting the WeightedRegressionEnsemble")
-        self.models = dispatcher(delayed(fit_model)(k) for k in range(len(self.models)))
+        self.models = dispatcher(
+            delayed(
+                budgeted(fit_model, memory=self.models[k].memory_footprint(*X.shape))
+            )(k)
+            for k in range(len(self.models))
+        )
 
         if self.explainers:
             return self
@@ -126,6 +137,15 @@ class WeightedRegressionEnsemble(BaseRegressionEnsemble):
 
         return _fitted
 
+    def clone(self) -> "WeightedRegressionEnsemble":
+        """Copy of the ensemble, without the explainers. The unfitted models are rebuilt from their parameters."""
+        return WeightedRegressionEnsemble(
+            [serialization.clone_model(model) for model in self.models],
+            list(self.weights),
+            explainer_plugins=self.explainer_plugins,
+            explanations_nepoch=self.explanations_nepoch,
+        )
+
     def predict(self, X: pd.DataFrame, *args: Any) -> pd.DataFrame:
         preds_ = []
         for k in range(len(self.models)):
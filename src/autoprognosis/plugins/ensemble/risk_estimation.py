@@ -11,7 +11,10 @@ from sklearn.model_selection import StratifiedKFold
 from autoprognosis.exceptions import StudyCancelled
 from autoprognosis.hooks import DefaultHooks, Hooks
 import autoprognosis.logger as log
+from autoprognosis.plugins.ensemble.inference import predict_models
+from autoprognosis.plugins.ensemble.training import fit_models
 from autoprognosis.plugins.explainers import Explainers
+import autoprognosis.utils.serialization as serialization
 
 EPS = 10**-8
 
@@ -29,6 +32,8 @@ class RiskEnsemble:
             List of time horizons used for evaluation.
         explainer_plugins: List
             List of explainers attached to the ensemble.
+        n_jobs: Optional int
+            Maximum number of models evaluated concurrently at inference. Defaults to `n_inference_jobs()`.
     """
 
     def __init__(
@@ -40,6 +45,7 @@ class RiskEnsemble:
         explanations_model: Optional[Dict] = None,
         explanations_nepoch: int = 10000,
         hooks: Hooks = DefaultHooks(),
+        n_jobs: Optional[int] = None,
     ) -> None:
         if len(weights) != len(time_horizons):
             raise RuntimeError("RiskEnsemble: weights, time_horizon shape mismatch")
@@ -47,7 +53,7 @@ class RiskEnsemble:
             raise RuntimeError("RiskEnsemble: models, weights shape mismatch")
 
         try:
-            self.models = copy.deepcopy(models)
+            self.models = [serialization.clone_model(model) for model in models]
         except BaseException:
             self.models = models
 
@@ -59,6 +65,7 @@ class RiskEnsemble:
         self.explanations_nepoch = explanations_nepoch
         self.explainers = explanations_model
         self.hooks = hooks
+        self.n_jobs = n_jobs
 
         try:
             self._compress_models()
@@ -81,7 +88,7 @@ class RiskEnsemble:
         for group in compressed:
             indices = compressed[group]
 
-            raw_model = copy.deepcopy(self.models[compressed[group][0]])
+            raw_model = serialization.clone_model(self.models[compressed[group][0]])
 
             compressed_models.append(raw_model)
             for hidx, horiz_weights in enumerate(self.weights):
@@ -112,11 +119,18 @@ class RiskEnsemble:
         T = pd.Series(T).reset_index(drop=True)
         Y = pd.Series(Y).reset_index(drop=True)
 
-        for model in self.models:
-            self._should_continue()
-            log.info(f"[RiskEnsemble]: train {model.name()} {model.get_args()}")
-            model.fit(X, T, Y)
+        log.info(f"[RiskEnsemble]: train {len(self.models)} models")
+        self.models = fit_models(
+            [(model, (X, T, Y)) for model in self.models],
+            hooks=self.hooks,
+            topic="risk_ensemble",
+        )
+
+        return self._fit_explainers(X, T, Y)
 
+    def _fit_explainers(
+        self, X: pd.DataFrame, T: pd.DataFrame, Y: pd.DataFrame
+    ) -> "RiskEnsemble":
         if self.explainers:
             return self
 
@@ -147,6 +161,18 @@ class RiskEnsemble:
 
         return _fitted
 
+    def clone(self) -> "RiskEnsemble":
+        """Copy of the ensemble, without the explainers. The unfitted models are rebuilt from their parameters."""
+        return RiskEnsemble(
+            self.models,
+            self.weights,
+            self.time_horizons,
+            explainer_plugins=self.explainer_plugins,
+            explanations_nepoch=self.explanations_nepoch,
+            hooks=self.hooks,
+            n_jobs=getattr(self, "n_jobs", None),
+        )
+
     def predict(
         self,
         X_: pd.DataFrame,
@@ -155,6 +181,23 @@ class RiskEnsemble:
         if eval_time_horizons is None:
             eval_time_horizons = self.time_horizons
 
+        log.debug(f"[RiskEnsemble] predict for {len(self.models)} models on {X_.shape}")
+        local_predicts = predict_models(
+            self.models,
+            X_,
+            "predict",
+            eval_time_horizons,
+            n_jobs=getattr(self, "n_jobs", None),
+        )
+
+        return pd.DataFrame(self._aggregate(local_predicts, X_, eval_time_horizons))
+
+    def _aggregate(
+        self,
+        local_predicts: List[np.ndarray],
+        X_: pd.DataFrame,
+        eval_time_horizons: List,
+    ) -> np.ndarray:
         pred = np.zeros([np.shape(X_)[0], len(eval_time_horizons)])
 
         nearest_fit = []
@@ -163,11 +206,6 @@ class RiskEnsemble:
                 (np.abs(np.asarray(self.time_horizons) - eval_time)).argmin()
             )
 
-        local_predicts = []
-        for midx, model in enumerate(self.models):
-            log.debug(f"[RiskEnsemble] predict for {model.name} on {X_.shape}")
-            local_predicts.append(model.predict(X_, eval_time_horizons))
-
         for midx, local_pred in enumerate(local_predicts):
             for tidx, actual_tidx in enumerate(nearest_fit):
                 tmp_pred = np.copy(local_pred)
@@ -179,7 +217,7 @@ class RiskEnsemble:
                 pred[:, tidx:] += self.weights[actual_tidx, midx] * tmp_pred[:, [tidx]]
                 # add the increment by the model selected at the current timehorizon
 
-        return pd.DataFrame(pred)
+        return pred
 
     def explain(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
         if self.explainers is None:
@@ -223,6 +261,8 @@ class RiskEnsembleCV(RiskEnsemble):
             List of time horizons used for evaluation.
         explainer_plugins: List
             List of explainers attached to the ensemble.
+        n_jobs: Optional int
+            Maximum number of fold models evaluated concurrently at inference. Defaults to `n_inference_jobs()`.
     """
 
     def __init__(
@@ -236,6 +276,7 @@ class RiskEnsembleCV(RiskEnsemble):
         explanations_nepoch: int = 10000,
         n_folds: int = 3,
         hooks: Hooks = DefaultHooks(),
+        n_jobs: Optional[int] = None,
     ) -> None:
         if ensemble is None and models is None:
             raise ValueError(
@@ -253,11 +294,12 @@ class RiskEnsembleCV(RiskEnsemble):
         self.explanations_nepoch = explanations_nepoch
         self.explainers = explanations_model
         self.hooks = hooks
+        self.n_jobs = n_jobs
 
         if ensemble is not None:
             self.models = []
             for fold in range(n_folds):
-                self.models.append(copy.deepcopy(ensemble))
+                self.models.append(serialization.clone_model(ensemble))
         else:
             self.models = []
             if models is None or weights is None:
@@ -273,15 +315,32 @@ class RiskEnsembleCV(RiskEnsemble):
         skf = StratifiedKFold(
             n_splits=self.n_folds, shuffle=True, random_state=self.seed
         )
-        cv_idx = 0
-        for train_index, test_index in skf.split(X, Y):
-            self._should_continue()
-            X_train = X.iloc[train_index]
-            T_train = T.iloc[train_index]
-            Y_train = Y.iloc[train_index]
 
-            self.models[cv_idx].fit(X_train, T_train, Y_train)
-            cv_idx += 1
+        # Submit the members of all the folds at once to the shared pool.
+        tasks = []
+        folds_data = []
+        for fold, (train_index, test_index) in zip(self.models, skf.split(X, Y)):
+            X_train = pd.DataFrame(X.iloc[train_index]).reset_index(drop=True)
+            T_train = pd.Series(T.iloc[train_index]).reset_index(drop=True)
+            Y_train = pd.Series(Y.iloc[train_index]).reset_index(drop=True)
+
+            folds_data.append((X_train, T_train, Y_train))
+            for model in self._members(fold):
+                tasks.append((model, (X_train, T_train, Y_train)))
+
+        fitted = fit_models(tasks, hooks=self.hooks, topic="risk_ensemble_cv")
+
+        offset = 0
+        for cv_idx, fold in enumerate(self.models):
+            members = len(self._members(fold))
+            fold_fitted = fitted[offset : offset + members]
+            offset += members
+
+            if isinstance(fold, RiskEnsemble):
+                fold.models = fold_fitted
+                fold._fit_explainers(*folds_data[cv_idx])
+            else:
+                self.models[cv_idx] = fold_fitted[0]
 
         if self.explainers:
             return self
@@ -313,6 +372,21 @@ class RiskEnsembleCV(RiskEnsemble):
 
         return _fitted
 
+    def clone(self) -> "RiskEnsembleCV":
+        """Copy of the ensemble, without the explainers. The unfitted folds are rebuilt from their parameters."""
+        clone = copy.copy(self)
+        clone.models = [serialization.clone_model(fold) for fold in self.models]
+        clone.explainers = None
+
+        return clone
+
+    def _members(self, fold: Any) -> List:
+        # The folds can also wrap a single estimator, e.g. the comparative models in the apps.
+        if isinstance(fold, RiskEnsemble):
+            return fold.models
+
+        return [fold]
+
     def predict(
         self,
         X_: pd.DataFrame,
@@ -327,10 +401,30 @@ class RiskEnsembleCV(RiskEnsemble):
         X_: pd.DataFrame,
         eval_time_horizons: pd.DataFrame = None,
     ) -> pd.DataFrame:
-        results = []
+        if eval_time_horizons is None:
+            eval_time_horizons = self.time_horizons
 
-        for model in self.models:
-            results.append(np.asarray(model.predict(X_, eval_time_horizons)))
+        # Evaluate the fold x model grid at once, instead of fold by fold.
+        fold_models = [model for fold in self.models for model in self._members(fold)]
+        preds = predict_models(
+            fold_models,
+            X_,
+            "predict",
+            eval_time_horizons,
+            n_jobs=getattr(self, "n_jobs", None),
+        )
+
+        results = []
+        offset = 0
+        for fold in self.models:
+            members = len(self._members(fold))
+            fold_preds = preds[offset : offset + members]
+            offset += members
+
+            if isinstance(fold, RiskEnsemble):
+                results.append(fold._aggregate(fold_preds, X_, eval_time_horizons))
+            else:
+                results.append(fold_preds[0])
 
         results = np.asarray(results)
         calibrated_result = np.mean(results, axis=0)
@@ -0,0 +1,92 @@
+# stdlib
+import time
+from typing import Any, List, Tuple
+
+# third party
+from joblib import delayed
+
+# autoprognosis absolute
+from autoprognosis.exceptions import StudyCancelled
+from autoprognosis.hooks import DefaultHooks, Hooks
+import autoprognosis.logger as log
+from autoprognosis.utils.parallel import (
+    MemoryAwareDispatcher,
+    budgeted,
+    n_opt_jobs,
+    set_learner_threads,
+)
+
+dispatcher = MemoryAwareDispatcher(
+    max_nbytes=None, backend="loky", n_jobs=n_opt_jobs(), return_as="generator"
+)
+
+
+def _fit_model(model: Any, *args: Any) -> Any:
+    # The model was built in the parent process, outside of the thread budget.
+    return set_learner_threads(model).fit(*args)
+
+
+def _memory_footprint(model: Any, X: Any) -> int:
+    try:
+        return model.memory_footprint(*X.shape)
+    except BaseException:
+        return 0
+
+
+def _model_name(model: Any) -> str:
+    try:
+        return model.name()
+    except BaseException:
+        return type(model).__name__
+
+
+def fit_models(
+    tasks: List[Tuple[Any, tuple]],
+    hooks: Hooks = DefaultHooks(),
+    topic: str = "ensemble",
+) -> List[Any]:
+    """Fit a flat list of models through the shared process pool.
+
+    Args:
+        tasks: list
+            (model, fit arguments) pairs. The models from all the folds can be submitted at once.
+        hooks: Hooks
+            Checked for cancellation after each finished model, and notified with a progress heartbeat.
+        topic: str
+            Heartbeat topic.
+
+    Returns:
+        The fitted models, in the input order.
+    """
+    if hooks.cancel():
+        raise StudyCancelled(f"{topic}: cancelled")
+
+    start = time.time()
+    fitted = []
+
+    for idx, model in enumerate(
+        dispatcher(
+            delayed(budgeted(_fit_model, memory=_memory_footprint(model, args[0])))(
+                model, *args
+            )
+            for model, args in tasks
+        )
+    ):
+        fitted.append(model)
+
+        log.debug(f"[{topic}] fitted {idx + 1}/{len(tasks)}: {_model_name(model)}")
+        hooks.heartbeat(
+            topic=topic,
+            subtopic="fit",
+            event_type="progress",
+            name=_model_name(model),
+            done=idx + 1,
+            total=len(tasks),
+            duration=time.time() - start,
+        )
+
+        # Stop consuming the generator: the pending tasks are dropped.
+        if hooks.cancel():
+            raise StudyCancelled(f"{topic}: cancelled")
+
+    return fitted
@@ -0,0 +1,200 @@
+# stdlib
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+# third party
+from joblib import Parallel, delayed
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+from autoprognosis.utils.parallel import n_inference_jobs, thread_pool
+from autoprognosis.utils.serialization import load_from_file, save_to_file
+from autoprognosis.utils.shared import shared_root
+
+
+class CachedModelFn:
+    """Model wrapper for the explainers, caching the outputs by row content.
+
+    Perturbation based explainers evaluate the model on many synthetic rows, and the same masked rows come back across coalitions and across `explain` calls. Only the unseen rows are sent to the model, in a single batch.
+
+    Args:
+        predict_fn: Callable
+            Prediction callback, evaluated on a DataFrame.
+        feature_names: list
+            The columns of the DataFrame passed to `predict_fn`.
+        max_size: int
+            Maximum number of cached rows. The cache is reset when full.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable,
+        feature_names: List,
+        max_size: int = 100000,
+    ) -> None:
+        self.predict_fn = predict_fn
+        self.feature_names = feature_names
+        self.max_size = max_size
+        self._cache: Dict[bytes, np.ndarray] = {}
+
+    def __call__(self, X: Any) -> np.ndarray:
+        X = np.ascontiguousarray(np.asarray(X, dtype=float))
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        keys = [row.tobytes() for row in X]
+
+        outputs: Dict[bytes, np.ndarray] = {}
+        missing: Dict[bytes, int] = {}
+        for idx, key in enumerate(keys):
+            if key in outputs or key in missing:
+                continue
+            cached = self._cache.get(key)
+            if cached is not None:
+                outputs[key] = cached
+            else:
+                missing[key] = idx
+
+        log.debug(
+            f"[explainer] {len(X)} rows, {len(outputs)} cached, {len(missing)} evaluated"
+        )
+
+        if len(missing) > 0:
+            rows = X[list(missing.values())]
+            preds = np.asarray(
+                self.predict_fn(pd.DataFrame(rows, columns=self.feature_names))
+            )
+
+            if len(self._cache) + len(missing) > self.max_size:
+                self._cache = {}
+
+            for key, pred in zip(missing.keys(), preds):
+                outputs[key] = pred
+                self._cache[key] = pred
+
+        return np.asarray([outputs[key] for key in keys])
+
+    def clear(self) -> None:
+        self._cache = {}
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        return state
+
+
+def risk_predict_fn(model: Any, eval_times: List) -> Callable:
+    """Prediction callback for the last evaluation horizon of a risk model.
+
+    Single estimators only evaluate the requested horizon. The risk ensembles combine the increments of all the horizons, so they still receive the full list.
+    """
+    # autoprognosis absolute
+    from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble
+
+    if isinstance(model, RiskEnsemble):
+        horizons = list(eval_times)
+    else:
+        horizons = [eval_times[-1]]
+
+    def predict_fn(X: pd.DataFrame) -> np.ndarray:
+        return np.asarray(model.predict(X, horizons))[:, -1]
+
+    return predict_fn
+
+
+def _explain_chunk(
+    explain_fn: Callable, chunk: pd.DataFrame, seeds: Optional[List[int]]
+) -> List[Any]:
+    if seeds is None:
+        return list(explain_fn(chunk))
+
+    return list(explain_fn(chunk, seeds))
+
+
+# The explanation callbacks loaded by a worker process, by file.
+_worker_callbacks: Dict[str, Callable] = {}
+
+
+def _explain_shared_chunk(
+    path: str, chunk: pd.DataFrame, seeds: Optional[List[int]]
+) -> List[Any]:
+    if path not in _worker_callbacks:
+        _worker_callbacks.clear()
+        _worker_callbacks[path] = load_from_file(path)
+
+    return _explain_chunk(_worker_callbacks[path], chunk, seeds)
+
+
+def explain_rows(
+    explain_fn: Callable,
+    X: pd.DataFrame,
+    n_jobs: Optional[int] = None,
+    chunk_size: int = 1,
+    random_state: Optional[int] = None,
+    processes: bool = False,
+) -> Generator:
+    """Stream the outputs of a per-row explanation callback over chunks of `X`, computed concurrently.
+
+    With a `random_state`, every row gets its own seed, `random_state` + the row position, so the outputs do not depend on `n_jobs` or `chunk_size`.
+
+    Args:
+        explain_fn: Callable
+            Callback taking a chunk of rows, and the seeds of the rows if `random_state` is set, and returning one output per row. It must be safe to call from multiple threads, or picklable with `processes`.
+        X: pd.DataFrame
+            The rows to explain.
+        n_jobs: Optional int
+            Maximum concurrency. Defaults to `n_inference_jobs()`. `n_jobs = 1` runs in the current thread.
+        chunk_size: int
+            Number of rows in each task.
+        random_state: Optional int
+            Base seed of the rows.
+        processes: bool
+            Run the chunks in a process pool instead of the thread pool, for the explainers holding the GIL. `explain_fn` is pickled once, to a shared file loaded once by each worker, instead of with every task.
+
+    Returns:
+        A generator over the row outputs, in the input order. The first rows are available before the full batch is done.
+    """
+    if chunk_size < 1:
+        raise ValueError("Invalid value for chunk_size. Must be >= 1.")
+    if n_jobs is None:
+        n_jobs = n_inference_jobs()
+
+    starts = range(0, len(X), chunk_size)
+    chunks = [X.iloc[start : start + chunk_size] for start in starts]
+    if random_state is None:
+        seeds: List[Optional[List[int]]] = [None] * len(chunks)
+    else:
+        seeds = [
+            list(range(random_state + start, random_state + start + len(chunk)))
+            for start, chunk in zip(starts, chunks)
+        ]
+
+    if n_jobs == 1 or len(chunks) <= 1:
+        for chunk, chunk_seeds in zip(chunks, seeds):
+            yield from _explain_chunk(explain_fn, chunk, chunk_seeds)
+        return
+
+    log.debug(f"[explainer] {len(X)} rows, {len(chunks)} tasks, {n_jobs} workers")
+
+    if not processes:
+        pool = thread_pool("explainer", n_jobs)
+        for outputs in pool.map(
+            _explain_chunk, [explain_fn] * len(chunks), chunks, seeds
+        ):
+            yield from outputs
+        return
+
+    with shared_root() as root:
+        root.mkdir(parents=True)
+        path = str(root / "explain_fn.p")
+        save_to_file(path, explain_fn)
+
+        dispatcher = Parallel(
+            max_nbytes=None, backend="loky", n_jobs=n_jobs, return_as="generator"
+        )
+        for outputs in dispatcher(
+            delayed(_explain_shared_chunk)(path, chunk, chunk_seeds)
+            for chunk, chunk_seeds in zip(chunks, seeds)
+        ):
+            yield from outputs
@@ -1,8 +1,7 @@
 # stdlib
 from abc import ABCMeta, abstractmethod
-import copy
-import itertools
-from typing import Any, Generator, List, Optional, Union
+from math import comb
+from typing import Any, Callable, Generator, List, Optional, Tuple, Union
 
 # third party
 import numpy as np
@@ -13,8 +12,10 @@ from sklearn.utils import resample
 # autoprognosis absolute
 import autoprognosis.logger as log
 from autoprognosis.plugins.explainers.base import ExplainerPlugin
+from autoprognosis.plugins.explainers.execution import CachedModelFn
 from autoprognosis.utils.distributions import enable_reproducible_results
 from autoprognosis.utils.pip import install
+import autoprognosis.utils.serialization as serialization
 
 for retry in range(2):
     try:
@@ -61,6 +62,26 @@ def bitmask_intervals(n: int, low: int, high: int) -> Generator:
             yield torch.from_numpy(np.asarray(result))
 
 
+def bitmask_sizes(n: int, low: int, high: int) -> torch.Tensor:
+    """Number of ones of each mask of `bitmask_intervals(n, low, high)`, in the same order."""
+    sizes = []
+    counts = []
+    for k in range(low, high):
+        ones = min(max(k, 0), n)
+        sizes.append(ones)
+        counts.append(comb(n, ones))
+
+    return torch.repeat_interleave(torch.tensor(sizes), torch.tensor(counts))
+
+
+def random_masks(sizes: torch.Tensor, n: int) -> torch.Tensor:
+    """Uniformly random bitmasks of length n, with sizes[i] ones on the row i."""
+    scores = torch.rand(len(sizes), n, device=sizes.device)
+    ranks = torch.argsort(torch.argsort(scores, dim=-1), dim=-1)
+
+    return (ranks < sizes.unsqueeze(-1)).long()
+
+
 class Masking(nn.Module):
     def __init__(self, masking_values: torch.Tensor) -> None:
         super(Masking, self).__init__()
@@ -100,6 +121,9 @@ class Masking(nn.Module):
 
 
 class invaseBase(metaclass=ABCMeta):
+    # The interaction masks keep between n_features - low and n_features - high - 1 features.
+    interaction_range: Tuple[int, int] = (3, 1)
+
     def __init__(
         self,
         estimator: Any,
@@ -113,6 +137,8 @@ class invaseBase(metaclass=ABCMeta):
         learning_rate: float = 1e-3,
         penalty_l2: float = 1e-3,
         feature_names: List = [],
+        max_batch_rows: int = 100000,
+        cache_size: int = 100000,
     ) -> None:
         self.batch_size = batch_size  # Batch size
         self.epochs = n_epoch  # Epoch size (large epoch is needed due to the policy gradient framework)
@@ -124,6 +150,8 @@ class invaseBase(metaclass=ABCMeta):
         self.n_epoch_print = n_epoch_print
         self.learning_rate = learning_rate
         self.penalty_l2 = penalty_l2
+        self.max_batch_rows = max_batch_rows
+        self.cache_size = cache_size
 
         # Build error predictor
         self.critic = self._build_critic().to(DEVICE)
@@ -138,9 +166,13 @@ class invaseBase(metaclass=ABCMeta):
     def _build_critic(self) -> nn.Module:
         ...
 
+    @abstractmethod
+    def _predict_fn(self, estimator: Any) -> Callable:
+        ...
+
     @abstractmethod
     def _baseline_metric(
-        self, estimator: Any, x: torch.Tensor, y: torch.Tensor
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor
     ) -> torch.Tensor:
         ...
 
@@ -154,16 +186,65 @@ class invaseBase(metaclass=ABCMeta):
     ) -> torch.Tensor:
         ...
 
-    @abstractmethod
-    def _importance_init(self, x: torch.Tensor) -> torch.Tensor:
-        ...
-
     @abstractmethod
     def _importance_test(
-        self, estimator: Any, x: np.ndarray, y: np.ndarray
-    ) -> np.ndarray:
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor
+    ) -> torch.Tensor:
         ...
 
+    def _masked_loss(
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor, masks: torch.Tensor
+    ) -> torch.Tensor:
+        """Baseline metric of x masked by consecutive blocks of len(x) masks, as a (len(masks), -1) tensor."""
+        repeats = len(masks) // len(x)
+        x = x.repeat(repeats, 1)
+        y = y.repeat(repeats, *([1] * (y.dim() - 1)))
+
+        losses = []
+        for start in range(0, len(masks), self.max_batch_rows):
+            end = start + self.max_batch_rows
+            masked_batch = self.masking([x[start:end], masks[start:end]])
+            loss = self._baseline_metric(model_fn, masked_batch, y[start:end])
+            losses.append(loss.reshape(len(masked_batch), -1))
+
+        return torch.cat(losses)
+
+    def _feature_importance(
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor
+    ) -> torch.Tensor:
+        """Loss of each row after masking each single feature, as a (rows, features, -1) tensor."""
+        n_rows, n_features = x.shape
+
+        masks = self._feature_masks.repeat_interleave(n_rows, dim=0)
+        loss = self._masked_loss(model_fn, x, y, masks).view(n_features, n_rows, -1)
+
+        return torch.clamp(loss.permute(1, 0, 2), min=0)
+
+    def _interaction_importance(
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor
+    ) -> torch.Tensor:
+        """Loss of the rows under the interaction masks, summed on the masked features, as a (rows, features, -1) tensor.
+
+        The mask schedule is applied by full slices of len(x) masks, `epochs_inner` times, each mask being randomly permuted, i.e. drawn uniformly with the same number of ones.
+        """
+        n_rows, n_features = x.shape
+
+        n_slices = len(self._interaction_sizes) // n_rows
+        sizes = self._interaction_sizes[: n_slices * n_rows].repeat(self.epochs_inner)
+
+        importance = torch.zeros((n_rows, n_features, 1)).to(DEVICE)
+        step = max(1, self.max_batch_rows // n_rows) * n_rows
+        for start in range(0, len(sizes), step):
+            masks = random_masks(sizes[start : start + step], n_features).to(DEVICE)
+            loss = self._masked_loss(model_fn, x, y, masks)
+
+            local_importance = (1 - masks).unsqueeze(-1) * loss.unsqueeze(1)
+            importance = importance + local_importance.view(
+                -1, n_rows, n_features, loss.shape[-1]
+            ).sum(dim=0)
+
+        return importance
+
     def _train(self, estimator: Any, x: np.ndarray) -> "invaseBase":
         critic_solver = torch.optim.Adam(
             self.critic.parameters(),
@@ -172,6 +253,9 @@ class invaseBase(metaclass=ABCMeta):
         )
 
         y = self._baseline_predict(estimator, x)
+        model_fn = CachedModelFn(
+            self._predict_fn(estimator), self.feature_names, max_size=self.cache_size
+        )
 
         x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.1)
 
@@ -181,6 +265,18 @@ class invaseBase(metaclass=ABCMeta):
         x_test = torch.from_numpy(np.asarray(x_test)).float().to(DEVICE)
         y_test = torch.from_numpy(np.asarray(y_test)).float().squeeze().to(DEVICE)
 
+        # The masks are built once for all the batches and epochs.
+        n_features = x_train.shape[1]
+        low, high = self.interaction_range
+        self._feature_masks = (1 - torch.eye(n_features)).long().to(DEVICE)
+        self._interaction_sizes = bitmask_sizes(
+            n_features, n_features - low, n_features - high
+        ).to(DEVICE)
+
+        # Fixed validation target: the early stopping checks only evaluate the critic.
+        with torch.no_grad():
+            importance_test = self._importance_test(model_fn, x_test, y_test)
+
         patience = 0
         best_val_loss = 99999999
 
@@ -200,7 +296,7 @@ class invaseBase(metaclass=ABCMeta):
                 x_batch = x_train[idx, :]
                 y_batch = y_train[idx]
 
-                importance = self._importance_test(estimator, x_batch, y_batch).detach()
+                importance = self._importance_test(model_fn, x_batch, y_batch).detach()
 
                 critic_solver.zero_grad()
 
@@ -221,10 +317,11 @@ class invaseBase(metaclass=ABCMeta):
 
             if epoch % self.n_epoch_print == 0:
                 with torch.no_grad():
-                    importance = self._importance_test(estimator, x_test, y_test)
                     predicted_importance = self.critic(x_test)
 
-                    val_loss = self._importance_loss(predicted_importance, importance)
+                    val_loss = self._importance_loss(
+                        predicted_importance, importance_test
+                    )
 
                     if val_loss < best_val_loss:
                         best_val_loss = val_loss
@@ -238,6 +335,8 @@ class invaseBase(metaclass=ABCMeta):
                     f"Epoch: {epoch}, training invase loss: {torch.mean(train_loss)}  validation loss: {val_loss}"
                 )
 
+        del self._feature_masks, self._interaction_sizes
+
         return self
 
 
@@ -304,18 +403,23 @@ class invaseClassifier(invaseBase):
             nn.Sigmoid(),
         )
 
+    def _predict_fn(self, estimator: Any) -> Callable:
+        self.use_proba = hasattr(estimator, "predict_proba")
+        if self.use_proba:
+            return estimator.predict_proba
+        else:
+            return estimator.predict
+
     def _baseline_metric(
-        self, estimator: Any, x: torch.Tensor, y: torch.Tensor
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor
     ) -> torch.Tensor:
-        df = pd.DataFrame(x.detach().cpu().numpy(), columns=self.feature_names)
-        if hasattr(estimator, "predict_proba"):
-            baseline_proba = estimator.predict_proba(df)
-            baseline_proba = torch.from_numpy(np.asarray(baseline_proba)).to(DEVICE)
+        baseline_proba = model_fn(x.detach().cpu().numpy())
+        baseline_proba = torch.from_numpy(np.asarray(baseline_proba)).to(DEVICE)
+        if self.use_proba:
             return -torch.sum(y * torch.log(baseline_proba + EPS), dim=-1)
         else:
-            baseline_proba = estimator.predict(df)
-            baseline_proba = torch.from_numpy(np.asarray(baseline_proba)).to(DEVICE)
-            return torch.sum((y - baseline_proba) ** 2, dim=-1)
+            error = (y - baseline_proba.view(y.shape)) ** 2
+            return torch.sum(error.reshape(len(error), -1), dim=-1)
 
     def _baseline_predict(self, estimator: Any, x: torch.Tensor) -> torch.Tensor:
         df = pd.DataFrame(x, columns=self.feature_names)
@@ -329,47 +433,12 @@ class invaseClassifier(invaseBase):
     ) -> torch.Tensor:
         return nn.MSELoss()(y_pred, y_true)
 
-    def _importance_init(self, x: torch.Tensor) -> torch.Tensor:
-        return torch.zeros(x.shape).to(DEVICE)
-
     def _importance_test(
-        self, estimator: Any, x: np.ndarray, y: np.ndarray
-    ) -> np.ndarray:
-        importance = self._importance_init(x)
-        n_features = x.shape[-1]
-        # get baseline importance
-        for mask in bitmask_intervals(n_features, n_features - 1, n_features):
-            mask = torch.broadcast_to(mask, x.shape).to(DEVICE)
-            masked_batch = self.masking([x, mask])
-
-            baseline_loss = self._baseline_metric(estimator, masked_batch, y)
-
-            importance = torch.max(importance, ((1 - mask).T * baseline_loss).T)
-
-        # interaction importance
-        bitmask_generator = bitmask_intervals(
-            n_features, n_features - 3, n_features - 1
-        )
-        next_slice = list(itertools.islice(bitmask_generator, len(x)))
-
-        while len(next_slice) == len(x):
-            next_mask = torch.stack(next_slice).to(DEVICE)
-
-            for local_inter in range(self.epochs_inner):
-                indices = torch.argsort(torch.rand(*next_mask.shape), dim=-1)
-                mask = next_mask[
-                    torch.arange(next_mask.shape[0]).unsqueeze(-1), indices
-                ]
-
-                masked_batch = self.masking([x, mask])
-
-                baseline_loss = self._baseline_metric(estimator, masked_batch, y)
-
-                local_importance = 1e-3 * ((1 - mask).T * baseline_loss).T
-
-                importance += local_importance
-
-            next_slice = list(itertools.islice(bitmask_generator, len(x)))
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor
+    ) -> torch.Tensor:
+        importance = self._feature_importance(model_fn, x, y)
+        importance += 1e-3 * self._interaction_importance(model_fn, x, y)
+        importance = importance.squeeze(-1)
 
         importance -= importance.min(-1, keepdim=True)[0]
         importance /= importance.max(-1, keepdim=True)[0] + EPS
@@ -378,6 +447,8 @@ class invaseClassifier(invaseBase):
 
 
 class invaseRiskEstimation(invaseBase):
+    interaction_range = (2, 1)
+
     def __init__(
         self,
         estimator: Any,
@@ -438,14 +509,16 @@ class invaseRiskEstimation(invaseBase):
             nn.Linear(self.latent_dim2, self.input_shape * len(self.eval_times)),
         )
 
+    def _predict_fn(self, estimator: Any) -> Callable:
+        def predict_fn(X: pd.DataFrame) -> np.ndarray:
+            return estimator.predict(X, self.eval_times)
+
+        return predict_fn
+
     def _baseline_metric(
-        self, estimator: Any, x: torch.Tensor, y: torch.Tensor
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor
     ) -> torch.Tensor:
-        df = pd.DataFrame(x.detach().cpu().numpy(), columns=self.feature_names)
-        baseline_proba = estimator.predict(
-            df,
-            self.eval_times,
-        )
+        baseline_proba = model_fn(x.detach().cpu().numpy())
         baseline_proba = torch.from_numpy(np.asarray(baseline_proba)).to(DEVICE)
 
         out = (baseline_proba - y) ** 2 + torch.abs(baseline_proba - y)
@@ -462,52 +535,11 @@ class invaseRiskEstimation(invaseBase):
         df = pd.DataFrame(x, columns=self.feature_names)
         return estimator.predict(df, self.eval_times)
 
-    def _importance_init(self, x: torch.Tensor) -> torch.Tensor:
-        return torch.zeros((x.shape[0], x.shape[1], len(self.eval_times))).to(DEVICE)
-
     def _importance_test(
-        self, estimator: Any, x: np.ndarray, y: np.ndarray
-    ) -> np.ndarray:
-        importance = self._importance_init(x)
-        n_features = x.shape[-1]
-
-        # get baseline importance
-        for mask in bitmask_intervals(n_features, n_features - 1, n_features):
-            mask = torch.broadcast_to(mask, x.shape).to(DEVICE)
-            masked_batch = self.masking([x, mask])
-
-            baseline_loss = self._baseline_metric(estimator, masked_batch, y)
-
-            for idx in range(len(self.eval_times)):
-                importance[:, :, idx] = torch.max(
-                    importance[:, :, idx], ((1 - mask).T * baseline_loss[:, idx]).T
-                )
-
-        # interaction importance
-        bitmask_generator = bitmask_intervals(
-            n_features, n_features - 2, n_features - 1
-        )
-        next_slice = list(itertools.islice(bitmask_generator, len(x)))
-
-        while len(next_slice) == len(x):
-            next_mask = torch.stack(next_slice).to(DEVICE)
-
-            for local_inter in range(self.epochs_inner):
-                indices = torch.argsort(torch.rand(*next_mask.shape), dim=-1)
-                mask = next_mask[
-                    torch.arange(next_mask.shape[0]).unsqueeze(-1), indices
-                ]
-
-                masked_batch = self.masking([x, mask])
-
-                baseline_loss = self._baseline_metric(estimator, masked_batch, y)
-
-                for idx in range(len(self.eval_times)):
-                    importance[:, :, idx] += (
-                        1e-3 * ((1 - mask).T * baseline_loss[:, idx]).T
-                    )
-
-            next_slice = list(itertools.islice(bitmask_generator, len(x)))
+        self, model_fn: Callable, x: torch.Tensor, y: torch.Tensor
+    ) -> torch.Tensor:
+        importance = self._feature_importance(model_fn, x, y)
+        importance += 1e-3 * self._interaction_importance(model_fn, x, y)
 
         # importance = importance.permute(0, 2, 1)
         # importance = (importance - importance.min(-1, keepdim=True)[0]) / (importance.max(-1, keepdim=True)[0] - importance.min(-1, keepdim=True)[0] + EPS)
@@ -648,7 +680,7 @@ class INVASEPlugin(ExplainerPlugin):
 
         super().__init__(self.feature_names)
 
-        model = copy.deepcopy(estimator)
+        model = serialization.clone_model(estimator)
 
         self.explainer: Union[invaseCV, invaseClassifier, invaseRiskEstimation]
         if task_type in ["classification"]:
@@ -9,7 +9,13 @@ import shap
 
 # autoprognosis absolute
 from autoprognosis.plugins.explainers.base import ExplainerPlugin
+from autoprognosis.plugins.explainers.execution import (
+    CachedModelFn,
+    explain_rows,
+    risk_predict_fn,
+)
 from autoprognosis.utils.distributions import enable_reproducible_results
+import autoprognosis.utils.serialization as serialization
 
 
 class KernelSHAPPlugin(ExplainerPlugin):
@@ -26,6 +32,8 @@ class KernelSHAPPlugin(ExplainerPlugin):
         subsample: int. Number of samples to use.
         time_to_event: dataframe. Used for risk estimation tasks.
         eval_times: list. Used for risk estimation tasks.
+        n_jobs: int. Maximum number of rows explained concurrently. Defaults to `n_inference_jobs()`.
+        cache_size: int. Maximum number of model outputs cached by row content.
 
     Example:
         >>> import pandas as pd
@@ -67,6 +75,8 @@ class KernelSHAPPlugin(ExplainerPlugin):
         time_to_event: Optional[pd.DataFrame] = None,  # for survival analysis
         eval_times: Optional[List] = None,  # for survival analysis
         random_state: int = 0,
+        n_jobs: Optional[int] = None,
+        cache_size: int = 100000,
         **kwargs: Any,
     ) -> None:
         if task_type not in ["classification", "regression", "risk_estimation"]:
@@ -79,31 +89,21 @@ class KernelSHAPPlugin(ExplainerPlugin):
 
         X = pd.DataFrame(X, columns=self.feature_names)
         X_summary = shap.kmeans(X, subsample)
-        model = copy.deepcopy(estimator)
+        model = serialization.clone_model(estimator)
         self.task_type = task_type
 
+        self.n_jobs = n_jobs
+
         if task_type == "classification":
             if not prefit:
                 model.fit(X, y)
 
-            def model_fn(X: pd.DataFrame) -> pd.DataFrame:
-                X = pd.DataFrame(X, columns=self.feature_names)
-                return model.predict_proba(X)
-
-            self.explainer = shap.KernelExplainer(
-                model_fn, X_summary, feature_names=self.feature_names
-            )
+            predict_fn = model.predict_proba
         elif task_type == "regression":
             if not prefit:
                 model.fit(X, y)
 
-            def model_fn(X: pd.DataFrame) -> pd.DataFrame:
-                X = pd.DataFrame(X, columns=self.feature_names)
-                return model.predict(X)
-
-            self.explainer = shap.KernelExplainer(
-                model_fn, X_summary, feature_names=self.feature_names
-            )
+            predict_fn = model.predict
         elif task_type == "risk_estimation":
             if time_to_event is None or eval_times is None:
                 raise RuntimeError("Invalid input for risk estimation interpretability")
@@ -111,22 +111,34 @@ class KernelSHAPPlugin(ExplainerPlugin):
             if not prefit:
                 model.fit(X, time_to_event, y)
 
-            def model_fn(X: pd.DataFrame) -> pd.DataFrame:
-                X = pd.DataFrame(X, columns=self.feature_names)
-                out = np.asarray(model.predict(X, eval_times))[:, -1]
-                return out
+            predict_fn = risk_predict_fn(model, eval_times)
 
-            self.explainer = shap.KernelExplainer(
-                model_fn, X_summary, feature_names=self.feature_names
-            )
+        self.model_fn = CachedModelFn(
+            predict_fn, self.feature_names, max_size=cache_size
+        )
+        self.explainer = shap.KernelExplainer(
+            self.model_fn, X_summary, feature_names=self.feature_names
+        )
 
     def plot(self, X: pd.DataFrame) -> None:  # type: ignore
         shap_values = self.explainer.shap_values(X)
         shap.summary_plot(shap_values, X)
 
+    def _explain_chunk(self, X: pd.DataFrame) -> np.ndarray:
+        # KernelExplainer keeps per-row state on the instance, so every task gets its own shallow copy.
+        explainer = copy.copy(self.explainer)
+
+        return np.asarray(explainer.shap_values(X))
+
     def explain(self, X: pd.DataFrame) -> np.ndarray:
         X = pd.DataFrame(X, columns=self.feature_names)
-        importance = np.asarray(self.explainer.shap_values(X))
+        importance = np.asarray(
+            list(
+                explain_rows(
+                    self._explain_chunk, X, n_jobs=getattr(self, "n_jobs", None)
+                )
+            )
+        )
         if self.task_type == "classification":
             importance = importance[:, :, 1]
 
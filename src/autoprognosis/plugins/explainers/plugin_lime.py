@@ -1,6 +1,5 @@
 # stdlib
-import copy
-from typing import Any, List, Optional
+from typing import Any, Generator, List, Optional
 
 # third party
 import numpy as np
@@ -8,7 +7,9 @@ import pandas as pd
 
 # autoprognosis absolute
 from autoprognosis.plugins.explainers.base import ExplainerPlugin
+from autoprognosis.plugins.explainers.execution import explain_rows
 from autoprognosis.utils.pip import install
+import autoprognosis.utils.serialization as serialization
 
 for retry in range(2):
     try:
@@ -35,6 +36,7 @@ class LimePlugin(ExplainerPlugin):
         n_epoch: int. training epochs
         time_to_event: dataframe. Used for risk estimation tasks.
         eval_times: list. Used for risk estimation tasks.
+        random_state: int. Base seed of the per-row sampling.
 
     Example:
         >>> import pandas as pd
@@ -81,12 +83,13 @@ class LimePlugin(ExplainerPlugin):
             raise RuntimeError("invalid task type")
 
         self.task_type = task_type
+        self.random_state = random_state
         self.feature_names = list(
             feature_names if feature_names is not None else pd.DataFrame(X).columns
         )
         super().__init__(self.feature_names)
 
-        model = copy.deepcopy(estimator)
+        model = serialization.clone_model(estimator)
         if task_type == "classification":
             if not prefit:
                 model.fit(X, y)
@@ -118,11 +121,18 @@ class LimePlugin(ExplainerPlugin):
                 np.asarray(X), feature_names=self.feature_names, mode="regression"
             )
 
-    def explain(self, X: pd.DataFrame) -> pd.DataFrame:
-        X = np.asarray(X)
-        results = []
+    def _reseed(self, seed: int) -> None:
+        random_state = np.random.RandomState(seed)
+
+        self.explainer.random_state = random_state
+        self.explainer.base.random_state = random_state
+        if self.explainer.discretizer is not None:
+            self.explainer.discretizer.random_state = random_state
 
-        for v in X:
+    def _explain_chunk(self, X: pd.DataFrame, seeds: List[int]) -> List[pd.Series]:
+        results = []
+        for v, seed in zip(np.asarray(X), seeds):
+            self._reseed(seed)
             expl = self.explainer.explain_instance(
                 v,
                 self.predict_fn,  # labels=self.feature_names,# top_labels=self.feature_names
@@ -131,9 +141,46 @@ class LimePlugin(ExplainerPlugin):
 
             vals = [x[1] for x in importance]
             cols = [x[0] for x in importance]
-            results.append(vals)
+            results.append(pd.Series(vals, index=cols))
+
+        return results
+
+    def explain_iter(
+        self,
+        X: pd.DataFrame,
+        n_jobs: Optional[int] = 1,
+        chunk_size: int = 1,
+    ) -> Generator:
+        """Stream the explanation of each row of X, as a pd.Series indexed by the LIME feature conditions.
+
+        Args:
+            X: pd.DataFrame
+                The rows to explain.
+            n_jobs: Optional int
+                Number of worker processes. None uses all the cores.
+            chunk_size: int
+                Number of rows in each worker task.
+        """
+        return explain_rows(
+            self._explain_chunk,
+            pd.DataFrame(np.asarray(X)),
+            n_jobs=n_jobs,
+            chunk_size=chunk_size,
+            random_state=getattr(self, "random_state", 0),
+            processes=True,
+        )
+
+    def explain(
+        self,
+        X: pd.DataFrame,
+        n_jobs: Optional[int] = 1,
+        chunk_size: int = 1,
+    ) -> pd.DataFrame:
+        results = list(self.explain_iter(X, n_jobs=n_jobs, chunk_size=chunk_size))
 
-        return pd.DataFrame(results, columns=cols)
+        return pd.DataFrame(
+            [list(row.values) for row in results], columns=results[-1].index
+        )
 
     @staticmethod
     def name() -> str:
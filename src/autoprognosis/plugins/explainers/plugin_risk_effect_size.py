@@ -1,6 +1,6 @@
 # stdlib
-import copy
-from typing import Any, List, Optional
+import hashlib
+from typing import Any, List, Optional, Tuple
 
 # third party
 import matplotlib.pyplot as plt
@@ -11,6 +11,7 @@ import seaborn as sns
 # autoprognosis absolute
 from autoprognosis.plugins.explainers.base import ExplainerPlugin
 from autoprognosis.utils.distributions import enable_reproducible_results
+import autoprognosis.utils.serialization as serialization
 
 
 class RiskEffectSizePlugin(ExplainerPlugin):
@@ -27,6 +28,8 @@ class RiskEffectSizePlugin(ExplainerPlugin):
         time_to_event: dataframe. Used for risk estimation tasks.
         eval_times: list. Used for risk estimation tasks.
 
+    The predictions, risk buckets and per-feature effect sizes of the training set are computed at construction, so explaining the training population is a lookup. New rows can be added with `update`.
+
     Example:
         >>> import pandas as pd
         >>> from sklearn.datasets import load_iris
@@ -79,7 +82,7 @@ class RiskEffectSizePlugin(ExplainerPlugin):
         )
 
         X = pd.DataFrame(X, columns=self.feature_names)
-        model = copy.deepcopy(estimator)
+        model = serialization.clone_model(estimator)
         self.task_type = task_type
         self.effect_size = effect_size
 
@@ -113,62 +116,156 @@ class RiskEffectSizePlugin(ExplainerPlugin):
 
             self.predict_cbk = model_fn
 
-    # function to calculate Cohen's d for independent samples
-    def _cohend(self, d1: pd.DataFrame, d2: pd.DataFrame) -> pd.DataFrame:
-        n1, n2 = len(d1), len(d2)
-        # calculate the variance of the samples
-        s1, s2 = np.var(d1, ddof=1), np.var(d2, ddof=1)
-        # calculate the pooled standard deviation
-        s = np.sqrt(((n1 - 1) * s1 + (n2 - 1) * s2) / (n1 + n2 - 2))
+        self._population = self._population_stats(X, self.predict_cbk(X))
+        self._population_key = self._data_key(X)
 
-        # calculate the means of the samples
-        u1, u2 = np.mean(d1), np.mean(d2)
-        # calculate the effect size
-        return np.abs((u1 - u2) / s)
+    def _data_key(self, X: pd.DataFrame) -> str:
+        digest = hashlib.sha256()
+        digest.update(str((X.shape, list(X.columns))).encode())
+        digest.update(np.ascontiguousarray(np.asarray(X, dtype=float)).tobytes())
 
-    def _get_population_shifts(
+        return digest.hexdigest()
+
+    def _bucketize(
+        self, preds: np.ndarray, edges: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        bins = 2
+        if edges is None:
+            buckets, edges = pd.cut(
+                preds,
+                bins=bins,
+                duplicates="drop",
+                labels=range(bins),
+                retbins=True,
+            )
+        else:
+            # New rows outside the training range go to the extreme buckets.
+            buckets = pd.cut(
+                np.clip(preds, edges[0], edges[-1]),
+                bins=edges,
+                labels=range(len(edges) - 1),
+                include_lowest=True,
+            )
+
+        return np.asarray(buckets.codes), np.asarray(edges)
+
+    def _population_stats(
         self,
-        predict_cbk: Any,
         X: pd.DataFrame,
-        effect_size: Optional[float] = None,
-    ) -> pd.DataFrame:
-        if not effect_size:
-            effect_size = self.effect_size
+        preds: pd.DataFrame,
+        edges: Optional[np.ndarray] = None,
+        center: Optional[np.ndarray] = None,
+    ) -> dict:
+        """Sufficient statistics of each risk bucket: rows, and the non-missing count, sum and sum of squares of every feature."""
+        values = np.asarray(X, dtype=float)
+        buckets, edges = self._bucketize(np.asarray(preds, dtype=float).ravel(), edges)
+
+        if center is None:
+            center = np.zeros(values.shape[1])
+            if len(values) > 0:
+                with np.errstate(all="ignore"):
+                    center = np.nan_to_num(np.nanmean(values, axis=0))
+
+        n_buckets = len(edges) - 1
+        stats = {
+            "edges": edges,
+            "center": center,
+            "rows": np.zeros(n_buckets),
+            "count": np.zeros((n_buckets, values.shape[1])),
+            "sum": np.zeros((n_buckets, values.shape[1])),
+            "sum_sq": np.zeros((n_buckets, values.shape[1])),
+        }
+        for bucket in range(n_buckets):
+            local = values[buckets == bucket] - center
+            mask = ~np.isnan(local)
+            local = np.where(mask, local, 0)
+
+            stats["rows"][bucket] = len(local)
+            stats["count"][bucket] = mask.sum(axis=0)
+            stats["sum"][bucket] = local.sum(axis=0)
+            stats["sum_sq"][bucket] = (local**2).sum(axis=0)
+
+        return stats
+
+    def _merge_stats(self, left: dict, right: dict) -> dict:
+        merged = dict(left)
+        for key in ["rows", "count", "sum", "sum_sq"]:
+            merged[key] = left[key] + right[key]
+
+        return merged
+
+    def _effect_sizes(self, stats: dict, columns: list) -> pd.DataFrame:
+        """Cohen's d between each risk bucket and the higher risk buckets."""
+        output = []
+        index = []
+        with np.errstate(all="ignore"):
+            for bucket in range(len(stats["rows"])):
+                n1 = stats["rows"][bucket]
+                n2 = stats["rows"][bucket + 1 :].sum()
+                if n1 < 2 or n2 < 2:
+                    continue
 
-        training_preds = predict_cbk(X)
-        bins = 2
-        buckets = pd.cut(
-            training_preds.values.squeeze(),
-            bins=bins,
-            duplicates="drop",
-            labels=range(bins),
+                c1 = stats["count"][bucket]
+                c2 = stats["count"][bucket + 1 :].sum(axis=0)
+                s1 = stats["sum"][bucket]
+                s2 = stats["sum"][bucket + 1 :].sum(axis=0)
+                sq1 = stats["sum_sq"][bucket]
+                sq2 = stats["sum_sq"][bucket + 1 :].sum(axis=0)
+
+                # calculate the variance of the samples
+                var1 = (sq1 - s1**2 / c1) / (c1 - 1)
+                var2 = (sq2 - s2**2 / c2) / (c2 - 1)
+                # calculate the pooled standard deviation
+                pooled = np.sqrt(((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2))
+
+                output.append(np.abs((s1 / c1 - s2 / c2) / pooled))
+                index.append(f"Risk lvl {bucket}")
+
+        return pd.DataFrame(
+            np.asarray(output).reshape(len(index), len(columns)),
+            index=index,
+            columns=columns,
         )
-        X = X.reset_index(drop=True)
 
-        output = pd.DataFrame([], columns=X.columns)
-        index = []
-        for bucket in range(bins):
-            curr_bucket = X[buckets == bucket]
-            other_buckets = X[buckets > bucket]
+    def update(self, X: pd.DataFrame) -> "RiskEffectSizePlugin":
+        """Add new rows to the precomputed population.
 
-            if len(curr_bucket) < 2 or len(other_buckets) < 2:
-                continue
+        Only the new rows are evaluated by the model. The risk buckets keep the edges learned at construction.
 
-            diffs = self._cohend(curr_bucket, other_buckets).to_dict()
+        Args:
+            X: pd.DataFrame
+                The new rows.
+        """
+        X = pd.DataFrame(X, columns=self.feature_names)
 
-            heatmaps = pd.DataFrame([[0] * len(X.columns)], columns=X.columns)
+        new_stats = self._population_stats(
+            X,
+            self.predict_cbk(X),
+            edges=self._population["edges"],
+            center=self._population["center"],
+        )
+        self._population = self._merge_stats(self._population, new_stats)
+        self._population_key = None
 
-            for key in diffs:
-                if diffs[key] < effect_size:
-                    continue
+        return self
 
-                heatmaps[key] = diffs[key]
+    def _get_population_shifts(
+        self,
+        predict_cbk: Any,
+        X: Optional[pd.DataFrame] = None,
+        effect_size: Optional[float] = None,
+    ) -> pd.DataFrame:
+        if not effect_size:
+            effect_size = self.effect_size
 
-            output = pd.concat([output, heatmaps])
-            index.append(f"Risk lvl {bucket}")
+        if X is None or self._data_key(X) == self._population_key:
+            stats = self._population
+        else:
+            stats = self._population_stats(X, predict_cbk(X))
 
-        output.index = index
-        output = output.astype(float)
+        columns = list(self.feature_names) if X is None else list(X.columns)
+        output = self._effect_sizes(stats, columns)
+        output = output.mask(output < effect_size, 0)
         output = output.clip(upper=3)
 
         return output
@@ -223,11 +320,13 @@ class RiskEffectSizePlugin(ExplainerPlugin):
         plot_ax.xaxis.set_ticks_position("top")
 
     def explain(
-        self, X: pd.DataFrame, effect_size: Optional[float] = None
+        self, X: Optional[pd.DataFrame] = None, effect_size: Optional[float] = None
     ) -> np.ndarray:
+        """Features with a large effect size between the risk levels of the population `X`. If `X` is None, the precomputed population is used."""
         if not effect_size:
             effect_size = self.effect_size
-        X = pd.DataFrame(X, columns=self.feature_names)
+        if X is not None:
+            X = pd.DataFrame(X, columns=self.feature_names)
 
         shifts = self._get_population_shifts(self.predict_cbk, X, effect_size)
 
@@ -1,5 +1,4 @@
 # stdlib
-import copy
 from typing import Any, List, Optional, Union
 
 # third party
@@ -8,6 +7,7 @@ import pandas as pd
 # autoprognosis absolute
 from autoprognosis.plugins.explainers.base import ExplainerPlugin
 from autoprognosis.utils.pip import install
+import autoprognosis.utils.serialization as serialization
 
 for retry in range(2):
     try:
@@ -90,7 +90,7 @@ class ShapPermutationSamplerPlugin(ExplainerPlugin):
         )
         super().__init__(self.feature_names)
 
-        model = copy.deepcopy(estimator)
+        model = serialization.clone_model(estimator)
 
         if task_type == "classification":
             if not prefit:
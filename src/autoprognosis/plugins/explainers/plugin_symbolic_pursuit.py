@@ -1,6 +1,5 @@
 # stdlib
-import copy
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Generator, List, Optional
 
 # third party
 import numpy as np
@@ -8,7 +7,9 @@ import pandas as pd
 
 # autoprognosis absolute
 from autoprognosis.plugins.explainers.base import ExplainerPlugin
+from autoprognosis.plugins.explainers.execution import explain_rows
 from autoprognosis.utils.pip import install
+import autoprognosis.utils.serialization as serialization
 
 for retry in range(2):
     try:
@@ -100,7 +101,7 @@ class SymbolicPursuitPlugin(ExplainerPlugin):
         )
 
         X = pd.DataFrame(X, columns=self.feature_names)
-        model = copy.deepcopy(estimator)
+        model = serialization.clone_model(estimator)
 
         self.task_type = task_type
         self.loss_tol = loss_tol
@@ -156,14 +157,44 @@ class SymbolicPursuitPlugin(ExplainerPlugin):
             )
             self.explainer.fit(model_fn_factory(eval_times[-1]), X)
 
-    def explain(self, X: pd.DataFrame) -> np.ndarray:
-        X = pd.DataFrame(X, columns=self.feature_names)
+    def _explain_chunk(self, X: pd.DataFrame) -> List:
+        return [
+            self.explainer.get_feature_importance(row.values) for _, row in X.iterrows()
+        ]
 
-        results = []
-        for idx, row in X.iterrows():
-            results.append(self.explainer.get_feature_importance(row.values))
+    def explain_iter(
+        self,
+        X: pd.DataFrame,
+        n_jobs: Optional[int] = 1,
+        chunk_size: int = 1,
+    ) -> Generator:
+        """Stream the feature importance of each row of X.
+
+        Args:
+            X: pd.DataFrame
+                The rows to explain.
+            n_jobs: Optional int
+                Number of worker processes. None uses all the cores.
+            chunk_size: int
+                Number of rows in each worker task.
+        """
+        return explain_rows(
+            self._explain_chunk,
+            pd.DataFrame(X, columns=self.feature_names),
+            n_jobs=n_jobs,
+            chunk_size=chunk_size,
+            processes=True,
+        )
 
-        return np.asarray(results)
+    def explain(
+        self,
+        X: pd.DataFrame,
+        n_jobs: Optional[int] = 1,
+        chunk_size: int = 1,
+    ) -> np.ndarray:
+        return np.asarray(
+            list(self.explain_iter(X, n_jobs=n_jobs, chunk_size=chunk_size))
+        )
 
     def plot(self, X: pd.DataFrame) -> tuple:  # type: ignore
         return str(self.explainer), self.explainer.get_projections()
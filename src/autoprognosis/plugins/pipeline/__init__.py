@@ -1,5 +1,6 @@
 # stdlib
-from typing import Any, Dict, List, Tuple, Type
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 # third party
 from optuna.trial import Trial
@@ -11,6 +12,7 @@ from autoprognosis.plugins import group
 # autoprognosis relative
 from .generators import (
     _generate_change_output,
+    _generate_clone,
     _generate_constructor,
     _generate_fit,
     _generate_get_args,
@@ -20,36 +22,52 @@ from .generators import (
     _generate_is_fitted,
     _generate_load,
     _generate_load_template,
+    _generate_memory_footprint_impl,
     _generate_name_impl,
     _generate_predict,
     _generate_predict_proba,
+    _generate_predict_proba_transformed,
+    _generate_predict_transformed,
+    _generate_prefix_fingerprint,
+    _generate_reduce,
     _generate_sample_param_impl,
     _generate_save,
     _generate_save_template,
     _generate_score,
     _generate_setstate,
+    _generate_transform,
     _generate_type_impl,
 )
 
+_pipeline_types: Dict[Tuple[str, ...], Type] = {}
+_pipeline_types_lock = threading.RLock()
+
 
 class PipelineMeta(type):
     def __new__(cls: Type, name: str, plugins: Tuple[Type, ...], dct: dict) -> Any:
         dct["__init__"] = _generate_constructor()
         dct["__setstate__"] = _generate_setstate()
         dct["__getstate__"] = _generate_getstate()
+        dct["__reduce__"] = _generate_reduce(_restore)
         dct["fit"] = _generate_fit()
         dct["is_fitted"] = _generate_is_fitted()
         dct["predict"] = _generate_predict()
         dct["predict_proba"] = _generate_predict_proba()
+        dct["transform"] = _generate_transform()
+        dct["prefix_fingerprint"] = _generate_prefix_fingerprint()
+        dct["predict_transformed"] = _generate_predict_transformed()
+        dct["predict_proba_transformed"] = _generate_predict_proba_transformed()
         dct["score"] = _generate_score()
         dct["name"] = _generate_name_impl(plugins)
         dct["type"] = _generate_type_impl(plugins)
+        dct["memory_footprint"] = _generate_memory_footprint_impl(plugins)
         dct["hyperparameter_space"] = _generate_hyperparameter_space_impl(plugins)
         dct[
             "hyperparameter_space_for_layer"
         ] = _generate_hyperparameter_space_for_layer_impl(plugins)
         dct["sample_params"] = _generate_sample_param_impl(plugins)
         dct["get_args"] = _generate_get_args()
+        dct["clone"] = _generate_clone()
 
         dct["save_template"] = _generate_save_template()
         dct["save"] = _generate_save()
@@ -69,6 +87,10 @@ class PipelineMeta(type):
     def type(*args: Any) -> str:
         raise NotImplementedError("not implemented")
 
+    @staticmethod
+    def memory_footprint(*args: Any) -> int:
+        raise NotImplementedError("not implemented")
+
     @staticmethod
     def hyperparameter_space(*args: Any, **kwargs: Any) -> Dict:
         raise NotImplementedError("not implemented")
@@ -83,6 +105,9 @@ class PipelineMeta(type):
     def get_args(*args: Any, **kwargs: Any) -> Dict:
         raise NotImplementedError("not implemented")
 
+    def clone(self: Any) -> Any:
+        raise NotImplementedError("not implemented")
+
     def fit(self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any) -> Any:
         raise NotImplementedError("not implemented")
 
@@ -95,6 +120,18 @@ class PipelineMeta(type):
     def predict_proba(*args: Any, **kwargs: Any) -> pd.DataFrame:
         raise NotImplementedError("not implemented")
 
+    def transform(self: Any, X: pd.DataFrame) -> pd.DataFrame:
+        raise NotImplementedError("not implemented")
+
+    def prefix_fingerprint(self: Any) -> Optional[str]:
+        raise NotImplementedError("not implemented")
+
+    def predict_transformed(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        raise NotImplementedError("not implemented")
+
+    def predict_proba_transformed(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        raise NotImplementedError("not implemented")
+
     def save_template(*args: Any, **kwargs: Any) -> bytes:
         raise NotImplementedError("not implemented")
 
@@ -133,8 +170,27 @@ class PipelineMeta(type):
 
 
 def Pipeline(plugins_str: List[str]) -> Any:
-    plugins = group(plugins_str)
+    """Pipeline class for a list of plugin fqdns.
+
+    The generated classes are memoized by the tuple of fqdns, and identical pipelines share the same class object.
+    """
+    key = tuple(plugins_str)
+
+    with _pipeline_types_lock:
+        if key not in _pipeline_types:
+            plugins = group(plugins_str)
+
+            name = "_".join(p.name() for p in plugins)
+
+            _pipeline_types[key] = PipelineMeta(name, plugins, {})
+
+        return _pipeline_types[key]
+
+
+def _restore(plugins_str: Tuple[str, ...], state: dict) -> Any:
+    template = Pipeline(list(plugins_str))
 
-    name = "_".join(p.name() for p in plugins)
+    pipeline = template.__new__(template)
+    pipeline.__setstate__(state)
 
-    return PipelineMeta(name, plugins, {})
+    return pipeline
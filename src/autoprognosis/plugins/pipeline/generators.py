@@ -1,5 +1,7 @@
 # stdlib
-from typing import Any, Callable, Dict, Tuple, Type
+import copy
+import hashlib
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
 # third party
 import numpy as np
@@ -25,6 +27,15 @@ def _generate_type_impl(plugins: Tuple[Type, ...]) -> Callable:
     return type_impl
 
 
+def _generate_memory_footprint_impl(plugins: Tuple[Type, ...]) -> Callable:
+    def memory_footprint_impl(*args: Any) -> int:
+        # The stages run one after the other.
+        n_rows, n_features = args[-2:]
+        return max(p.memory_footprint(n_rows, n_features) for p in plugins)
+
+    return memory_footprint_impl
+
+
 def _generate_hyperparameter_space_impl(plugins: Tuple[Type, ...]) -> Callable:
     def hyperparameter_space_impl(*args: Any, **kwargs: Any) -> Dict:
         out = {}
@@ -114,6 +125,16 @@ def _generate_get_args() -> Callable:
     return get_args_impl
 
 
+def _generate_clone() -> Callable:
+    def clone_impl(self: Any) -> Any:
+        clone = type(self)(copy.deepcopy(self.args))
+        clone.output = self.output
+
+        return clone
+
+    return clone_impl
+
+
 def _generate_fit() -> Callable:
     def fit_impl(self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any) -> Any:
         local_X = X.copy()
@@ -122,6 +143,7 @@ def _generate_fit() -> Callable:
             local_X = stage.fit_transform(local_X)
 
         self.stages[-1].fit(local_X, *args, **kwargs)
+        self._prefix_fingerprint = None
 
         return self
 
@@ -135,32 +157,55 @@ def _generate_is_fitted() -> Callable:
     return fit_impl
 
 
-def _generate_predict() -> Callable:
-    @decorators.benchmark
-    def predict_impl(
-        self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any
-    ) -> pd.DataFrame:
+def _generate_transform() -> Callable:
+    def transform_impl(self: Any, X: pd.DataFrame) -> pd.DataFrame:
         local_X = X.copy()
         for stage in self.stages[:-1]:
             local_X = stage.transform(local_X)
 
-        result = self.stages[-1].predict(local_X, *args, **kwargs)
+        return local_X
 
-        return self.output(result)
+    return transform_impl
 
-    return predict_impl
 
+def _generate_prefix_fingerprint() -> Callable:
+    # Content hash of the fitted preprocessing stages. Pipelines sharing a
+    # fingerprint transform the input identically and can reuse the output.
+    def prefix_fingerprint_impl(self: Any) -> Optional[str]:
+        cached = self.__dict__.get("_prefix_fingerprint", None)
+        if cached is not None:
+            return cached
 
-def _generate_predict_proba() -> Callable:
-    @decorators.benchmark
-    def predict_proba_impl(
+        digest = hashlib.sha256()
+        try:
+            for stage in self.stages[:-1]:
+                digest.update(stage.fqdn().encode())
+                digest.update(stage.save())
+        except BaseException:
+            return None
+
+        self._prefix_fingerprint = digest.hexdigest()
+        return self._prefix_fingerprint
+
+    return prefix_fingerprint_impl
+
+
+def _generate_predict_transformed() -> Callable:
+    def predict_transformed_impl(
         self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any
     ) -> pd.DataFrame:
-        local_X = X.copy()
-        for stage in self.stages[:-1]:
-            local_X = stage.transform(local_X, *args, **kwargs)
+        result = self.stages[-1].predict(X, *args, **kwargs)
+
+        return self.output(result)
+
+    return predict_transformed_impl
 
-        result = self.stages[-1].predict_proba(local_X)
+
+def _generate_predict_proba_transformed() -> Callable:
+    def predict_proba_transformed_impl(
+        self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any
+    ) -> pd.DataFrame:
+        result = self.stages[-1].predict_proba(X)
 
         if result.isnull().values.any():
             raise ValueError(
@@ -170,6 +215,30 @@ def _generate_predict_proba() -> Callable:
             )
         return self.output(result)
 
+    return predict_proba_transformed_impl
+
+
+def _generate_predict() -> Callable:
+    @decorators.benchmark
+    def predict_impl(
+        self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any
+    ) -> pd.DataFrame:
+        local_X = self.transform(X)
+
+        return self.predict_transformed(local_X, *args, **kwargs)
+
+    return predict_impl
+
+
+def _generate_predict_proba() -> Callable:
+    @decorators.benchmark
+    def predict_proba_impl(
+        self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any
+    ) -> pd.DataFrame:
+        local_X = self.transform(X)
+
+        return self.predict_proba_transformed(local_X)
+
     return predict_proba_impl
 
 
@@ -241,6 +310,16 @@ def _generate_setstate() -> Callable:
     return setstate_impl
 
 
+def _generate_reduce(restore: Callable) -> Callable:
+    # Pickle the stage fqdns instead of the generated class, which is rebuilt from the class cache on load.
+    def reduce_impl(self: Any) -> Tuple:
+        fqdns = tuple(plugin.fqdn() for plugin in self.plugin_types)
+
+        return (restore, (fqdns, self.__getstate__()))
+
+    return reduce_impl
+
+
 def _generate_getstate() -> Callable:
     def getstate_impl(self: Any) -> dict:
         return {"object": self.save()}
@@ -257,15 +336,21 @@ __all__ = [
     "_generate_constructor",
     "_generate_fit",
     "_generate_is_fitted",
+    "_generate_transform",
+    "_generate_prefix_fingerprint",
     "_generate_predict",
+    "_generate_predict_transformed",
     "_generate_predict_proba",
+    "_generate_predict_proba_transformed",
     "_generate_score",
     "_generate_get_args",
+    "_generate_clone",
     "_generate_load_template",
     "_generate_load",
     "_generate_save_template",
     "_generate_save",
     "_generate_setstate",
     "_generate_getstate",
+    "_generate_reduce",
     "_generate_change_output",
 ]
@@ -1,13 +1,15 @@
 # stdlib
 from abc import abstractmethod
-from typing import Any
+from typing import Any, Callable
 
 # third party
 import pandas as pd
+from sklearn.model_selection import train_test_split
 
 # autoprognosis absolute
 import autoprognosis.logger as log
 import autoprognosis.plugins.core.base_plugin as plugin
+import autoprognosis.utils.profiling as profiling
 
 
 class PredictionPlugin(plugin.Plugin):
@@ -49,10 +51,55 @@ class PredictionPlugin(plugin.Plugin):
 
         log.debug(f"Predicting using {self.fqdn()}, input shape = {X.shape}")
         X = self._preprocess_inference_data(X)
-        result = pd.DataFrame(self._predict_proba(X, *args, **kwargs))
+        with profiling.stage(f"{self.type()}.predict"):
+            result = pd.DataFrame(self._predict_proba(X, *args, **kwargs))
 
         return result
 
+    def _fit_early_stopping(
+        self,
+        fit_rounds: Callable,
+        X: pd.DataFrame,
+        y: Any,
+        stratify: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Fit the boosting rounds of the model, with early stopping on held-out validation data.
+
+        The boosting plugins take `early_stopping_rounds`, the number of rounds without improvement of the validation loss before the boosting stops, keeping the best iteration, which makes `n_estimators` a ceiling. 0 disables the early stopping. The validation data is the `eval_set` fit argument if any, otherwise a `validation_size` proportion of the training data. The best iteration is stored in `best_iteration`.
+
+        Args:
+            fit_rounds: Callable
+                `fit_rounds(X_train, y_train, eval_set, **kwargs)` fits the model and returns its best iteration. `eval_set` is (X_val, y_val), or None if the early stopping is disabled or no validation data is available: then all the rounds are fit.
+            X: pd.DataFrame
+                The training covariates.
+            y: array-like
+                The training labels.
+            stratify: bool
+                Stratify the validation split by the labels. If a class is too small for the split, no validation data is held out.
+            kwargs:
+                The fit arguments.
+        """
+        if self.early_stopping_rounds <= 0:
+            fit_rounds(X, y, None, **kwargs)
+            return
+
+        eval_set = kwargs.pop("eval_set", None)
+        if eval_set is None:
+            try:
+                X, X_val, y, y_val = train_test_split(
+                    X,
+                    y,
+                    test_size=self.validation_size,
+                    random_state=self.random_state,
+                    stratify=y if stratify else None,
+                )
+                eval_set = (X_val, y_val)
+            except ValueError:
+                pass
+
+        self.best_iteration = fit_rounds(X, y, eval_set, **kwargs)
+
     @abstractmethod
     def _predict_proba(
         self, X: pd.DataFrame, *args: Any, **kwargs: Any
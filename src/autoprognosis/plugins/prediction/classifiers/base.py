@@ -9,6 +9,7 @@ import autoprognosis.logger as log
 import autoprognosis.plugins.core.base_plugin as plugin
 import autoprognosis.plugins.prediction.base as prediction_base
 import autoprognosis.plugins.utils.cast as cast
+import autoprognosis.utils.profiling as profiling
 from autoprognosis.utils.tester import classifier_metrics
 
 
@@ -41,7 +42,8 @@ class ClassifierPlugin(prediction_base.PredictionPlugin):
             raise RuntimeError("Training requires X, y")
         Y = cast.to_dataframe(args[0]).values.ravel()
 
-        self._fit(X, Y, **kwargs)
+        with profiling.stage(f"{self.type()}.fit"):
+            self._fit(X, Y, **kwargs)
 
         self._fitted = True
         log.debug(f"Done training using {self.fqdn()}, input shape = {X.shape}")
@@ -7,6 +7,7 @@ import pandas as pd
 # autoprognosis absolute
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.classifiers.base as base
+from autoprognosis.utils.parallel import n_learner_jobs
 from autoprognosis.utils.pip import install
 import autoprognosis.utils.serialization as serialization
 
@@ -44,6 +45,10 @@ class CatBoostPlugin(base.ClassifierPlugin):
             The amount of randomness to use for scoring splits when the tree structure is selected. Use this parameter to avoid overfitting the model.
         random_state: int, default 0
             Random seed
+        early_stopping_rounds: int
+            Rounds without improvement of the validation loss before the boosting stops, see `PredictionPlugin._fit_early_stopping`. 0 disables the early stopping.
+        validation_size: float
+            Proportion of the training data held out for the early stopping.
 
     Example:
         >>> from autoprognosis.plugins.prediction import Predictions
@@ -67,9 +72,16 @@ class CatBoostPlugin(base.ClassifierPlugin):
         random_state: int = 0,
         model: Any = None,
         hyperparam_search_iterations: Optional[int] = None,
+        early_stopping_rounds: int = 10,
+        validation_size: float = 0.2,
         **kwargs: Any
     ) -> None:
         super().__init__(**kwargs)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_size = validation_size
+        self.random_state = random_state
+        self.best_iteration: Optional[int] = None
+
         if model is not None:
             self.model = model
             return
@@ -82,6 +94,7 @@ class CatBoostPlugin(base.ClassifierPlugin):
             logging_level="Silent",
             allow_writing_files=False,
             used_ram_limit="10gb",
+            thread_count=n_learner_jobs(),
             n_estimators=n_estimators,
             random_state=random_state,
             grow_policy=CatBoostPlugin.grow_policies[grow_policy],
@@ -96,11 +109,16 @@ class CatBoostPlugin(base.ClassifierPlugin):
     def name() -> str:
         return "catboost"
 
+    @staticmethod
+    def memory_footprint(n_rows: int, n_features: int) -> int:
+        # Capped by used_ram_limit.
+        return min(8 * n_rows * n_features * 8 + 2**30, 10 * 2**30)
+
     @staticmethod
     def hyperparameter_space(*args: Any, **kwargs: Any) -> List[params.Params]:
         return [
             params.Integer("depth", 1, 7),
-            params.Integer("n_estimators", 10, 10000),
+            params.Categorical("n_estimators", [10000]),
             params.Float("learning_rate", 1e-2, 4e-2),
             params.Integer("grow_policy", 0, len(CatBoostPlugin.grow_policies) - 1),
             params.Float("l2_leaf_reg", 1e-4, 1e3),
@@ -108,8 +126,26 @@ class CatBoostPlugin(base.ClassifierPlugin):
             params.Integer("min_data_in_leaf", 1, 300),
         ]
 
+    def _fit_rounds(
+        self, X: pd.DataFrame, y: Any, eval_set: Optional[tuple], **kwargs: Any
+    ) -> Optional[int]:
+        if eval_set is None:
+            self.model.fit(X, y, **kwargs)
+            return None
+
+        self.model.fit(
+            X,
+            y,
+            eval_set=eval_set,
+            early_stopping_rounds=self.early_stopping_rounds,
+            use_best_model=True,
+            **kwargs,
+        )
+        return self.model.get_best_iteration()
+
     def _fit(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> "CatBoostPlugin":
-        self.model.fit(X, *args, **kwargs)
+        self._fit_early_stopping(self._fit_rounds, X, args[0], stratify=True, **kwargs)
+
         return self
 
     def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
@@ -2,10 +2,16 @@
 from typing import Any, List
 
 # third party
+import numpy as np
 import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.gaussian_process import GaussianProcessClassifier
+from sklearn.gaussian_process.kernels import RBF, ConstantKernel
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import LogisticRegression
 
 # autoprognosis absolute
+import autoprognosis.logger as log
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.classifiers.base as base
 from autoprognosis.plugins.prediction.classifiers.helper_calibration import (
@@ -14,16 +20,93 @@ from autoprognosis.plugins.prediction.classifiers.helper_calibration import (
 from autoprognosis.utils.parallel import n_learner_jobs
 import autoprognosis.utils.serialization as serialization
 
+MAX_EXACT_ROWS = 5000
+N_INDUCING = 500
+
+
+class NystroemGaussianProcessClassifier(ClassifierMixin, BaseEstimator):
+    """Approximate Gaussian process classifier, linear in the number of rows.
+
+    The amplitude and the length scale of an RBF kernel are fitted by an exact GaussianProcessClassifier on `n_inducing` rows, sampled by class. With the Nyström approximation of that kernel on the same rows, the GP is a Bayesian linear model on `n_inducing` features, with a standard normal prior on the weights. Its MAP estimate is a logistic regression on these features, with C = 1. With more than two classes, the kernel of the first one-vs-rest GP is shared by all the classes.
+
+    Args:
+        n_inducing: int
+            Number of inducing rows.
+        random_state: int
+            Random seed
+        n_jobs: int
+            Number of jobs of the exact GP, for the one-vs-rest classes.
+    """
+
+    def __init__(
+        self, n_inducing: int = 500, random_state: int = 0, n_jobs: int = 1
+    ) -> None:
+        self.n_inducing = n_inducing
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+
+    def _inducing_rows(self, y: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng(self.random_state)
+        classes, counts = np.unique(y, return_counts=True)
+
+        # Every class is represented, in proportion to its frequency.
+        quotas = np.maximum(1, np.round(self.n_inducing * counts / len(y)).astype(int))
+        rows = [
+            rng.choice(np.flatnonzero(y == cls), size=min(quota, count), replace=False)
+            for cls, quota, count in zip(classes, quotas, counts)
+        ]
+
+        return np.sort(np.concatenate(rows))
+
+    def fit(self, X: Any, y: Any) -> "NystroemGaussianProcessClassifier":
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y).ravel()
+
+        inducing = self._inducing_rows(y)
+        # The default kernel of GaussianProcessClassifier has fixed bounds.
+        kernel = ConstantKernel(1.0, (1e-3, 1e3)) * RBF(1.0, (1e-2, 1e2))
+        gp = GaussianProcessClassifier(
+            kernel=kernel, random_state=self.random_state, n_jobs=self.n_jobs
+        ).fit(X[inducing], y[inducing])
+        if len(gp.classes_) > 2:
+            kernel = gp.base_estimator_.estimators_[0].kernel_
+        else:
+            kernel = gp.base_estimator_.kernel_
+
+        self.features_ = Nystroem(
+            kernel=kernel, n_components=len(inducing), random_state=self.random_state
+        ).fit(X[inducing])
+        self.classifier_ = LogisticRegression(C=1.0, max_iter=1000).fit(
+            self.features_.transform(X), y
+        )
+        self.classes_ = self.classifier_.classes_
+
+        return self
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classifier_.predict(
+            self.features_.transform(np.asarray(X, dtype=float))
+        )
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self.classifier_.predict_proba(
+            self.features_.transform(np.asarray(X, dtype=float))
+        )
+
 
 class GaussianProcessPlugin(base.ClassifierPlugin):
     """Classification plugin based on Gaussian processes.
 
     Method:
-        The plugin uses GaussianProcessClassifier, which implements Gaussian processes for classification purposes, more specifically for probabilistic classification, where test predictions take the form of class probabilities.
+        The plugin uses GaussianProcessClassifier, which implements Gaussian processes for classification purposes, more specifically for probabilistic classification, where test predictions take the form of class probabilities. The exact GP is cubic in the number of rows: above `max_exact_rows`, the plugin uses a Nyström approximation of the GP instead(see `NystroemGaussianProcessClassifier`).
 
     Args:
         calibration: int
             Enable/disable calibration. 0: disabled, 1 : sigmoid, 2: isotonic.
+        max_exact_rows: int
+            Maximum number of training rows for the exact GP.
+        n_inducing: int
+            Number of inducing rows of the approximate GP.
         random_state: int, default 0
             Random seed
 
@@ -34,8 +117,21 @@ class GaussianProcessPlugin(base.ClassifierPlugin):
         >>> plugin.fit_predict(...)
     """
 
-    def __init__(self, calibration: int = 0, model: Any = None, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        calibration: int = 0,
+        max_exact_rows: int = MAX_EXACT_ROWS,
+        n_inducing: int = N_INDUCING,
+        random_state: int = 0,
+        model: Any = None,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(**kwargs)
+        self.calibration = calibration
+        self.max_exact_rows = max_exact_rows
+        self.n_inducing = n_inducing
+        self.random_state = random_state
+
         if model is not None:
             self.model = model
             return
@@ -47,6 +143,20 @@ class GaussianProcessPlugin(base.ClassifierPlugin):
     def name() -> str:
         return "gaussian_process"
 
+    def memory_footprint(*args: Any) -> int:
+        # Called on the class with the default settings, e.g. by the search, or on
+        # a plugin with its own.
+        plugin = args[0] if len(args) > 2 else None
+        n_rows, n_features = args[-2:]
+        max_exact_rows = getattr(plugin, "max_exact_rows", MAX_EXACT_ROWS)
+        n_inducing = getattr(plugin, "n_inducing", N_INDUCING)
+
+        # The kernel matrices of the exact GP, or the features of the approximate one.
+        if n_rows <= max_exact_rows:
+            return 4 * n_rows**2 * 8 + 4 * n_rows * n_features * 8
+
+        return 4 * n_inducing**2 * 8 + 4 * n_rows * (n_features + n_inducing) * 8
+
     @staticmethod
     def hyperparameter_space(*args: Any, **kwargs: Any) -> List[params.Params]:
         return []
@@ -54,7 +164,18 @@ class GaussianProcessPlugin(base.ClassifierPlugin):
     def _fit(
         self, X: pd.DataFrame, *args: Any, **kwargs: Any
     ) -> "GaussianProcessPlugin":
-        self.model.fit(X, *args, **kwargs)
+        # The model is built for each fit, from the size of its data.
+        if len(X) > self.max_exact_rows:
+            log.debug(f"[gaussian_process] approximate GP for {len(X)} rows")
+            model = NystroemGaussianProcessClassifier(
+                n_inducing=self.n_inducing,
+                random_state=self.random_state,
+                n_jobs=n_learner_jobs(),
+            )
+        else:
+            model = GaussianProcessClassifier(n_jobs=n_learner_jobs())
+
+        self.model = calibrated_model(model, self.calibration).fit(X, *args, **kwargs)
         return self
 
     def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
@@ -11,6 +11,7 @@ import autoprognosis.plugins.prediction.classifiers.base as base
 from autoprognosis.plugins.prediction.classifiers.helper_calibration import (
     calibrated_model,
 )
+from autoprognosis.utils.neighbors import ApproximateKNeighborsClassifier
 import autoprognosis.utils.serialization as serialization
 
 
@@ -18,7 +19,7 @@ class KNNPlugin(base.ClassifierPlugin):
     """Classification plugin based on the k-nearest neighbors vote.
 
     Method:
-        Neighbors-based classification is a type of instance-based learning or non-generalizing learning: it does not attempt to construct a general internal model, but simply stores instances of the training data. Classification is computed from a simple majority vote of the nearest neighbors of each point: a query point is assigned the data class which has the most representatives within the nearest neighbors of the point.
+        Neighbors-based classification is a type of instance-based learning or non-generalizing learning: it does not attempt to construct a general internal model, but simply stores instances of the training data. Classification is computed from a simple majority vote of the nearest neighbors of each point: a query point is assigned the data class which has the most representatives within the nearest neighbors of the point. On large datasets, the neighbors can be searched in an approximate index(see `autoprognosis.utils.neighbors.RandomProjectionIndex`).
 
     Args:
         n_neighbors: int
@@ -28,9 +29,13 @@ class KNNPlugin(base.ClassifierPlugin):
         algorithm: str
             Algorithm used to compute the nearest neighbors: "ball_tree", "kd_tree", "brute" or "auto".
         leaf_size: int
-            Leaf size passed to BallTree or KDTree.
+            Leaf size passed to BallTree or KDTree, or to the trees of the approximate index.
         p: int
             Power parameter for the Minkowski metric.
+        approximate: bool
+            Search the neighbors in an approximate index instead. `algorithm` is then ignored.
+        n_trees: int
+            Number of trees of the approximate index. More trees give a better recall, and slower queries.
         calibration: int
             Enable/disable calibration. 0: disabled, 1 : sigmoid, 2: isotonic.
         random_state: int, default 0
@@ -55,6 +60,8 @@ class KNNPlugin(base.ClassifierPlugin):
         algorithm: int = 0,
         leaf_size: int = 30,
         p: int = 2,
+        approximate: bool = False,
+        n_trees: int = 10,
         calibration: int = 0,
         model: Any = None,
         random_state: int = 0,
@@ -65,19 +72,34 @@ class KNNPlugin(base.ClassifierPlugin):
             self.model = model
             return
 
-        model = KNeighborsClassifier(
-            n_neighbors=n_neighbors,
-            weights=KNNPlugin.weights[weights],
-            algorithm=KNNPlugin.algorithms[algorithm],
-            leaf_size=leaf_size,
-            p=p,
-        )
+        if approximate:
+            model = ApproximateKNeighborsClassifier(
+                n_neighbors=n_neighbors,
+                weights=KNNPlugin.weights[weights],
+                p=p,
+                n_trees=n_trees,
+                leaf_size=leaf_size,
+                random_state=random_state,
+            )
+        else:
+            model = KNeighborsClassifier(
+                n_neighbors=n_neighbors,
+                weights=KNNPlugin.weights[weights],
+                algorithm=KNNPlugin.algorithms[algorithm],
+                leaf_size=leaf_size,
+                p=p,
+            )
         self.model = calibrated_model(model, calibration)
 
     @staticmethod
     def name() -> str:
         return "knn"
 
+    @staticmethod
+    def memory_footprint(n_rows: int, n_features: int) -> int:
+        # The distances are computed in chunks of sklearn's working memory, 1GB.
+        return 4 * n_rows * n_features * 8 + 2**30
+
     @staticmethod
     def hyperparameter_space(*args: Any, **kwargs: Any) -> List[params.Params]:
         return [
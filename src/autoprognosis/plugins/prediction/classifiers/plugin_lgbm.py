@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, List
+from typing import Any, List, Optional
 
 # third party
 import pandas as pd
@@ -10,6 +10,7 @@ import autoprognosis.plugins.prediction.classifiers.base as base
 from autoprognosis.plugins.prediction.classifiers.helper_calibration import (
     calibrated_model,
 )
+from autoprognosis.utils.parallel import n_learner_jobs
 from autoprognosis.utils.pip import install
 import autoprognosis.utils.serialization as serialization
 
@@ -57,6 +58,10 @@ class LightGBMPlugin(base.ClassifierPlugin):
             Enable/disable calibration. 0: disabled, 1 : sigmoid, 2: isotonic.
         random_state: int, default 0
             Random seed
+        early_stopping_rounds: int
+            Rounds without improvement of the validation loss before the boosting stops, see `PredictionPlugin._fit_early_stopping`. 0 disables the early stopping. Not used with calibration, nor by the "dart" boosting.
+        validation_size: float
+            Proportion of the training data held out for the early stopping.
 
 
     Example:
@@ -82,9 +87,16 @@ class LightGBMPlugin(base.ClassifierPlugin):
         calibration: int = 0,
         model: Any = None,
         random_state: int = 0,
+        early_stopping_rounds: int = 10,
+        validation_size: float = 0.2,
         **kwargs: Any
     ) -> None:
         super().__init__(**kwargs)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_size = validation_size
+        self.random_state = random_state
+        self.best_iteration: Optional[int] = None
+
         if model is not None:
             self.model = model
             return
@@ -98,7 +110,6 @@ class LightGBMPlugin(base.ClassifierPlugin):
         self.subsample = subsample
         self.num_leaves = num_leaves
         self.min_child_samples = min_child_samples
-        self.random_state = random_state
         self.boosting_type = boosting_type
 
         model = lgbm.LGBMClassifier(
@@ -113,6 +124,7 @@ class LightGBMPlugin(base.ClassifierPlugin):
             min_child_samples=self.min_child_samples,
             random_state=self.random_state,
             boosting_type=self.boosting_type,
+            n_jobs=n_learner_jobs(),
         )
         self.model = calibrated_model(model, calibration)
 
@@ -123,10 +135,10 @@ class LightGBMPlugin(base.ClassifierPlugin):
     @staticmethod
     def hyperparameter_space(*args: Any, **kwargs: Any) -> List[params.Params]:
         return [
-            params.Categorical("boosting_type", ["gbdt", "dart", "goss"]),
+            params.Categorical("boosting_type", ["gbdt", "goss"]),
             params.Integer("num_leaves", 10, 256),
             params.Float("learning_rate", 0.01, 0.3),
-            params.Integer("n_estimators", 10, 3000),
+            params.Categorical("n_estimators", [3000]),
             params.Integer("max_depth", 1, 7),
             params.Integer("min_child_samples", 1, 500),
             params.Float("subsample", 0.1, 1.0),
@@ -135,8 +147,32 @@ class LightGBMPlugin(base.ClassifierPlugin):
             params.Float("reg_alpha", 1e-3, 1),
         ]
 
+    def _fit_rounds(
+        self, X: pd.DataFrame, y: Any, eval_set: Optional[tuple], **kwargs: Any
+    ) -> Optional[int]:
+        if eval_set is None:
+            self.model.fit(X, y, **kwargs)
+            return None
+
+        self.model.fit(
+            X,
+            y,
+            eval_set=[eval_set],
+            callbacks=[lgbm.early_stopping(self.early_stopping_rounds, verbose=False)],
+            **kwargs,
+        )
+        return self.model.best_iteration_
+
     def _fit(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> "LightGBMPlugin":
-        self.model.fit(X, *args, **kwargs)
+        if (
+            not isinstance(self.model, lgbm.LGBMClassifier)
+            or self.model.boosting_type == "dart"
+        ):
+            self.model.fit(X, *args, **kwargs)
+            return self
+
+        self._fit_early_stopping(self._fit_rounds, X, args[0], stratify=True, **kwargs)
+
         return self
 
     def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
@@ -64,7 +64,7 @@ class LogisticRegressionPlugin(base.ClassifierPlugin):
         model: Any = None,
         hyperparam_search_iterations: Optional[int] = None,
         random_state: int = 0,
-        n_jobs: int = n_learner_jobs(),
+        n_jobs: Optional[int] = None,
         **kwargs: Any
     ) -> None:
         super().__init__(**kwargs)
@@ -83,7 +83,7 @@ class LogisticRegressionPlugin(base.ClassifierPlugin):
             penalty=penalty,
             max_iter=max_iter,
             random_state=random_state,
-            n_jobs=n_jobs,
+            n_jobs=n_jobs if n_jobs is not None else n_learner_jobs(),
         )
         self.model = calibrated_model(model, calibration)
 
@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, List, Optional
+from typing import Any, Iterable, List, Optional, Union
 
 # third party
 import numpy as np
@@ -9,6 +9,7 @@ import pandas as pd
 import autoprognosis.logger as log
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.classifiers.base as base
+from autoprognosis.utils.data_source import DataSource
 from autoprognosis.utils.distributions import enable_reproducible_results
 from autoprognosis.utils.pip import install
 from autoprognosis.utils.serialization import load_model, save_model
@@ -18,13 +19,19 @@ for retry in range(2):
         # third party
         import torch
         from torch import nn
-        from torch.utils.data import DataLoader, TensorDataset
 
         break
     except ImportError:
         depends = ["torch"]
         install(depends)
 
+# autoprognosis absolute
+from autoprognosis.utils.torch import (  # noqa: E402
+    PREDICT_BATCH_SIZE,
+    DataSourceLoader,
+    TensorBatchLoader,
+    num_threads,
+)
 
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
@@ -155,19 +162,44 @@ class BasicNet(nn.Module):
     def forward(self, X: torch.Tensor) -> torch.Tensor:
         return self.model(X)
 
-    def train(self, X: torch.Tensor, y: torch.Tensor) -> "BasicNet":
-        X = self._check_tensor(X).float()
+    def train(
+        self, X: Union[torch.Tensor, DataSource], y: torch.Tensor
+    ) -> "BasicNet":
         y = self._check_tensor(y).squeeze().long()
 
-        dataset = TensorDataset(X, y)
-
-        train_size = int(0.8 * len(dataset))
-        test_size = len(dataset) - train_size
-        train_dataset, test_dataset = torch.utils.data.random_split(
-            dataset, [train_size, test_size]
-        )
+        # The validation runs on the held-out rows only.
+        train_size = int(0.8 * len(X))
+
+        if isinstance(X, DataSource):
+            # The rows are read by batch, the split is on their positions.
+            labels = y.cpu().numpy()
+            positions = np.random.permutation(len(X))
+            train_idx, val_idx = positions[:train_size], positions[train_size:]
+            train_labels, val_labels = labels[train_idx], labels[val_idx]
+
+            loader: Union[DataSourceLoader, TensorBatchLoader] = DataSourceLoader(
+                X.subset(train_idx),
+                lambda indices: torch.from_numpy(train_labels[indices]),
+                self.batch_size,
+                shuffle=True,
+                random_state=int(np.random.randint(0, 2**31)),
+            )
+            val_batches: Union[DataSourceLoader, TensorBatchLoader] = DataSourceLoader(
+                X.subset(val_idx),
+                lambda indices: torch.from_numpy(val_labels[indices]),
+                PREDICT_BATCH_SIZE,
+            )
+        else:
+            # Moved to the device once, the batches are gathered from it.
+            X = self._check_tensor(X).float()
 
-        loader = DataLoader(train_dataset, batch_size=self.batch_size, pin_memory=False)
+            positions = torch.randperm(len(X), device=X.device)
+            loader = TensorBatchLoader(
+                X, y, positions[:train_size], self.batch_size, shuffle=True
+            )
+            val_batches = TensorBatchLoader(
+                X, y, positions[train_size:], PREDICT_BATCH_SIZE
+            )
 
         # do training
         val_loss_best = 999999
@@ -175,13 +207,17 @@ class BasicNet(nn.Module):
 
         loss = nn.CrossEntropyLoss()
 
+        train_loss = torch.zeros(len(loader), device=DEVICE)
+
         for i in range(self.n_iter):
-            train_loss = []
+            train_loss.zero_()
 
             for batch_ndx, sample in enumerate(loader):
                 self.optimizer.zero_grad()
 
                 X_next, y_next = sample
+                X_next = X_next.to(DEVICE)
+                y_next = y_next.to(DEVICE)
 
                 preds = self.forward(X_next).squeeze()
 
@@ -193,34 +229,46 @@ class BasicNet(nn.Module):
 
                 self.optimizer.step()
 
-                train_loss.append(batch_loss.detach())
-
-            train_loss = torch.Tensor(train_loss).to(DEVICE)
+                train_loss[batch_ndx] = batch_loss.detach()
 
             if self.early_stopping or i % self.n_iter_print == 0:
-                with torch.no_grad():
-                    X_val, y_val = test_dataset.dataset.tensors
+                val_loss = self._validation_loss(val_batches, loss)
 
-                    preds = self.forward(X_val).squeeze()
-                    val_loss = loss(preds, y_val)
+                if self.early_stopping:
+                    if val_loss_best > val_loss:
+                        val_loss_best = val_loss
+                        patience = 0
+                    else:
+                        patience += 1
 
-                    if self.early_stopping:
-                        if val_loss_best > val_loss:
-                            val_loss_best = val_loss
-                            patience = 0
-                        else:
-                            patience += 1
+                    if patience > self.patience and i > self.n_iter_min:
+                        break
 
-                        if patience > self.patience and i > self.n_iter_min:
-                            break
-
-                    if i % self.n_iter_print == 0:
-                        log.trace(
-                            f"Epoch: {i}, loss: {val_loss}, train_loss: {torch.mean(train_loss)}"
-                        )
+                if i % self.n_iter_print == 0:
+                    log.trace(
+                        f"Epoch: {i}, loss: {val_loss}, train_loss: {torch.mean(train_loss)}"
+                    )
 
         return self
 
+    def _validation_loss(self, batches: Iterable, loss: nn.Module) -> float:
+        # Without dropout, and with the running statistics of the batch norms.
+        self.model.eval()
+
+        total = torch.tensor(0.0, device=DEVICE)
+        count = 0
+        with torch.inference_mode():
+            for X_val, y_val in batches:
+                X_val = X_val.to(DEVICE)
+                y_val = y_val.to(DEVICE)
+
+                total += loss(self.forward(X_val), y_val) * len(y_val)
+                count += len(y_val)
+
+        self.model.train()
+
+        return total.item() / max(count, 1)
+
     def _check_tensor(self, X: torch.Tensor) -> torch.Tensor:
         if isinstance(X, torch.Tensor):
             return X.to(DEVICE)
@@ -229,7 +277,7 @@ class BasicNet(nn.Module):
 
 
 class NeuralNetsPlugin(base.ClassifierPlugin):
-    """Classification plugin based on Neural networks.
+    """Classification plugin based on Neural networks. The covariates can be a `DataSource`, read in mini-batches.
 
     Parameters
     ----------
@@ -257,6 +305,8 @@ class NeuralNetsPlugin(base.ClassifierPlugin):
         Minimum number of iterations to go through before starting early stopping
     clipping_value: int, default 1
         Gradients clipping value
+    n_threads: Optional int
+        Number of torch intra-op threads used for training, unless the fit runs within a thread budget. The inference uses the process setting, as it can run on concurrent threads. Defaults to the torch setting.
     random_state: int, default 0
         Random seed
 
@@ -285,6 +335,7 @@ class NeuralNetsPlugin(base.ClassifierPlugin):
         clipping_value: int = 1,
         batch_norm: bool = True,
         early_stopping: bool = True,
+        n_threads: Optional[int] = None,
         hyperparam_search_iterations: Optional[int] = None,
         random_state: int = 0,
         **kwargs: Any,
@@ -310,11 +361,16 @@ class NeuralNetsPlugin(base.ClassifierPlugin):
         self.clipping_value = clipping_value
         self.batch_norm = batch_norm
         self.early_stopping = early_stopping
+        self.n_threads = n_threads
 
     @staticmethod
     def name() -> str:
         return "neural_nets"
 
+    @staticmethod
+    def supports_data_source() -> bool:
+        return True
+
     @staticmethod
     def hyperparameter_space(*args: Any, **kwargs: Any) -> List[params.Params]:
         return [
@@ -332,7 +388,8 @@ class NeuralNetsPlugin(base.ClassifierPlugin):
 
         y = args[0]
 
-        X = torch.from_numpy(np.asarray(X))
+        if not isinstance(X, DataSource):
+            X = torch.from_numpy(np.asarray(X))
         y = torch.from_numpy(np.asarray(y))
 
         self.model = BasicNet(
@@ -354,20 +411,33 @@ class NeuralNetsPlugin(base.ClassifierPlugin):
             early_stopping=self.early_stopping,
         )
 
-        self.model.train(X, y)
+        with num_threads(self.n_threads):
+            self.model.train(X, y)
         return self
 
-    def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
+    def _forward(self, X: Union[pd.DataFrame, DataSource]) -> np.ndarray:
         with torch.no_grad():
+            if isinstance(X, DataSource):
+                return np.concatenate(
+                    [
+                        self.model(torch.from_numpy(X.take(indices)).to(DEVICE))
+                        .detach()
+                        .cpu()
+                        .numpy()
+                        for indices in X.batches(PREDICT_BATCH_SIZE)
+                    ]
+                )
+
             X = torch.from_numpy(np.asarray(X)).float().to(DEVICE)
-            return self.model(X).argmax(dim=-1).detach().cpu().numpy()
+            return self.model(X).detach().cpu().numpy()
+
+    def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
+        return self._forward(X).argmax(axis=-1)
 
     def _predict_proba(
         self, X: pd.DataFrame, *args: Any, **kwargs: Any
     ) -> pd.DataFrame:
-        with torch.no_grad():
-            X = torch.from_numpy(np.asarray(X)).float().to(DEVICE)
-            return self.model(X).detach().cpu().numpy()
+        return self._forward(X)
 
     def save(self) -> bytes:
         return save_model(self)
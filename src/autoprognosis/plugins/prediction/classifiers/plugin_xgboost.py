@@ -65,6 +65,10 @@ class XGBoostPlugin(base.ClassifierPlugin):
             Random number seed.
         calibration: int
             Enable/disable calibration. 0: disabled, 1 : sigmoid, 2: isotonic.
+        early_stopping_rounds: int
+            Rounds without improvement of the validation loss before the boosting stops, see `PredictionPlugin._fit_early_stopping`. 0 disables the early stopping. Not used with calibration.
+        validation_size: float
+            Proportion of the training data held out for the early stopping.
 
     Example:
         >>> from autoprognosis.plugins.prediction import Predictions
@@ -96,11 +100,18 @@ class XGBoostPlugin(base.ClassifierPlugin):
         calibration: int = 0,
         gamma: float = 0,
         model: Any = None,
-        nthread: int = n_learner_jobs(),
+        nthread: Optional[int] = None,
         hyperparam_search_iterations: Optional[int] = None,
+        early_stopping_rounds: int = 10,
+        validation_size: float = 0.2,
         **kwargs: Any
     ) -> None:
         super().__init__(**kwargs)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_size = validation_size
+        self.random_state = random_state
+        self.best_iteration: Optional[int] = None
+
         if model is not None:
             self.model = model
             return
@@ -124,7 +135,7 @@ class XGBoostPlugin(base.ClassifierPlugin):
             booster=XGBoostPlugin.booster[booster],
             grow_policy=XGBoostPlugin.grow_policy[grow_policy],
             random_state=random_state,
-            nthread=nthread,
+            nthread=nthread if nthread is not None else n_learner_jobs(),
             gamma=gamma,
             **kwargs,
         )
@@ -139,7 +150,7 @@ class XGBoostPlugin(base.ClassifierPlugin):
         return [
             params.Integer("max_depth", 1, 7),
             params.Float("learning_rate", 1e-3, 0.3),
-            params.Integer("n_estimators", 10, 10000),
+            params.Categorical("n_estimators", [10000]),
             params.Float("colsample_bytree", 0.1, 0.5),
             params.Float("gamma", 0, 1),
             params.Float("subsample", 0.5, 1),
@@ -152,16 +163,52 @@ class XGBoostPlugin(base.ClassifierPlugin):
             params.Integer("grow_policy", 0, len(XGBoostPlugin.grow_policy) - 1),
         ]
 
+    def _fit_rounds(
+        self, X: pd.DataFrame, y: Any, eval_set: Optional[tuple], **kwargs: Any
+    ) -> Optional[int]:
+        sample_weight = class_weight.compute_sample_weight(
+            class_weight="balanced", y=y
+        )
+        if eval_set is None:
+            self.model.set_params(early_stopping_rounds=None)
+            self.model.fit(X, y, sample_weight=sample_weight, **kwargs)
+            return None
+
+        self.model.set_params(early_stopping_rounds=self.early_stopping_rounds)
+        self.model.fit(
+            X,
+            y,
+            sample_weight=sample_weight,
+            eval_set=[eval_set],
+            sample_weight_eval_set=[
+                class_weight.compute_sample_weight(
+                    class_weight="balanced", y=eval_set[1]
+                )
+            ],
+            verbose=False,
+            **kwargs,
+        )
+        return self.model.best_iteration
+
     def _fit(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> "XGBoostPlugin":
         y = np.asarray(args[0])
 
         self.encoder = LabelEncoder()
         y = self.encoder.fit_transform(y)
 
-        classes_weights = class_weight.compute_sample_weight(
-            class_weight="balanced", y=y
-        )
-        self.model.fit(X, y, sample_weight=classes_weights, **kwargs)
+        if not isinstance(self.model, XGBClassifier):
+            classes_weights = class_weight.compute_sample_weight(
+                class_weight="balanced", y=y
+            )
+            self.model.fit(X, y, sample_weight=classes_weights, **kwargs)
+            return self
+
+        if kwargs.get("eval_set") is not None:
+            X_val, y_val = kwargs["eval_set"]
+            kwargs["eval_set"] = (X_val, self.encoder.transform(np.asarray(y_val)))
+
+        self._fit_early_stopping(self._fit_rounds, X, y, stratify=True, **kwargs)
+
         return self
 
     def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
@@ -8,6 +8,7 @@ import pandas as pd
 import autoprognosis.logger as log
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.base as prediction_base
+import autoprognosis.utils.profiling as profiling
 
 
 class RegressionPlugin(prediction_base.PredictionPlugin):
@@ -44,7 +45,8 @@ class RegressionPlugin(prediction_base.PredictionPlugin):
 
         log.debug(f"Training using {self.fqdn()}, input shape = {X.shape}")
         X = self._preprocess_training_data(X)
-        self._fit(X, *args, **kwargs)
+        with profiling.stage(f"{self.type()}.fit"):
+            self._fit(X, *args, **kwargs)
         self._fitted = True
         log.debug(f"Done using {self.fqdn()}, input shape = {X.shape}")
 
@@ -8,6 +8,7 @@ from sklearn.neighbors import KNeighborsRegressor
 # autoprognosis absolute
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.regression.base as base
+from autoprognosis.utils.neighbors import ApproximateKNeighborsRegressor
 from autoprognosis.utils.parallel import n_learner_jobs
 import autoprognosis.utils.serialization as serialization
 
@@ -23,9 +24,13 @@ class KNeighborsRegressorPlugin(base.RegressionPlugin):
         algorithm: int index
             Algorithm used to compute the nearest neighbors: "ball_tree", "kd_tree", "brute" or "auto".
         leaf_size: int
-            Leaf size passed to BallTree or KDTree.
+            Leaf size passed to BallTree or KDTree, or to the trees of the approximate index.
         p: int
             Power parameter for the Minkowski metric.
+        approximate: bool
+            Search the neighbors in an approximate index instead(see `autoprognosis.utils.neighbors.RandomProjectionIndex`). `algorithm` is then ignored.
+        n_trees: int
+            Number of trees of the approximate index. More trees give a better recall, and slower queries.
         random_state: int, default 0
             Random seed
 
@@ -47,6 +52,8 @@ class KNeighborsRegressorPlugin(base.RegressionPlugin):
         algorithm: int = 0,
         leaf_size: int = 30,
         p: int = 2,
+        approximate: bool = False,
+        n_trees: int = 10,
         random_state: int = 0,
         hyperparam_search_iterations: Optional[int] = None,
         model: Any = None,
@@ -57,6 +64,17 @@ class KNeighborsRegressorPlugin(base.RegressionPlugin):
             self.model = model
             return
 
+        if approximate:
+            self.model = ApproximateKNeighborsRegressor(
+                n_neighbors=n_neighbors,
+                weights=KNeighborsRegressorPlugin.weights[weights],
+                p=p,
+                n_trees=n_trees,
+                leaf_size=leaf_size,
+                random_state=random_state,
+            )
+            return
+
         self.model = KNeighborsRegressor(
             n_neighbors=n_neighbors,
             algorithm=KNeighborsRegressorPlugin.algorithm[algorithm],
@@ -70,6 +88,11 @@ class KNeighborsRegressorPlugin(base.RegressionPlugin):
     def name() -> str:
         return "kneighbors_regressor"
 
+    @staticmethod
+    def memory_footprint(n_rows: int, n_features: int) -> int:
+        # The distances are computed in chunks of sklearn's working memory, 1GB.
+        return 4 * n_rows * n_features * 8 + 2**30
+
     @staticmethod
     def hyperparameter_space(*args: Any, **kwargs: Any) -> List[params.Params]:
         return [
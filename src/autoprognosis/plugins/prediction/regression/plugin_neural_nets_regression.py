@@ -18,13 +18,18 @@ for retry in range(2):
         # third party
         import torch
         from torch import nn
-        from torch.utils.data import DataLoader, TensorDataset
 
         break
     except ImportError:
         depends = ["torch"]
         install(depends)
 
+# autoprognosis absolute
+from autoprognosis.utils.torch import (  # noqa: E402
+    PREDICT_BATCH_SIZE,
+    TensorBatchLoader,
+    num_threads,
+)
 
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
@@ -151,18 +156,20 @@ class BasicNet(nn.Module):
         return self.model(X)
 
     def train(self, X: torch.Tensor, y: torch.Tensor) -> "BasicNet":
+        # Moved to the device once, the batches are gathered from it.
         X = self._check_tensor(X).float()
         y = self._check_tensor(y).squeeze().float()
 
-        dataset = TensorDataset(X, y)
+        # The validation runs on the held-out rows only.
+        train_size = int(0.8 * len(X))
+        positions = torch.randperm(len(X), device=X.device)
 
-        train_size = int(0.8 * len(dataset))
-        test_size = len(dataset) - train_size
-        train_dataset, test_dataset = torch.utils.data.random_split(
-            dataset, [train_size, test_size]
+        loader = TensorBatchLoader(
+            X, y, positions[:train_size], self.batch_size, shuffle=True
+        )
+        val_batches = TensorBatchLoader(
+            X, y, positions[train_size:], PREDICT_BATCH_SIZE
         )
-
-        loader = DataLoader(train_dataset, batch_size=self.batch_size, pin_memory=False)
 
         # do training
         val_loss_best = 999999
@@ -170,8 +177,10 @@ class BasicNet(nn.Module):
 
         loss = nn.MSELoss()
 
+        train_loss = torch.zeros(len(loader), device=DEVICE)
+
         for i in range(self.n_iter):
-            train_loss = []
+            train_loss.zero_()
 
             for batch_ndx, sample in enumerate(loader):
                 self.optimizer.zero_grad()
@@ -188,34 +197,45 @@ class BasicNet(nn.Module):
 
                 self.optimizer.step()
 
-                train_loss.append(batch_loss.detach())
-
-            train_loss = torch.Tensor(train_loss).to(DEVICE)
+                train_loss[batch_ndx] = batch_loss.detach()
 
             if self.early_stopping or i % self.n_iter_print == 0:
-                with torch.no_grad():
-                    X_val, y_val = test_dataset.dataset.tensors
-
-                    preds = self.forward(X_val).squeeze()
-                    val_loss = loss(preds, y_val)
+                val_loss = self._validation_loss(val_batches, loss)
 
-                    if self.early_stopping:
-                        if val_loss_best > val_loss:
-                            val_loss_best = val_loss
-                            patience = 0
-                        else:
-                            patience += 1
+                if self.early_stopping:
+                    if val_loss_best > val_loss:
+                        val_loss_best = val_loss
+                        patience = 0
+                    else:
+                        patience += 1
 
-                        if patience > self.patience and i > self.n_iter_min:
-                            break
+                    if patience > self.patience and i > self.n_iter_min:
+                        break
 
-                    if i % self.n_iter_print == 0:
-                        log.trace(
-                            f"Epoch: {i}, loss: {val_loss}, train_loss: {torch.mean(train_loss)}"
-                        )
+                if i % self.n_iter_print == 0:
+                    log.trace(
+                        f"Epoch: {i}, loss: {val_loss}, train_loss: {torch.mean(train_loss)}"
+                    )
 
         return self
 
+    def _validation_loss(self, batches: TensorBatchLoader, loss: nn.Module) -> float:
+        # Without dropout, and with the running statistics of the batch norms.
+        self.model.eval()
+
+        total = torch.tensor(0.0, device=DEVICE)
+        count = 0
+        with torch.inference_mode():
+            for X_val, y_val in batches:
+                preds = self.forward(X_val).reshape(y_val.shape)
+
+                total += loss(preds, y_val) * len(y_val)
+                count += len(y_val)
+
+        self.model.train()
+
+        return total.item() / max(count, 1)
+
     def _check_tensor(self, X: torch.Tensor) -> torch.Tensor:
         if isinstance(X, torch.Tensor):
             return X.to(DEVICE)
@@ -252,6 +272,8 @@ class NeuralNetsRegressionPlugin(base.RegressionPlugin):
         Minimum number of iterations to go through before starting early stopping
     clipping_value: int, default 1
         Gradients clipping value
+    n_threads: Optional int
+        Number of torch intra-op threads used for training, unless the fit runs within a thread budget. The inference uses the process setting, as it can run on concurrent threads. Defaults to the torch setting.
     random_state: int
         Random seed
 
@@ -279,6 +301,7 @@ class NeuralNetsRegressionPlugin(base.RegressionPlugin):
         clipping_value: int = 1,
         batch_norm: bool = True,
         early_stopping: bool = True,
+        n_threads: Optional[int] = None,
         random_state: int = 0,
         hyperparam_search_iterations: Optional[int] = None,
         **kwargs: Any,
@@ -305,6 +328,7 @@ class NeuralNetsRegressionPlugin(base.RegressionPlugin):
         self.clipping_value = clipping_value
         self.batch_norm = batch_norm
         self.early_stopping = early_stopping
+        self.n_threads = n_threads
 
     @staticmethod
     def name() -> str:
@@ -350,7 +374,8 @@ class NeuralNetsRegressionPlugin(base.RegressionPlugin):
             early_stopping=self.early_stopping,
         )
 
-        self.model.train(X, y)
+        with num_threads(self.n_threads):
+            self.model.train(X, y)
         return self
 
     def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
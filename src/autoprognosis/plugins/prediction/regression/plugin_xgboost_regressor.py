@@ -55,6 +55,10 @@ class XGBoostRegressorPlugin(base.RegressionPlugin):
             Number of bins for histogram construction.
         random_state: float
             Random number seed.
+        early_stopping_rounds: int
+            Rounds without improvement of the validation loss before the boosting stops, see `PredictionPlugin._fit_early_stopping`. 0 disables the early stopping.
+        validation_size: float
+            Proportion of the training data held out for the early stopping.
 
     Example:
         >>> from autoprognosis.plugins.prediction import Predictions
@@ -86,9 +90,16 @@ class XGBoostRegressorPlugin(base.RegressionPlugin):
         model: Any = None,
         random_state: int = 0,
         hyperparam_search_iterations: Optional[int] = None,
+        early_stopping_rounds: int = 10,
+        validation_size: float = 0.2,
         **kwargs: Any
     ) -> None:
         super().__init__(**kwargs)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_size = validation_size
+        self.random_state = random_state
+        self.best_iteration: Optional[int] = None
+
         if model is not None:
             self.model = model
             return
@@ -132,7 +143,7 @@ class XGBoostRegressorPlugin(base.RegressionPlugin):
             params.Float("colsample_bylevel", 0.1, 0.9),
             params.Float("subsample", 0.1, 0.9),
             params.Integer("max_depth", 1, 7),
-            params.Integer("n_estimators", 10, 10000),
+            params.Categorical("n_estimators", [10000]),
             params.Integer("min_child_weight", 0, 300),
             params.Integer("max_bin", 256, 512),
             params.Integer(
@@ -140,10 +151,23 @@ class XGBoostRegressorPlugin(base.RegressionPlugin):
             ),
         ]
 
+    def _fit_rounds(
+        self, X: pd.DataFrame, y: Any, eval_set: Optional[tuple], **kwargs: Any
+    ) -> Optional[int]:
+        if eval_set is None:
+            self.model.set_params(early_stopping_rounds=None)
+            self.model.fit(X, y, **kwargs)
+            return None
+
+        self.model.set_params(early_stopping_rounds=self.early_stopping_rounds)
+        self.model.fit(X, y, eval_set=[eval_set], verbose=False, **kwargs)
+        return self.model.best_iteration
+
     def _fit(
         self, X: pd.DataFrame, *args: Any, **kwargs: Any
     ) -> "XGBoostRegressorPlugin":
-        self.model.fit(X, *args, **kwargs)
+        self._fit_early_stopping(self._fit_rounds, X, args[0], **kwargs)
+
         return self
 
     def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
@@ -9,6 +9,7 @@ import pandas as pd
 import autoprognosis.logger as log
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.base as prediction_base
+import autoprognosis.utils.profiling as profiling
 
 
 class RiskEstimationPlugin(prediction_base.PredictionPlugin):
@@ -58,7 +59,8 @@ class RiskEstimationPlugin(prediction_base.PredictionPlugin):
         X = self._preprocess_training_data(X)
 
         log.debug(f"Training using {self.fqdn()}, input shape = {X.shape}")
-        self._fit(X, *args, **kwargs)
+        with profiling.stage(f"{self.type()}.fit"):
+            self._fit(X, *args, **kwargs)
         self._fitted = True
 
         if self.with_explanations and self.explainer is None:
@@ -17,12 +17,8 @@ class LifelinesWrapper:
         T = args[0]
         Y = args[1]
 
-        X = X.reset_index(drop=True)
-        T = T.reset_index(drop=True)
-        Y = Y.reset_index(drop=True)
-
-        df = pd.concat([X, T, Y], axis=1)
-        df.columns = [x for x in X.columns] + ["time", "label"]
+        # A single copy of the covariates, with the outcome columns appended.
+        df = X.assign(time=np.asarray(T), label=np.asarray(Y))
 
         self.model.fit(df, duration_col="time", event_col="label", **kwargs)
 
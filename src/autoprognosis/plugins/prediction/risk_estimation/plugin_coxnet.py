@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, List
+from typing import Any, Callable, List, Tuple
 
 # third party
 import numpy as np
@@ -9,6 +9,7 @@ from sklearn.model_selection import train_test_split
 # autoprognosis absolute
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.risk_estimation.base as base
+from autoprognosis.utils.data_source import DataSource, as_data_source
 from autoprognosis.utils.distributions import enable_reproducible_results
 from autoprognosis.utils.pip import install
 import autoprognosis.utils.serialization as serialization
@@ -25,6 +26,11 @@ for retry in range(2):
         depends = ["torch", "pycox", "torchtuples"]
         install(depends)
 
+# autoprognosis absolute
+from autoprognosis.utils.torch import (  # noqa: E402
+    PREDICT_BATCH_SIZE,
+    DataSourceLoader,
+)
 
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
@@ -32,6 +38,8 @@ DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 class CoxnetRiskEstimationPlugin(base.RiskEstimationPlugin):
     """CoxPH neural net plugin for survival analysis.
 
+    The covariates can be a `DataSource`, e.g. memory-mapped shards: the training, the baseline hazards and the predictions read them in mini-batches.
+
     Args:
         hidden_dim: int
             Number of neurons in the hidden layers
@@ -124,22 +132,22 @@ class CoxnetRiskEstimationPlugin(base.RiskEstimationPlugin):
         """
         return "coxnet"
 
+    @staticmethod
+    def supports_data_source() -> bool:
+        return True
+
     def _fit(
         self, X: pd.DataFrame, *args: Any, **kwargs: Any
     ) -> "CoxnetRiskEstimationPlugin":
         if len(args) < 2:
             raise ValueError("Invalid input for fit. Expecting X, T and Y.")
 
-        X = np.asarray(X).astype("float32")
         T = np.asarray(args[0])
         E = np.asarray(args[1])
 
-        X_train, X_val, E_train, E_val, T_train, T_val = train_test_split(
-            X, E, T, random_state=0
-        )
-
-        y_train = (T_train, E_train)
-        y_val = (T_val, E_val)
+        # The split is on the row positions, the covariates are read by batch.
+        X = as_data_source(X)
+        train_idx, val_idx = train_test_split(np.arange(len(X)), random_state=0)
 
         self.net = tt.practical.MLPVanilla(
             X.shape[1],
@@ -153,20 +161,65 @@ class CoxnetRiskEstimationPlugin(base.RiskEstimationPlugin):
         self.model = CoxPH(self.net, tt.optim.Adam)
         self.model.optimizer.set_lr(self.lr)
 
-        self.model.fit(
-            X_train,
-            y_train,
-            self.batch_size,
+        self.model.fit_dataloader(
+            DataSourceLoader(
+                X.subset(train_idx),
+                self._targets(T[train_idx], E[train_idx]),
+                self.batch_size,
+                shuffle=True,
+            ),
             self.epochs,
             self.callbacks,
             self.verbose,
-            val_data=(X_val, y_val),
-            val_batch_size=self.batch_size,
+            val_dataloader=DataSourceLoader(
+                X.subset(val_idx),
+                self._targets(T[val_idx], E[val_idx]),
+                self.batch_size,
+            ),
         )
-        self.model.compute_baseline_hazards()
+        self._compute_baseline_hazards(X.subset(train_idx), T[train_idx], E[train_idx])
+
+        # The validation loader references the training data, which is not saved with the model.
+        self.model.val_metrics.dataloader = None
 
         return self
 
+    def _targets(self, durations: np.ndarray, events: np.ndarray) -> Callable:
+        def targets(indices: np.ndarray) -> Tuple:
+            return tt.tuplefy(
+                durations[indices].astype("float32"), events[indices].astype("float32")
+            ).to_tensor()
+
+        return targets
+
+    def _compute_baseline_hazards(
+        self, X: DataSource, durations: np.ndarray, events: np.ndarray
+    ) -> None:
+        """Breslow estimate of the baseline hazards, as `CoxPH.compute_baseline_hazards`, from the partial hazards predicted by batch."""
+        expg = np.exp(
+            np.concatenate(
+                [
+                    self.model.predict(X.take(indices)).reshape(-1)
+                    for indices in X.batches(PREDICT_BATCH_SIZE)
+                ]
+            )
+        )
+
+        baseline_hazards = (
+            pd.DataFrame({"duration": durations, "event": events, "expg": expg})
+            .groupby("duration")
+            .agg({"expg": "sum", "event": "sum"})
+            .sort_index(ascending=False)
+            .assign(expg=lambda x: x["expg"].cumsum())
+            .pipe(lambda x: x["event"] / x["expg"])
+            .fillna(0.0)
+            .iloc[::-1]
+            .rename("baseline_hazards")
+        )
+        self.model.compute_baseline_cumulative_hazards(
+            set_hazards=True, baseline_hazards_=baseline_hazards
+        )
+
     def _find_nearest(self, array: np.ndarray, value: float) -> float:
         array = np.asarray(array)
         idx = (np.abs(array - value)).argmin()
@@ -180,8 +233,14 @@ class CoxnetRiskEstimationPlugin(base.RiskEstimationPlugin):
 
         time_horizons = args[0]
 
-        X = np.asarray(X).astype("float32")
-        surv = self.model.predict_surv_df(X).T
+        X = as_data_source(X)
+        surv = pd.concat(
+            [
+                self.model.predict_surv_df(X.take(indices)).T
+                for indices in X.batches(PREDICT_BATCH_SIZE)
+            ],
+            ignore_index=True,
+        )
 
         preds_ = np.zeros([np.shape(surv)[0], len(time_horizons)])
 
@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
 # third party
 import numpy as np
@@ -9,6 +9,7 @@ from sklearn.model_selection import train_test_split
 # autoprognosis absolute
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.risk_estimation.base as base
+from autoprognosis.utils.data_source import as_data_source
 from autoprognosis.utils.distributions import enable_reproducible_results
 from autoprognosis.utils.pip import install
 import autoprognosis.utils.serialization as serialization
@@ -17,6 +18,7 @@ for retry in range(2):
     try:
         # third party
         from pycox.models import DeepHitSingle
+        from pycox.models.data import pair_rank_mat
         import torch
         import torchtuples as tt
 
@@ -25,6 +27,11 @@ for retry in range(2):
         depends = ["torch", "pycox", "torchtuples"]
         install(depends)
 
+# autoprognosis absolute
+from autoprognosis.utils.torch import (  # noqa: E402
+    PREDICT_BATCH_SIZE,
+    DataSourceLoader,
+)
 
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
@@ -32,6 +39,8 @@ DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 class DeepHitRiskEstimationPlugin(base.RiskEstimationPlugin):
     """DeepHit plugin for survival analysis. DeepHit, that uses a deep neural network to learn the distribution of survival times directly.DeepHit makes no assumptions about the underlying stochastic process and allows for the possibility that the relationship between covariates and risk(s) changes over time. Most importantly, DeepHit smoothly handles competing risks; i.e. settings in which there is more than one possible event of interest.
 
+    The covariates can be a `DataSource`, e.g. memory-mapped shards: the training and the predictions read them in mini-batches.
+
     Args:
         num_durations: int
             Number of points in the survival function
@@ -123,24 +132,19 @@ class DeepHitRiskEstimationPlugin(base.RiskEstimationPlugin):
         if len(args) < 2:
             raise ValueError("Invalid input for fit. Expecting X, T and Y.")
 
-        T = args[0]
-        E = args[1]
+        T = np.asarray(args[0])
+        E = np.asarray(args[1])
 
         labtrans = DeepHitSingle.label_transform(self.num_durations)
 
-        X = np.asarray(X).astype("float32")
-
-        X_train, X_val, E_train, E_val, T_train, T_val = train_test_split(
-            X, E, T, random_state=42
-        )
-
-        def get_target(df: Any) -> Tuple:
-            return (np.asarray(df[0]), np.asarray(df[1]))
+        # The split is on the row positions, the covariates are read by batch.
+        X = as_data_source(X)
+        train_idx, val_idx = train_test_split(np.arange(len(X)), random_state=42)
 
-        y_train = labtrans.fit_transform(*get_target((T_train, E_train)))
-        y_val = labtrans.transform(*get_target((T_val, E_val)))
+        y_train = labtrans.fit_transform(T[train_idx], E[train_idx])
+        y_val = labtrans.transform(T[val_idx], E[val_idx])
 
-        in_features = X_train.shape[1]
+        in_features = X.shape[1]
         out_features = labtrans.out_features
 
         net = torch.nn.Sequential(
@@ -167,18 +171,38 @@ class DeepHitRiskEstimationPlugin(base.RiskEstimationPlugin):
         self.model.optimizer.set_lr(self.lr)
 
         callbacks = [tt.callbacks.EarlyStopping(patience=self.patience)]
-        self.model.fit(
-            X_train,
-            y_train,
-            self.batch_size,
+        self.model.fit_dataloader(
+            DataSourceLoader(
+                X.subset(train_idx),
+                self._targets(*y_train),
+                self.batch_size,
+                shuffle=True,
+            ),
             self.epochs,
             callbacks,
-            val_data=(X_val, y_val),
             verbose=False,
+            val_dataloader=DataSourceLoader(
+                X.subset(val_idx), self._targets(*y_val), self.batch_size
+            ),
         )
 
+        # The validation loader references the training data, which is not saved with the model.
+        self.model.val_metrics.dataloader = None
+
         return self
 
+    def _targets(self, durations: np.ndarray, events: np.ndarray) -> Callable:
+        """The DeepHit targets of a batch: the duration indices, the events and the rank matrix of the pairs."""
+
+        def targets(indices: np.ndarray) -> Tuple:
+            return tt.tuplefy(
+                durations[indices],
+                events[indices],
+                pair_rank_mat(durations[indices], events[indices]),
+            ).to_tensor()
+
+        return targets
+
     def _find_nearest(self, array: np.ndarray, value: float) -> float:
         array = np.asarray(array)
         idx = (np.abs(array - value)).argmin()
@@ -192,8 +216,14 @@ class DeepHitRiskEstimationPlugin(base.RiskEstimationPlugin):
 
         time_horizons = args[0]
 
-        X = np.asarray(X).astype("float32")
-        surv = self.model.predict_surv_df(X).T
+        X = as_data_source(X)
+        surv = pd.concat(
+            [
+                self.model.predict_surv_df(X.take(indices)).T
+                for indices in X.batches(PREDICT_BATCH_SIZE)
+            ],
+            ignore_index=True,
+        )
 
         preds_ = np.zeros([np.shape(surv)[0], len(time_horizons)])
 
@@ -208,6 +238,10 @@ class DeepHitRiskEstimationPlugin(base.RiskEstimationPlugin):
     def name() -> str:
         return "deephit"
 
+    @staticmethod
+    def supports_data_source() -> bool:
+        return True
+
     @staticmethod
     def hyperparameter_space(*args: Any, **kwargs: Any) -> List[params.Params]:
         return [
@@ -1,11 +1,11 @@
 # stdlib
-from typing import Any, List
+from typing import Any, Dict, List, Tuple
 
 # third party
+import numpy as np
 import pandas as pd
 from sklearn.feature_selection import VarianceThreshold
 from sklearn.preprocessing import MinMaxScaler
-from statsmodels.stats.outliers_influence import variance_inflation_factor
 
 # autoprognosis absolute
 import autoprognosis.logger as log
@@ -13,6 +13,85 @@ import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.preprocessors.base as base
 import autoprognosis.utils.serialization as serialization
 
+VIF_CACHE_SIZE = 128
+
+_vif_cache: Dict[Tuple, List] = {}
+
+
+class VIFEngine:
+    """Variance inflation factors of all the columns of a dataset, from a single matrix inversion.
+
+    The values match `statsmodels.stats.outliers_influence.variance_inflation_factor`, which regresses each column on the others without an intercept: with C the Gram matrix of X normalized to a unit diagonal, the VIF of column i is the i-th diagonal entry of the inverse of C. Dropping a column is a rank-one downdate of that inverse, so no regression is refitted during the elimination.
+
+    Args:
+        X: pd.DataFrame
+            The dataset. Missing values are treated as zeros.
+        ridge: float
+            Diagonal regularization of C. Perfectly collinear columns get a VIF of about 1 / ridge instead of a singular matrix.
+    """
+
+    def __init__(self, X: pd.DataFrame, ridge: float = 1e-10) -> None:
+        values = np.asarray(X.fillna(0), dtype=float)
+        norms = np.sqrt((values**2).sum(axis=0))
+
+        # All-zero columns have no defined VIF, and do not change the others.
+        nonzero = norms > 0
+        self.features = list(X.columns[nonzero])
+        self.null_features = list(X.columns[~nonzero])
+
+        values = values[:, nonzero] / norms[nonzero]
+        self._corr = values.T @ values + ridge * np.eye(len(self.features))
+        self._inv = np.linalg.inv(self._corr)
+
+    def vif(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "VIF": list(np.diag(self._inv)) + [np.nan] * len(self.null_features),
+                "features": self.features + self.null_features,
+            }
+        )
+
+    def drop(self, feature: Any) -> None:
+        if feature in self.null_features:
+            self.null_features.remove(feature)
+            return
+
+        idx = self.features.index(feature)
+        keep = np.arange(len(self.features)) != idx
+
+        pivot = self._inv[idx, idx]
+        col = self._inv[keep, idx]
+
+        self.features.pop(idx)
+        self._corr = self._corr[np.ix_(keep, keep)]
+
+        # The downdate cancels large terms when the dropped column is nearly collinear with the others.
+        if pivot > 1e6:
+            self._inv = np.linalg.inv(self._corr)
+        else:
+            self._inv = self._inv[np.ix_(keep, keep)] - np.outer(col, col) / pivot
+
+    def eliminate(self, threshold: float) -> List:
+        """Drop the column with the largest VIF, until all the VIFs are under `threshold` or a single column is left.
+
+        Returns:
+            The dropped columns, in order.
+        """
+        drop: List = []
+        while len(self.features) > 0:
+            diag = np.diag(self._inv)
+            worst = int(np.argmax(diag))
+            if diag[worst] <= threshold:
+                break
+
+            drop.append(self.features[worst])
+            self.drop(self.features[worst])
+
+            if len(self.features) + len(self.null_features) <= 1:
+                break
+
+        return drop
+
 
 class DataCompressionPlugin(base.PreprocessorPlugin):
     """Preprocessing plugin used for droping constant features, and for fixing multicollinearity issues.
@@ -64,15 +143,30 @@ class DataCompressionPlugin(base.PreprocessorPlugin):
         return []
 
     def _compute_vif(self, X: pd.DataFrame) -> pd.DataFrame:
-        X = X.copy().fillna(0)
-
-        vif = pd.DataFrame()
-        vif["VIF"] = [variance_inflation_factor(X.values, i) for i in range(X.shape[1])]
-        vif["features"] = X.columns
+        vif = VIFEngine(X).vif()
 
         log.debug(f"[Data cleanup] VIF = {vif}")
         return vif
 
+    def _multicollinear_features(self, X: pd.DataFrame) -> List:
+        # The same fold data comes back for every trial of a study.
+        key = (
+            serialization.dataframe_hash(X),
+            tuple(X.columns),
+            self.vif_threshold,
+        )
+        if key in _vif_cache:
+            return list(_vif_cache[key])
+
+        drop = VIFEngine(X).eliminate(self.vif_threshold)
+        log.debug(f"[Data cleanup] multicollinear features = {drop}")
+
+        if len(_vif_cache) >= VIF_CACHE_SIZE:
+            _vif_cache.clear()
+        _vif_cache[key] = drop
+
+        return list(drop)
+
     def _fit(
         self, X: pd.DataFrame, *args: Any, **kwargs: Any
     ) -> "DataCompressionPlugin":
@@ -91,20 +185,7 @@ class DataCompressionPlugin(base.PreprocessorPlugin):
             )
 
         if self.drop_multicollinearity and X.shape[1] > 1:
-            vif = self._compute_vif(X)
-            vif_max = vif.loc[vif["VIF"].idxmax()]
-            drop = []
-            while vif_max["VIF"] > self.vif_threshold:
-                drop.append(vif_max["features"])
-                eval_X = X.drop(columns=drop)
-
-                if eval_X.shape[1] <= 1:
-                    break
-
-                vif = self._compute_vif(eval_X)
-                vif_max = vif.loc[vif["VIF"].idxmax()]
-
-            self.drop = drop
+            self.drop = self._multicollinear_features(X)
 
         return self
 
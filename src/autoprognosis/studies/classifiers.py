@@ -15,6 +15,7 @@ from autoprognosis.explorers.core.defaults import (
     default_feature_scaling_names,
     default_feature_selection_names,
 )
+from autoprognosis.explorers.core.warm_start import WarmStartStore
 from autoprognosis.hooks import DefaultHooks, Hooks
 import autoprognosis.logger as log
 from autoprognosis.studies._base import Study
@@ -135,6 +136,16 @@ class ClassifierStudy(Study):
             Subsample the evaluation dataset in the search pipeline. Improves the speed of the search.
         max_search_sample_size: int
             Subsample size for the evaluation dataset, if `sample` is True.
+        progressive_search: bool
+            Evaluate the hyperparameter trials on a successive-halving schedule of nested stratified subsamples, growing up to the full dataset: early trials run on small subsamples, and only the promising configurations are re-evaluated on the larger ones. Replaces the single search subsample of `sample_for_search`. Requires the "bayesian" optimizer.
+        min_search_sample_size: int
+            Size of the smallest subsample, if `progressive_search` is True.
+        sample_growth_rate: int
+            Growth rate of the subsamples, and reduction factor of the surviving trials, if `progressive_search` is True.
+        time_budget: Optional int
+            Wall-clock budget(seconds) of the study. Each study iteration gets an even share of it for the base estimators search, which is scheduled across the estimators by their improvement rate, and no iteration starts after the budget is spent.
+        warm_start: bool
+            Warm-start the hyperparameter search from the studies on the most similar past datasets, in the same workspace. The best configurations of each estimator are stored with the dataset meta-features(rows, columns, missingness, class balance, censoring rate), and evaluated first by the next studies.
         n_folds_cv: int.
             Number of cross-validation folds to use for study evaluation
         ensemble_size: int
@@ -186,6 +197,11 @@ class ClassifierStudy(Study):
         random_state: int = 0,
         sample_for_search: bool = True,
         max_search_sample_size: int = 10000,
+        progressive_search: bool = False,
+        min_search_sample_size: int = 1000,
+        sample_growth_rate: int = 3,
+        time_budget: Optional[int] = None,
+        warm_start: bool = False,
         ensemble_size: int = 3,
         n_folds_cv: int = 5,
     ) -> None:
@@ -213,7 +229,8 @@ class ClassifierStudy(Study):
         self.Y = dataset[target]
         self.X = dataset.drop(columns=drop_cols)
 
-        if sample_for_search:
+        # The progressive search schedule subsamples the data by itself.
+        if sample_for_search and not progressive_search:
             sample_size = min(len(self.Y), max_search_sample_size)
 
             counts = self.Y.value_counts().to_dict()
@@ -239,6 +256,7 @@ class ClassifierStudy(Study):
         self.output_file = self.output_folder / "model.p"
 
         self.num_study_iter = num_study_iter
+        self.time_budget = time_budget
 
         self.metric = metric
         self.score_threshold = score_threshold
@@ -259,6 +277,17 @@ class ClassifierStudy(Study):
             random_state=self.random_state,
             ensemble_size=ensemble_size,
             n_folds_cv=n_folds_cv,
+            progressive_search=progressive_search,
+            min_search_sample_size=min_search_sample_size,
+            sample_growth_rate=sample_growth_rate,
+            time_budget=(
+                max(1, time_budget // num_study_iter)
+                if time_budget is not None
+                else None
+            ),
+            warm_start_store=(
+                WarmStartStore(Path(workspace) / "warm_start.p") if warm_start else None
+            ),
         )
 
     def _should_continue(self) -> None:
@@ -315,11 +344,16 @@ class ClassifierStudy(Study):
         best_score, best_model = self._load_progress()
         score = best_score
 
+        run_start = time.time()
         patience = 0
         for it in range(self.num_study_iter):
             self._should_continue()
             start = time.time()
 
+            if self.time_budget is not None and start - run_start > self.time_budget:
+                log.info(f"Study time budget of {self.time_budget}s spent. Stopping...")
+                break
+
             current_model = self.seeker.search(
                 self.search_X, self.search_Y, group_ids=self.search_group_ids
             )
@@ -14,6 +14,7 @@ from autoprognosis.explorers.core.defaults import (
     default_feature_selection_names,
     default_risk_estimation_names,
 )
+from autoprognosis.explorers.core.warm_start import WarmStartStore
 from autoprognosis.explorers.risk_estimation_combos import (
     RiskEnsembleSeeker as standard_seeker,
 )
@@ -110,6 +111,16 @@ class RiskEstimationStudy(Study):
             Subsample the evaluation dataset in the search pipeline. Improves the speed of the search.
         max_search_sample_size: int
             Subsample size for the evaluation dataset, if `sample` is True.
+        progressive_search: bool
+            Evaluate the hyperparameter trials on a successive-halving schedule of nested stratified subsamples, growing up to the full dataset: early trials run on small subsamples, and only the promising configurations are re-evaluated on the larger ones. Replaces the single search subsample of `sample_for_search`. Requires the "bayesian" optimizer.
+        min_search_sample_size: int
+            Size of the smallest subsample, if `progressive_search` is True.
+        sample_growth_rate: int
+            Growth rate of the subsamples, and reduction factor of the surviving trials, if `progressive_search` is True.
+        time_budget: Optional int
+            Wall-clock budget(seconds) of the study. Each study iteration gets an even share of it for the base estimators search, which is scheduled across the estimators by their improvement rate, and no iteration starts after the budget is spent.
+        warm_start: bool
+            Warm-start the hyperparameter search from the studies on the most similar past datasets, in the same workspace. The best configurations of each estimator are stored with the dataset meta-features(rows, columns, missingness, class balance, censoring rate), and evaluated first by the next studies.
     Example:
         >>> import numpy as np
         >>> from pycox import datasets
@@ -163,6 +174,11 @@ class RiskEstimationStudy(Study):
         random_state: int = 0,
         sample_for_search: bool = True,
         max_search_sample_size: int = 10000,
+        progressive_search: bool = False,
+        min_search_sample_size: int = 1000,
+        sample_growth_rate: int = 3,
+        time_budget: Optional[int] = None,
+        warm_start: bool = False,
         ensemble_size: int = 3,
         n_folds_cv: int = 5,
     ) -> None:
@@ -192,7 +208,8 @@ class RiskEstimationStudy(Study):
         self.T = dataset[time_to_event]
         self.X = dataset.drop(columns=drop_cols)
 
-        if sample_for_search:
+        # The progressive search schedule subsamples the data by itself.
+        if sample_for_search and not progressive_search:
             sample_size = min(len(self.Y), max_search_sample_size)
             counts = self.Y.value_counts().to_dict()
             weights = self.Y.apply(lambda s: counts[s])
@@ -221,6 +238,7 @@ class RiskEstimationStudy(Study):
 
         self.num_iter = num_iter
         self.num_study_iter = num_study_iter
+        self.time_budget = time_budget
         self.hooks = hooks
         self.random_state = random_state
         self.n_folds_cv = n_folds_cv
@@ -238,6 +256,17 @@ class RiskEstimationStudy(Study):
             hooks=hooks,
             random_state=self.random_state,
             n_folds_cv=n_folds_cv,
+            progressive_search=progressive_search,
+            min_search_sample_size=min_search_sample_size,
+            sample_growth_rate=sample_growth_rate,
+            time_budget=(
+                max(1, time_budget // num_study_iter)
+                if time_budget is not None
+                else None
+            ),
+            warm_start_store=(
+                WarmStartStore(Path(workspace) / "warm_start.p") if warm_start else None
+            ),
         )
 
     def _should_continue(self) -> None:
@@ -301,7 +330,15 @@ class RiskEstimationStudy(Study):
         ]
         not_improved = 0
 
+        run_start = time.time()
         for it in range(self.num_study_iter):
+            if (
+                self.time_budget is not None
+                and time.time() - run_start > self.time_budget
+            ):
+                log.info(f"Study time budget of {self.time_budget}s spent. Stopping...")
+                break
+
             for seeker in seekers:
                 self._should_continue()
                 start = time.time()
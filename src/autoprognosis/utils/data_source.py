@@ -0,0 +1,315 @@
+# stdlib
+from abc import ABCMeta, abstractmethod
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+# third party
+import numpy as np
+import pandas as pd
+
+
+class DataSource(metaclass=ABCMeta):
+    """Row-indexed access to a dataset, for the plugins which train from mini-batches.
+
+    A data source is not a DataFrame: the rows are read on demand, as float32 arrays, so a dataset larger than the memory can be streamed from shards on disk. The rows are stored in blocks, e.g. the shards, and the reads are cheaper when they stay within a block.
+
+    Each derived class must implement:
+        - columns - the feature names.
+        - __len__ - the number of rows.
+        - _take() - the rows at the given positions, as a float32 array.
+    """
+
+    @property
+    @abstractmethod
+    def columns(self) -> list:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def _take(self, indices: np.ndarray) -> np.ndarray:
+        ...
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self), len(self.columns))
+
+    def blocks(self) -> List[np.ndarray]:
+        """Positions of the rows of each block."""
+        return [np.arange(len(self))]
+
+    def take(self, indices: Any) -> np.ndarray:
+        """The rows at the positions `indices`, in that order, as a float32 array."""
+        indices = np.asarray(indices, dtype=int)
+        if len(indices) > 0 and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError(f"row positions out of range for {len(self)} rows")
+
+        return np.asarray(self._take(indices), dtype="float32")
+
+    def subset(self, indices: Any) -> "DataSource":
+        """A view of the rows at the positions `indices`. No row is read."""
+        return SubsetDataSource(self, indices)
+
+    def batches(
+        self,
+        batch_size: int,
+        shuffle: bool = False,
+        random_state: Union[int, np.random.Generator] = 0,
+    ) -> Iterator[np.ndarray]:
+        """Positions of the rows of each mini-batch.
+
+        Args:
+            batch_size: int
+                Number of rows in a batch.
+            shuffle: bool
+                Shuffle the order of the blocks, and of the rows within each block. The rows of a batch then mostly come from the same block.
+            random_state: int or np.random.Generator
+                Random seed, or the generator of the shuffling.
+        """
+        if batch_size <= 0:
+            raise ValueError(f"invalid batch_size {batch_size}")
+
+        blocks = self.blocks()
+        if shuffle:
+            rng = np.random.default_rng(random_state)
+            blocks = [
+                rng.permutation(blocks[idx]) for idx in rng.permutation(len(blocks))
+            ]
+
+        order = np.concatenate(blocks) if len(blocks) > 0 else np.arange(0)
+        for start in range(0, len(order), batch_size):
+            yield order[start : start + batch_size]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """All the rows, in memory."""
+        return pd.DataFrame(self.take(np.arange(len(self))), columns=self.columns)
+
+
+class ArrayDataSource(DataSource):
+    """Data source over an in-memory array or DataFrame. The rows are converted to float32 by batch, the data is not copied as a whole.
+
+    Args:
+        X: pd.DataFrame or np.ndarray
+            The dataset.
+    """
+
+    def __init__(self, X: Union[pd.DataFrame, np.ndarray]) -> None:
+        if isinstance(X, pd.DataFrame):
+            self._columns = list(X.columns)
+        else:
+            self._columns = list(range(np.shape(X)[1]))
+
+        self.values = np.asarray(X)
+
+    @property
+    def columns(self) -> list:
+        return self._columns
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _take(self, indices: np.ndarray) -> np.ndarray:
+        return self.values[indices]
+
+
+class ShardDataSource(DataSource):
+    """Base class of the data sources stored in shards on disk. Each shard is a block.
+
+    Args:
+        paths: list
+            The shard files, in the row order.
+        columns: list
+            The feature names.
+        sizes: list
+            Number of rows of each shard.
+    """
+
+    def __init__(self, paths: List[Path], columns: list, sizes: List[int]) -> None:
+        if len(paths) == 0:
+            raise ValueError("a sharded data source requires at least one shard")
+
+        self.paths = [Path(path) for path in paths]
+        self._columns = list(columns)
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+
+    @property
+    def columns(self) -> list:
+        return self._columns
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def blocks(self) -> List[np.ndarray]:
+        return [
+            np.arange(start, end)
+            for start, end in zip(self.offsets[:-1], self.offsets[1:])
+        ]
+
+    @abstractmethod
+    def _read_shard(self, shard: int, rows: np.ndarray) -> np.ndarray:
+        """The rows `rows`, sorted, of the shard `shard`."""
+        ...
+
+    def _take(self, indices: np.ndarray) -> np.ndarray:
+        result = np.empty((len(indices), len(self.columns)), dtype="float32")
+
+        shards = np.searchsorted(self.offsets, indices, side="right") - 1
+        for shard in np.unique(shards):
+            pos = np.flatnonzero(shards == shard)
+            rows = indices[pos] - self.offsets[shard]
+
+            # Sequential reads within the shard.
+            order = np.argsort(rows, kind="stable")
+            result[pos[order]] = self._read_shard(shard, rows[order])
+
+        return result
+
+
+class NumpyShardDataSource(ShardDataSource):
+    """Data source over `.npy` shards, memory-mapped. Only the pages of the rows read are loaded, and the pickled source holds the paths, not the data, so the search workers share the page cache.
+
+    Args:
+        paths: list
+            The `.npy` files, 2D arrays with the same number of columns, in the row order.
+        columns: Optional list
+            The feature names. Defaults to the column positions.
+    """
+
+    def __init__(self, paths: List[Path], columns: Optional[list] = None) -> None:
+        self._shards = [np.load(path, mmap_mode="r") for path in paths]
+
+        n_features = {shard.shape[1] for shard in self._shards if shard.ndim == 2}
+        if len(n_features) != 1 or any(shard.ndim != 2 for shard in self._shards):
+            raise ValueError("the .npy shards must be 2D arrays with the same columns")
+
+        if columns is None:
+            columns = list(range(n_features.pop()))
+
+        super().__init__(paths, columns, [len(shard) for shard in self._shards])
+
+    def _read_shard(self, shard: int, rows: np.ndarray) -> np.ndarray:
+        return self._shards[shard][rows]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_shards"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._shards = [np.load(path, mmap_mode="r") for path in self.paths]
+
+
+class ParquetShardDataSource(ShardDataSource):
+    """Data source over Parquet shards. A shard is read as a whole, and the last one read is kept in memory, so the batches should stay within the shards(see `DataSource.batches`). Requires pyarrow.
+
+    Args:
+        paths: list
+            The Parquet files, with the same columns, in the row order.
+        columns: Optional list
+            The columns to read. Defaults to all the columns of the first shard.
+    """
+
+    def __init__(self, paths: List[Path], columns: Optional[list] = None) -> None:
+        # third party
+        import pyarrow.parquet as pq
+
+        metadata = [pq.ParquetFile(path) for path in paths]
+        if columns is None and len(metadata) > 0:
+            columns = list(metadata[0].schema_arrow.names)
+
+        super().__init__(
+            paths, columns or [], [meta.metadata.num_rows for meta in metadata]
+        )
+        self._cache: Tuple[int, Optional[np.ndarray]] = (-1, None)
+
+    def _read_shard(self, shard: int, rows: np.ndarray) -> np.ndarray:
+        cached, values = self._cache
+        if cached != shard or values is None:
+            values = pd.read_parquet(self.paths[shard], columns=self.columns)
+            values = values.to_numpy(dtype="float32")
+            self._cache = (shard, values)
+
+        return values[rows]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_cache"] = (-1, None)
+        return state
+
+
+class SubsetDataSource(DataSource):
+    """View of some rows of another data source.
+
+    Args:
+        source: DataSource
+            The full data source.
+        indices: np.ndarray
+            The positions of the rows in `source`.
+    """
+
+    def __init__(self, source: DataSource, indices: Any) -> None:
+        indices = np.asarray(indices, dtype=int)
+        if len(indices) > 0 and (indices.min() < 0 or indices.max() >= len(source)):
+            raise IndexError(f"row positions out of range for {len(source)} rows")
+
+        self.source = source
+        self.indices = indices
+
+    @property
+    def columns(self) -> list:
+        return self.source.columns
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def _take(self, indices: np.ndarray) -> np.ndarray:
+        return self.source.take(self.indices[indices])
+
+    def subset(self, indices: Any) -> "DataSource":
+        indices = np.asarray(indices, dtype=int)
+
+        return SubsetDataSource(self.source, self.indices[indices])
+
+    def blocks(self) -> List[np.ndarray]:
+        block_of = np.empty(len(self.source), dtype=int)
+        for idx, block in enumerate(self.source.blocks()):
+            block_of[block] = idx
+
+        ids = block_of[self.indices]
+        order = np.argsort(ids, kind="stable")
+        bounds = np.flatnonzero(np.diff(ids[order])) + 1
+
+        return [block for block in np.split(order, bounds) if len(block) > 0]
+
+
+def as_data_source(X: Any) -> DataSource:
+    """The data source of `X`: `X` itself if it is a data source, otherwise an `ArrayDataSource`."""
+    if isinstance(X, DataSource):
+        return X
+
+    return ArrayDataSource(X)
+
+
+def to_numpy_shards(
+    X: pd.DataFrame, path: Path, shard_size: int = 100000
+) -> NumpyShardDataSource:
+    """Write `X` to `.npy` shards of `shard_size` rows, as float32, in the directory `path`.
+
+    Returns:
+        The memory-mapped data source of the shards.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for shard, start in enumerate(range(0, max(len(X), 1), shard_size)):
+        shard_path = path / f"shard_{shard}.npy"
+        np.save(shard_path, np.asarray(X[start : start + shard_size], dtype="float32"))
+        paths.append(shard_path)
+
+    columns = list(X.columns) if isinstance(X, pd.DataFrame) else None
+
+    return NumpyShardDataSource(paths, columns=columns)
@@ -0,0 +1,321 @@
+# stdlib
+from typing import Any, List, Tuple
+
+# third party
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, RegressorMixin
+
+# Number of elements of the candidate distances computed at once, by query batch.
+QUERY_BUFFER_SIZE = 2**24
+
+
+class _RandomProjectionTree:
+    """Binary tree over the rows of a dataset, splitting each node at the median of the projections on a random direction, until the leaves have at most `leaf_size` rows."""
+
+    def __init__(self, X: np.ndarray, leaf_size: int, rng: np.random.Generator) -> None:
+        normals: List[np.ndarray] = []
+        offsets: List[float] = []
+        children: List[List[int]] = []
+        leaf_of_node: List[int] = []
+        leaves: List[np.ndarray] = []
+
+        def new_node() -> int:
+            normals.append(np.zeros(X.shape[1], dtype=X.dtype))
+            offsets.append(0.0)
+            children.append([-1, -1])
+            leaf_of_node.append(-1)
+            return len(children) - 1
+
+        stack = [(new_node(), np.arange(len(X)))]
+        while len(stack) > 0:
+            node, rows = stack.pop()
+            if len(rows) <= leaf_size:
+                leaf_of_node[node] = len(leaves)
+                leaves.append(rows)
+                continue
+
+            # The direction between two random rows follows the data.
+            first, second = rng.choice(rows, size=2, replace=False)
+            normal = X[first] - X[second]
+            if not normal.any():
+                normal = rng.standard_normal(X.shape[1]).astype(X.dtype)
+
+            projections = X[rows] @ normal
+            offset = float(np.median(projections))
+            right = projections > offset
+
+            # Ties, e.g. on one-hot data: the split is random.
+            if right.all() or not right.any():
+                right = np.zeros(len(rows), dtype=bool)
+                right[rng.permutation(len(rows))[: len(rows) // 2]] = True
+
+            left_node, right_node = new_node(), new_node()
+            normals[node] = normal
+            offsets[node] = offset
+            children[node] = [left_node, right_node]
+
+            stack.append((left_node, rows[~right]))
+            stack.append((right_node, rows[right]))
+
+        self.normals = np.stack(normals)
+        self.offsets = np.asarray(offsets, dtype=X.dtype)
+        self.children = np.asarray(children, dtype=int)
+        self.leaf_of_node = np.asarray(leaf_of_node, dtype=int)
+
+        # The rows of each leaf, padded with -1.
+        self.leaf_rows = np.full(
+            (len(leaves), max(len(leaf) for leaf in leaves)), -1, dtype=int
+        )
+        for idx, leaf in enumerate(leaves):
+            self.leaf_rows[idx, : len(leaf)] = leaf
+
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """The leaf of each row of `X`."""
+        nodes = np.zeros(len(X), dtype=int)
+        active = np.arange(len(X))
+
+        while len(active) > 0:
+            current = nodes[active]
+            projections = np.einsum("ij,ij->i", X[active], self.normals[current])
+            nodes[active] = np.where(
+                projections > self.offsets[current],
+                self.children[current, 1],
+                self.children[current, 0],
+            )
+            active = active[self.children[nodes[active], 0] >= 0]
+
+        return self.leaf_of_node[nodes]
+
+
+class RandomProjectionIndex:
+    """Approximate nearest neighbors index, built from a forest of random projection trees.
+
+    The candidate neighbors of a query are the rows of the leaves it falls in, one per tree, and they are ranked by their exact Minkowski distance. A query costs O(n_trees x leaf_size) distances, instead of one per training row. More trees, or larger leaves, give a better recall and slower queries. With `leaf_size` at least the number of rows, the search is exact.
+
+    Args:
+        n_trees: int
+            Number of trees.
+        leaf_size: int
+            Maximum number of rows in a leaf.
+        p: int
+            Power parameter for the Minkowski metric.
+        random_state: int
+            Random seed
+    """
+
+    def __init__(
+        self,
+        n_trees: int = 10,
+        leaf_size: int = 30,
+        p: int = 2,
+        random_state: int = 0,
+    ) -> None:
+        if n_trees <= 0 or leaf_size <= 0:
+            raise ValueError(f"invalid index size: {n_trees} trees of {leaf_size} rows")
+
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.p = p
+        self.random_state = random_state
+
+    def fit(self, X: Any) -> "RandomProjectionIndex":
+        self.X = np.asarray(X, dtype="float32")
+        if len(self.X) == 0:
+            raise ValueError("cannot index an empty dataset")
+
+        rng = np.random.default_rng(self.random_state)
+        self.trees = [
+            _RandomProjectionTree(self.X, self.leaf_size, rng)
+            for _ in range(self.n_trees)
+        ]
+
+        return self
+
+    def _distances(self, X: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        diff = self.X[np.maximum(candidates, 0)] - X[:, None, :]
+        if self.p == 2:
+            return np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+        if self.p == 1:
+            return np.abs(diff).sum(axis=-1)
+
+        return (np.abs(diff) ** self.p).sum(axis=-1) ** (1 / self.p)
+
+    def query(self, X: Any, n_neighbors: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The approximate nearest neighbors of the rows of `X`.
+
+        Returns:
+            The distances and the positions of the neighbors, nearest first, with shape (len(X), n_neighbors). If fewer than `n_neighbors` candidates are found, the missing positions are -1, at an infinite distance.
+        """
+        X = np.asarray(X, dtype="float32")
+
+        n_candidates = sum(tree.leaf_rows.shape[1] for tree in self.trees)
+        batch_size = max(1, QUERY_BUFFER_SIZE // (n_candidates * self.X.shape[1]))
+
+        distances = np.full((len(X), n_neighbors), np.inf)
+        neighbors = np.full((len(X), n_neighbors), -1, dtype=int)
+
+        for start in range(0, len(X), batch_size):
+            batch = X[start : start + batch_size]
+
+            candidates = np.sort(
+                np.concatenate(
+                    [tree.leaf_rows[tree.leaves(batch)] for tree in self.trees], axis=1
+                ),
+                axis=1,
+            )
+            # The padding, and the rows found by several trees.
+            invalid = candidates < 0
+            invalid[:, 1:] |= candidates[:, 1:] == candidates[:, :-1]
+
+            batch_distances = self._distances(batch, candidates)
+            batch_distances[invalid] = np.inf
+
+            k = min(n_neighbors, candidates.shape[1])
+            nearest = np.argpartition(batch_distances, k - 1, axis=1)[:, :k]
+            order = np.argsort(
+                np.take_along_axis(batch_distances, nearest, axis=1), axis=1
+            )
+            nearest = np.take_along_axis(nearest, order, axis=1)
+
+            rows = slice(start, start + len(batch))
+            distances[rows, :k] = np.take_along_axis(batch_distances, nearest, axis=1)
+            neighbors[rows, :k] = np.take_along_axis(candidates, nearest, axis=1)
+
+        neighbors[np.isinf(distances)] = -1
+
+        return distances, neighbors
+
+
+def _neighbor_weights(distances: np.ndarray, weights: str) -> np.ndarray:
+    valid = np.isfinite(distances)
+    if weights == "uniform":
+        return valid.astype(float)
+
+    if weights != "distance":
+        raise ValueError(f"unknown weights {weights}")
+
+    # As in sklearn, the exact matches of a query get all the weight.
+    exact = distances == 0
+    with np.errstate(divide="ignore"):
+        result = np.where(valid, 1 / distances, 0)
+
+    has_exact = exact.any(axis=1)
+    result[has_exact] = exact[has_exact]
+
+    return result
+
+
+class ApproximateKNeighborsClassifier(ClassifierMixin, BaseEstimator):
+    """k-nearest neighbors vote, over the neighbors found by a `RandomProjectionIndex`.
+
+    Args:
+        n_neighbors: int
+            Number of neighbors to use
+        weights: str
+            Weight function used in prediction. Possible values: "uniform", "distance"
+        p: int
+            Power parameter for the Minkowski metric.
+        n_trees: int
+            Number of trees of the index.
+        leaf_size: int
+            Maximum number of rows in a leaf of the index.
+        random_state: int
+            Random seed
+    """
+
+    def __init__(
+        self,
+        n_neighbors: int = 5,
+        weights: str = "uniform",
+        p: int = 2,
+        n_trees: int = 10,
+        leaf_size: int = 30,
+        random_state: int = 0,
+    ) -> None:
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.p = p
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.random_state = random_state
+
+    def fit(self, X: Any, y: Any) -> "ApproximateKNeighborsClassifier":
+        self.classes_, self._y = np.unique(np.asarray(y).ravel(), return_inverse=True)
+        self.index_ = RandomProjectionIndex(
+            n_trees=self.n_trees,
+            leaf_size=self.leaf_size,
+            p=self.p,
+            random_state=self.random_state,
+        ).fit(X)
+
+        return self
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        distances, neighbors = self.index_.query(X, self.n_neighbors)
+        weights = _neighbor_weights(distances, self.weights)
+
+        proba = np.zeros((len(neighbors), len(self.classes_)))
+        rows = np.broadcast_to(np.arange(len(neighbors))[:, None], neighbors.shape)
+        np.add.at(proba, (rows, self._y[np.maximum(neighbors, 0)]), weights)
+
+        total = proba.sum(axis=1, keepdims=True)
+        total[total == 0] = 1
+
+        return proba / total
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+class ApproximateKNeighborsRegressor(RegressorMixin, BaseEstimator):
+    """k-nearest neighbors regression, over the neighbors found by a `RandomProjectionIndex`.
+
+    Args:
+        n_neighbors: int
+            Number of neighbors to use
+        weights: str
+            Weight function used in prediction. Possible values: "uniform", "distance"
+        p: int
+            Power parameter for the Minkowski metric.
+        n_trees: int
+            Number of trees of the index.
+        leaf_size: int
+            Maximum number of rows in a leaf of the index.
+        random_state: int
+            Random seed
+    """
+
+    def __init__(
+        self,
+        n_neighbors: int = 5,
+        weights: str = "uniform",
+        p: int = 2,
+        n_trees: int = 10,
+        leaf_size: int = 30,
+        random_state: int = 0,
+    ) -> None:
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.p = p
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.random_state = random_state
+
+    def fit(self, X: Any, y: Any) -> "ApproximateKNeighborsRegressor":
+        self._y = np.asarray(y, dtype=float).ravel()
+        self.index_ = RandomProjectionIndex(
+            n_trees=self.n_trees,
+            leaf_size=self.leaf_size,
+            p=self.p,
+            random_state=self.random_state,
+        ).fit(X)
+
+        return self
+
+    def predict(self, X: Any) -> np.ndarray:
+        distances, neighbors = self.index_.query(X, self.n_neighbors)
+        weights = _neighbor_weights(distances, self.weights)
+
+        values = (weights * self._y[np.maximum(neighbors, 0)]).sum(axis=1)
+
+        return values / np.maximum(weights.sum(axis=1), np.finfo(float).tiny)
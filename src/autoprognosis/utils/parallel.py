@@ -1,9 +1,33 @@
 # stdlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import multiprocessing
 import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# third party
+from joblib import Parallel
+from joblib.externals.loky import get_reusable_executor
+from threadpoolctl import threadpool_limits
 
 # autoprognosis absolute
 import autoprognosis.logger as log
+import autoprognosis.utils.profiling as profiling
+
+_thread_pools: Dict[Tuple[str, int], ThreadPoolExecutor] = {}
+_thread_pools_lock = threading.Lock()
+
+# The thread budget of the running search task, see `thread_budget`.
+_learner_threads: Optional[int] = None
+
+# The thread count parameters of the learners, see `set_learner_threads`.
+LEARNER_THREAD_PARAMS = ["n_jobs", "nthread", "thread_count", "num_threads"]
+
+# Memory of an idle loky worker, with the libraries loaded.
+WORKER_MEMORY_OVERHEAD = 512 * 2**20
 
 
 def n_opt_jobs() -> int:
@@ -16,11 +40,314 @@ def n_opt_jobs() -> int:
     return n_jobs
 
 
+def n_cpus() -> int:
+    """Number of cores shared by the hyperparameter search: the optimizer workers, and the threads of the learners within them. Set by `N_CPUS`, defaults to all the cores."""
+    try:
+        n_jobs = int(os.environ["N_CPUS"])
+    except BaseException as e:
+        n_jobs = multiprocessing.cpu_count()
+        log.debug(f"failed to get N_CPUS {e}")
+    return max(1, n_jobs)
+
+
+def n_worker_threads() -> int:
+    """Number of threads of each optimizer worker: the `n_cpus()` cores, split between the `n_opt_jobs()` workers."""
+    return max(1, n_cpus() // max(1, n_opt_jobs()))
+
+
 def n_learner_jobs() -> int:
     try:
         n_jobs = int(os.environ["N_LEARNER_JOBS"])
     except BaseException as e:
-        n_jobs = multiprocessing.cpu_count()
+        if _learner_threads is not None:
+            n_jobs = _learner_threads
+        else:
+            n_jobs = n_cpus()
         log.debug(f"failed to get N_LEARNER_JOBS {e}")
     log.debug(f"Using {n_jobs} cores for learners")
     return n_jobs
+
+
+def n_inference_jobs() -> int:
+    try:
+        n_jobs = int(os.environ["N_INFERENCE_JOBS"])
+    except BaseException as e:
+        n_jobs = multiprocessing.cpu_count()
+        log.debug(f"failed to get N_INFERENCE_JOBS {e}")
+    log.debug(f"Using {n_jobs} threads for inference")
+    return n_jobs
+
+
+def thread_pool(name: str, n_jobs: int) -> ThreadPoolExecutor:
+    """Persistent thread pool, shared by name and size for the whole process.
+
+    Separate names must be used for nested workloads, e.g. the explainers calling the ensemble inference, so that a worker never waits on a task queued in its own pool.
+
+    Args:
+        name: str
+            Pool ID
+        n_jobs: int
+            Maximum concurrency.
+    """
+    n_jobs = max(1, n_jobs)
+
+    with _thread_pools_lock:
+        key = (name, n_jobs)
+        if key not in _thread_pools:
+            _thread_pools[key] = ThreadPoolExecutor(
+                max_workers=n_jobs, thread_name_prefix=f"autoprognosis_{name}"
+            )
+        return _thread_pools[key]
+
+
+def inference_pool(n_jobs: Optional[int] = None) -> ThreadPoolExecutor:
+    """Persistent thread pool used for concurrent model inference.
+
+    The pools live for the whole process, so loaded models don't pay the worker startup cost on every prediction.
+
+    Args:
+        n_jobs: Optional int
+            Maximum concurrency. Defaults to `n_inference_jobs()`.
+    """
+    if n_jobs is None:
+        n_jobs = n_inference_jobs()
+
+    return thread_pool("inference", n_jobs)
+
+
+def active_thread_budget() -> Optional[int]:
+    """The thread budget of the running task, see `thread_budget`. None outside of a budget."""
+    return _learner_threads
+
+
+@contextmanager
+def thread_budget(n_threads: int) -> Iterator[None]:
+    """Run the block within `n_threads` threads: the default `n_learner_jobs()`, the BLAS and OpenMP pools, and torch if it is loaded. The previous settings are restored afterwards.
+
+    Args:
+        n_threads: int
+            The thread budget.
+    """
+    global _learner_threads
+
+    previous = _learner_threads
+    _learner_threads = n_threads
+
+    torch = sys.modules.get("torch")
+    torch_threads = torch.get_num_threads() if torch is not None else None
+    if torch is not None:
+        torch.set_num_threads(n_threads)
+
+    try:
+        with threadpool_limits(limits=n_threads):
+            yield
+    finally:
+        _learner_threads = previous
+        if torch is not None:
+            torch.set_num_threads(torch_threads)
+
+
+class _BudgetedTask:
+    def __init__(self, func: Callable, n_threads: int, memory: int) -> None:
+        self.func = func
+        self.n_threads = n_threads
+        self.memory = memory
+        self.created = time.time()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        # The task is recorded from its dispatch, see `profiling.record`.
+        with thread_budget(self.n_threads), profiling.record():
+            profiling.add("dispatch_wait", max(0.0, time.time() - self.created))
+            return self.func(*args, **kwargs)
+
+
+def budgeted(
+    func: Callable, n_threads: Optional[int] = None, memory: int = 0
+) -> Callable:
+    """Wrap a search task, to run it within the thread budget of an optimizer worker(see `thread_budget`). The budget is computed when the task is created, in the parent process, and applied in the worker.
+
+    Example:
+        >>> dispatcher(delayed(budgeted(search))(estimator) for estimator in estimators)
+
+    Args:
+        func: Callable
+            The task.
+        n_threads: Optional int
+            The thread budget. Defaults to `n_worker_threads()`.
+        memory: int
+            The estimated peak memory of the task, in bytes, for the admission of `MemoryAwareDispatcher`.
+    """
+    if n_threads is None:
+        n_threads = n_worker_threads()
+
+    return _BudgetedTask(func, n_threads, memory)
+
+
+def _set_learner_threads(obj: Any, n_threads: int, seen: set) -> None:
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+
+    if isinstance(obj, (list, tuple)):
+        children: Iterable = obj
+    elif isinstance(obj, dict):
+        children = obj.values()
+    elif hasattr(obj, "get_params") and hasattr(obj, "set_params"):
+        try:
+            params = obj.get_params(deep=False)
+        except BaseException:
+            return
+        # Explicit thread counts below the budget are kept.
+        threads = {
+            key: n_threads if params[key] <= 0 else min(params[key], n_threads)
+            for key in LEARNER_THREAD_PARAMS
+            if isinstance(params.get(key), int)
+        }
+        if len(threads) > 0:
+            obj.set_params(**threads)
+        children = params.values()
+    elif type(obj).__module__.startswith("autoprognosis") and hasattr(obj, "__dict__"):
+        children = vars(obj).values()
+    else:
+        return
+
+    for child in children:
+        _set_learner_threads(child, n_threads, seen)
+
+
+def set_learner_threads(model: Any, n_threads: Optional[int] = None) -> Any:
+    """Set the thread count of the learners within `model`, e.g. an ensemble member built in the parent process, which read `n_learner_jobs()` outside of the thread budget of the task fitting it. The sklearn-style estimators reachable from the plugins, pipelines and ensembles are updated in place.
+
+    Args:
+        model: Any
+            The model.
+        n_threads: Optional int
+            The thread count. Defaults to `n_learner_jobs()`.
+    """
+    if n_threads is None:
+        n_threads = n_learner_jobs()
+
+    _set_learner_threads(model, n_threads, set())
+
+    return model
+
+
+def memory_limit() -> Optional[int]:
+    """Memory cap of the search workers, in bytes. Set by `MEMORY_LIMIT_GB`, defaults to 80% of the physical memory. None if unknown."""
+    try:
+        return int(float(os.environ["MEMORY_LIMIT_GB"]) * 2**30)
+    except BaseException as e:
+        log.debug(f"failed to get MEMORY_LIMIT_GB {e}")
+
+    try:
+        return int(0.8 * os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"))
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _process_memory() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except BaseException:
+        return 0
+
+
+class MemoryAwareDispatcher:
+    """joblib dispatcher which admits the tasks under a memory cap.
+
+    The tasks are submitted one at a time, in order: a task starts once a worker is free and its estimated footprint(see `budgeted`) fits next to the footprints of the running tasks and the memory already used by the parent process. Each finished task frees its memory for the next one. A task larger than the cap runs alone. Without the cap, the tasks are dispatched by `joblib.Parallel`.
+
+    Args:
+        memory_limit: Optional int
+            The memory cap, in bytes. Defaults to `memory_limit()`.
+        kwargs:
+            The `joblib.Parallel` arguments.
+    """
+
+    def __init__(self, memory_limit: Optional[int] = None, **kwargs: Any) -> None:
+        self.memory_limit = memory_limit
+        self.parallel = Parallel(**kwargs)
+        self.backend = kwargs.get("backend", "loky")
+        self.return_generator = kwargs.get("return_as") == "generator"
+
+        n_jobs = kwargs.get("n_jobs") or 1
+        self.n_workers = n_jobs if n_jobs > 0 else multiprocessing.cpu_count()
+
+    def _executor(self) -> Any:
+        if self.backend == "threading":
+            return ThreadPoolExecutor(max_workers=self.n_workers)
+
+        return get_reusable_executor(max_workers=self.n_workers)
+
+    def as_completed(self, next_task: Callable[[], Any]) -> Iterator[Tuple[int, Any]]:
+        """Run the tasks as the workers free up, under the memory cap, and yield the `(position, result)` of each task once it finishes.
+
+        Args:
+            next_task: Callable
+                Called whenever a worker is free, returns the next delayed call, or None when there is nothing to run for now. It can depend on the results already yielded, e.g. to give the freed worker the next time slice of a search. The iteration stops once no task is running and `next_task()` returns None.
+        """
+        limit = self.memory_limit if self.memory_limit is not None else memory_limit()
+        capacity = float("inf") if limit is None else limit - _process_memory()
+        executor = self._executor()
+
+        running: Dict[Future, Tuple[int, int]] = {}
+        in_flight = 0
+        submitted = 0
+        upcoming = None
+        try:
+            while True:
+                while len(running) < self.n_workers:
+                    if upcoming is None:
+                        upcoming = next_task()
+                    if upcoming is None:
+                        break
+
+                    func, args, kwargs = upcoming
+                    footprint = getattr(func, "memory", 0) + WORKER_MEMORY_OVERHEAD
+                    if len(running) > 0 and in_flight + footprint > capacity:
+                        break
+                    if footprint > capacity:
+                        log.warning(
+                            f"task {submitted} needs {footprint / 2**30:.1f}GB, over the {capacity / 2**30:.1f}GB available"
+                        )
+
+                    future = executor.submit(func, *args, **kwargs)
+                    running[future] = (submitted, footprint)
+                    in_flight += footprint
+                    submitted += 1
+                    upcoming = None
+
+                if len(running) == 0:
+                    return
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position, footprint = running.pop(future)
+                    in_flight -= footprint
+                    yield position, future.result()
+        finally:
+            for future in running:
+                future.cancel()
+            if self.backend == "threading":
+                executor.shutdown(wait=False)
+
+    def _run(self, tasks: List) -> Iterator:
+        pending = iter(tasks)
+        results: Dict[int, Any] = {}
+        returned = 0
+        for position, result in self.as_completed(lambda: next(pending, None)):
+            results[position] = result
+            while returned in results:
+                yield results.pop(returned)
+                returned += 1
+
+    def __call__(self, tasks: Iterable) -> Any:
+        tasks = list(tasks)
+        limit = self.memory_limit if self.memory_limit is not None else memory_limit()
+        if limit is None or len(tasks) == 0:
+            return self.parallel(tasks)
+
+        results = self._run(tasks)
+
+        return results if self.return_generator else list(results)
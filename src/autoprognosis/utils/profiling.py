@@ -0,0 +1,149 @@
+# stdlib
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, Generator, Iterable, List, Set, Tuple, Union
+
+_local = threading.local()
+
+
+class Timings:
+    """Durations of the instrumented stages, aggregated by stage: the number of calls and the total seconds. The durations are inclusive, e.g. the fit of a model includes the serialization it runs."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """The timings by stage, as plain types for the hooks."""
+        return {
+            stage: {"count": self.counts[stage], "seconds": round(seconds, 6)}
+            for stage, seconds in sorted(self.totals.items())
+        }
+
+
+def _stack() -> List[Timings]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+
+    return _local.stack
+
+
+@contextmanager
+def record(reuse: bool = False) -> Generator[Timings, None, None]:
+    """Record the instrumented stages run by the current thread, e.g. during a trial. The recordings can be nested: a stage is added to all the active ones.
+
+    Args:
+        reuse: bool
+            Continue the innermost active recording, if any, instead of starting a new one. E.g. an estimator search continues the recording of its task, which holds the dispatch wait.
+    """
+    stack = _stack()
+    if reuse and len(stack) > 0:
+        yield stack[-1]
+        return
+
+    timings = Timings()
+    stack.append(timings)
+    try:
+        yield timings
+    finally:
+        stack.pop()
+
+
+def add(name: str, seconds: float) -> None:
+    """Add a duration measured by the caller to the active recordings."""
+    for timings in _stack():
+        timings.add(name, seconds)
+
+
+def _open_stages() -> Set[str]:
+    if not hasattr(_local, "open_stages"):
+        _local.open_stages = set()
+
+    return _local.open_stages
+
+
+@contextmanager
+def stage(name: str) -> Generator[None, None, None]:
+    """Time the block as the stage `name`. Without an active recording, nothing is measured. A stage nested in a stage with the same name, e.g. the predict of a plugin calling the predict of another one, is part of the outer one and is not counted again."""
+    open_stages = _open_stages()
+    if len(getattr(_local, "stack", [])) == 0 or name in open_stages:
+        yield
+        return
+
+    open_stages.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        open_stages.discard(name)
+        add(name, time.perf_counter() - start)
+
+
+def append_jsonl(path: Union[str, Path], event: dict) -> None:
+    """Append an event to a JSONL file. The lines are written at once, so the search workers can share the file."""
+    line = json.dumps(event, default=str) + "\n"
+    with open(path, "a") as f:
+        f.write(line)
+
+
+def read_jsonl(path: Union[str, Path]) -> List[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(events: Iterable[dict]) -> str:
+    """Prometheus text exposition of the "estimator" timing events, summed by topic, estimator and stage. The "trial" events detail the same durations, and are skipped."""
+    totals: Dict[Tuple[str, str, str], List[float]] = {}
+    for event in events:
+        if event.get("scope") != "estimator":
+            continue
+
+        for name, value in event.get("timings", {}).items():
+            key = (event.get("topic", ""), event.get("name", ""), name)
+            total = totals.setdefault(key, [0, 0.0])
+            total[0] += value["count"]
+            total[1] += value["seconds"]
+
+    rows = []
+    for (topic, name, stage_name), (count, seconds) in sorted(totals.items()):
+        labels = f'topic="{_label(topic)}",estimator="{_label(name)}"'
+        labels += f',stage="{_label(stage_name)}"'
+        rows.append((labels, count, seconds))
+
+    lines = [
+        "# HELP autoprognosis_stage_calls_total Number of runs of the stages.",
+        "# TYPE autoprognosis_stage_calls_total counter",
+    ]
+    lines += [
+        f"autoprognosis_stage_calls_total{{{labels}}} {int(count)}"
+        for labels, count, _ in rows
+    ]
+    lines += [
+        "# HELP autoprognosis_stage_seconds_total Time spent in the stages.",
+        "# TYPE autoprognosis_stage_seconds_total counter",
+    ]
+    lines += [
+        f"autoprognosis_stage_seconds_total{{{labels}}} {seconds:.6f}"
+        for labels, _, seconds in rows
+    ]
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(events: Iterable[dict], path: Union[str, Path]) -> None:
+    """Write `to_prometheus(events)` to a text file, e.g. for the node_exporter textfile collector."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(to_prometheus(events))
+    tmp.replace(path)
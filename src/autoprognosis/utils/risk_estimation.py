@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, Tuple
+from typing import Any, Tuple, Union
 
 # third party
 from lifelines import CRCSplineFitter
@@ -7,35 +7,49 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# autoprognosis absolute
+from autoprognosis.utils.data_source import DataSource
+
 
 def generate_dataset_for_horizon(
-    X: pd.DataFrame, T: pd.DataFrame, Y: pd.DataFrame, horizon_days: int
-) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    X: Union[pd.DataFrame, DataSource],
+    T: pd.DataFrame,
+    Y: pd.DataFrame,
+    horizon_days: int,
+) -> Tuple[Union[pd.DataFrame, DataSource], pd.DataFrame, pd.DataFrame]:
     """
     Generate the dataset at a certain time horizon. Useful for classifiers.
 
     Args:
-        X: pd.DataFrame, the feature set
+        X: pd.DataFrame or DataSource, the feature set
         T: pd.DataFrame, days to event or censoring
         Y: pd.DataFrame, outcome or censoring
         horizon_days: int, days to the expected horizon
 
     Returns:
-        X: the feature set for that horizon
+        X: the feature set for that horizon. A view of the rows for a DataSource.
         T: days to event or censoring
         Y: Outcome or censoring
 
     """
 
-    X = X.copy().reset_index(drop=True)
     T = T.copy().reset_index(drop=True)
     Y = Y.copy().reset_index(drop=True)
 
     event_horizon = ((Y == 1) & (T <= horizon_days)) | ((Y == 0) & (T > horizon_days))
     censored_event_horizon = (Y == 1) & (T > horizon_days)
 
-    X_horizon = X[event_horizon]
-    X_horizon_cens = X[censored_event_horizon]
+    if isinstance(X, DataSource):
+        X_horizon = X.subset(
+            np.concatenate(
+                [np.flatnonzero(event_horizon), np.flatnonzero(censored_event_horizon)]
+            )
+        )
+    else:
+        X = X.reset_index(drop=True)
+        X_horizon = pd.concat(
+            [X[event_horizon], X[censored_event_horizon]], ignore_index=True
+        )
 
     Y_horizon = Y[event_horizon]
     Y_horizon_cens = 1 - Y[censored_event_horizon]
@@ -44,7 +58,7 @@ def generate_dataset_for_horizon(
     T_horizon_cens = T[censored_event_horizon]
 
     return (
-        pd.concat([X_horizon, X_horizon_cens], ignore_index=True),
+        X_horizon,
         pd.concat([T_horizon, T_horizon_cens], ignore_index=True),
         pd.concat([Y_horizon, Y_horizon_cens], ignore_index=True),
     )
@@ -1,35 +1,47 @@
 # stdlib
+import copy
+import hashlib
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 # third party
 import cloudpickle
+import numpy as np
 import pandas as pd
 
+# autoprognosis absolute
+import autoprognosis.utils.profiling as profiling
+
+HASH_SAMPLE_BLOCKS = 32
+
 
 def save(model: Any) -> bytes:
-    return cloudpickle.dumps(model)
+    with profiling.stage("serialization"):
+        return cloudpickle.dumps(model)
 
 
 def load(buff: bytes) -> Any:
-    return cloudpickle.loads(buff)
+    with profiling.stage("serialization"):
+        return cloudpickle.loads(buff)
 
 
 def save_model(model: Any) -> bytes:
-    return cloudpickle.dumps(model)
+    with profiling.stage("serialization"):
+        return cloudpickle.dumps(model)
 
 
 def load_model(buff: bytes) -> Any:
-    return cloudpickle.loads(buff)
+    with profiling.stage("serialization"):
+        return cloudpickle.loads(buff)
 
 
 def save_to_file(path: Union[str, Path], model: Any) -> Any:
-    with open(path, "wb") as f:
+    with open(path, "wb") as f, profiling.stage("serialization"):
         return cloudpickle.dump(model, f)
 
 
 def load_from_file(path: Union[str, Path]) -> Any:
-    with open(path, "rb") as f:
+    with open(path, "rb") as f, profiling.stage("serialization"):
         return cloudpickle.load(f)
 
 
@@ -41,8 +53,65 @@ def load_model_from_file(path: Union[str, Path]) -> Any:
     return load_from_file(path)
 
 
-def dataframe_hash(df: pd.DataFrame) -> str:
-    """Dataframe hashing, used for caching/backups"""
-    df.columns = df.columns.astype(str)
-    cols = sorted(list(df.columns))
-    return str(abs(pd.util.hash_pandas_object(df[cols].fillna(0)).sum()))
+def clone_model(model: Any) -> Any:
+    """Copy of a model, to be fitted independently.
+
+    Unfitted models implementing `clone()` are rebuilt from their parameters. The fitted models, and the models without `clone()`, are deep-copied.
+    """
+    if hasattr(model, "clone"):
+        try:
+            fitted = model.is_fitted()
+        except BaseException:
+            fitted = True
+
+        if not fitted:
+            return model.clone()
+
+    return copy.deepcopy(model)
+
+
+def _sample_rows(n_rows: int, sample_size: int) -> np.ndarray:
+    """Evenly spaced blocks of consecutive rows, `sample_size` rows in total, including the first and the last rows."""
+    block_size = max(1, sample_size // HASH_SAMPLE_BLOCKS)
+    n_blocks = max(2, sample_size // block_size)
+    starts = np.linspace(0, n_rows - block_size, n_blocks).astype(int)
+
+    return np.unique((starts[:, None] + np.arange(block_size)).ravel())
+
+
+def dataframe_hash(df: pd.DataFrame, sample_size: Optional[int] = None) -> str:
+    """Dataframe hashing, used for caching/backups.
+
+    The hash covers the shape, the index, the column names and dtypes, and the values, and does not depend on the order of the columns. The columns are hashed one at a time, so the dataframe is neither copied nor modified: the numeric columns from their raw bytes, the others from their `pd.util.hash_pandas_object` row hashes.
+
+    Args:
+        df: pd.DataFrame
+            The dataframe to hash.
+        sample_size: Optional int
+            If set, and the dataframe has more rows, only `sample_size` rows are hashed, in evenly spaced blocks. This bounds the cost of hashing very large dataframes, but changes outside of the sampled blocks are not detected.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(df.shape).encode())
+
+    rows = None
+    if sample_size is not None and len(df) > sample_size:
+        rows = _sample_rows(len(df), sample_size)
+
+    index = df.index if rows is None else df.index[rows]
+    digest.update(pd.util.hash_pandas_object(index).to_numpy().tobytes())
+
+    order = sorted(range(df.shape[1]), key=lambda pos: (str(df.columns[pos]), pos))
+    for pos in order:
+        column = df.iloc[:, pos]
+        if rows is not None:
+            column = column.iloc[rows]
+
+        digest.update(f"{df.columns[pos]}:{column.dtype}".encode())
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biufcmM":
+            digest.update(np.ascontiguousarray(column.to_numpy()).view(np.uint8))
+        else:
+            digest.update(
+                pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes()
+            )
+
+    return digest.hexdigest()
@@ -0,0 +1,247 @@
+# stdlib
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, Generator, List, Tuple
+import uuid
+
+# third party
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+
+# Smaller values are pickled with the tasks, as before.
+SHARE_MIN_BYTES = 2**20
+
+
+def shared_folder() -> Path:
+    """Folder of the broadcast datasets. Set by `SHARED_DATA_FOLDER`, defaults to /dev/shm, in memory, when available, otherwise to the temporary folder."""
+    folder = os.environ.get("SHARED_DATA_FOLDER")
+    if folder is not None:
+        return Path(folder)
+
+    if os.access("/dev/shm", os.W_OK):
+        return Path("/dev/shm")
+
+    return Path(tempfile.gettempdir())
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def sweep_stale_folders() -> None:
+    """Remove the folders of `shared_folder()` left by dead processes, e.g. killed by the OOM killer before their cleanup. The folders are tagged with the ID of the process which created them, see `shared_root`."""
+    try:
+        paths = list(shared_folder().glob("autoprognosis_*_*"))
+    except OSError:
+        return
+
+    for path in paths:
+        try:
+            pid = int(path.name.split("_")[1])
+        except ValueError:
+            continue
+
+        if pid != os.getpid() and not _pid_alive(pid):
+            log.info(f"removing the stale shared folder {path}")
+            shutil.rmtree(path, ignore_errors=True)
+
+
+@contextmanager
+def shared_root() -> Generator[Path, None, None]:
+    """A new folder path in `shared_folder()`, removed on exit. The stale folders of the dead processes are removed first."""
+    sweep_stale_folders()
+
+    root = shared_folder() / f"autoprognosis_{os.getpid()}_{uuid.uuid4().hex}"
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _mappable(dtype: Any) -> bool:
+    return isinstance(dtype, np.dtype) and dtype.kind in "biufc"
+
+
+def _load(path: Path) -> np.ndarray:
+    # Copy-on-write: the pages are shared until a worker writes to them.
+    return np.load(path, mmap_mode="c")
+
+
+class SharedData:
+    """Handle of a DataFrame, Series or array published by `broadcast`. The handle pickles to a few bytes, and `attach` maps the value back from the shared files, without copy.
+
+    Args:
+        path: Path
+            The folder of the value.
+        kind: str
+            "frame", "series" or "array".
+        meta: dict
+            What rebuilds the value around the shared arrays: the columns, the index, the name and the columns which are not shared.
+    """
+
+    def __init__(self, path: Path, kind: str, meta: dict) -> None:
+        self.path = path
+        self.kind = kind
+        self.meta = meta
+
+    @staticmethod
+    def _publish_index(path: Path, index: pd.Index) -> Any:
+        if isinstance(index, pd.RangeIndex) or not _mappable(index.dtype):
+            return index
+
+        np.save(path / "index.npy", np.asarray(index))
+        return None
+
+    def _attach_index(self) -> pd.Index:
+        if self.meta["index"] is not None:
+            return self.meta["index"]
+
+        return pd.Index(_load(self.path / "index.npy"), copy=False)
+
+    @classmethod
+    def publish(cls, value: Any, path: Path) -> "SharedData":
+        """Write `value` to the folder `path`, which must not exist."""
+        path.mkdir(parents=True)
+
+        if isinstance(value, np.ndarray):
+            np.save(path / "values.npy", value)
+            return cls(path, "array", {})
+
+        if isinstance(value, pd.Series):
+            np.save(path / "values.npy", value.to_numpy())
+            meta = {
+                "name": value.name,
+                "index": cls._publish_index(path, value.index),
+            }
+            return cls(path, "series", meta)
+
+        # The columns are stored by dtype, as the blocks of a DataFrame, with one row per column.
+        blocks: dict = {}
+        for pos, dtype in enumerate(value.dtypes):
+            if _mappable(dtype):
+                blocks.setdefault(dtype, []).append(pos)
+
+        shared = {pos for positions in blocks.values() for pos in positions}
+        others = [pos for pos in range(value.shape[1]) if pos not in shared]
+        for idx, positions in enumerate(blocks.values()):
+            values = value.iloc[:, positions].to_numpy().T
+            np.save(path / f"block_{idx}.npy", np.ascontiguousarray(values))
+
+        meta = {
+            "columns": value.columns,
+            "blocks": list(blocks.values()),
+            "others": value.iloc[:, others],
+            "index": cls._publish_index(path, value.index),
+        }
+        return cls(path, "frame", meta)
+
+    def attach(self) -> Any:
+        """The published value, memory-mapped."""
+        if self.kind == "array":
+            return _load(self.path / "values.npy")
+
+        index = self._attach_index()
+        if self.kind == "series":
+            return pd.Series(
+                _load(self.path / "values.npy"),
+                index=index,
+                name=self.meta["name"],
+                copy=False,
+            )
+
+        columns = self.meta["columns"]
+        parts: List[pd.DataFrame] = []
+        for idx, positions in enumerate(self.meta["blocks"]):
+            values = _load(self.path / f"block_{idx}.npy")
+            parts.append(
+                pd.DataFrame(
+                    values.T, columns=columns[positions], index=index, copy=False
+                )
+            )
+
+        others = self.meta["others"]
+        if others.shape[1] > 0:
+            parts.append(others.set_axis(index, axis=0))
+
+        if len(parts) == 1:
+            result = parts[0]
+        else:
+            result = pd.concat(parts, axis=1, copy=False)
+
+        # Restoring the order of mixed columns copies the data.
+        order = [pos for positions in self.meta["blocks"] for pos in positions]
+        shared = set(order)
+        order += [pos for pos in range(len(columns)) if pos not in shared]
+        if order != list(range(len(columns))):
+            result = result.iloc[:, np.argsort(order)]
+
+        return result
+
+
+def _shareable(value: Any) -> bool:
+    if isinstance(value, np.ndarray):
+        return _mappable(value.dtype) and value.nbytes >= SHARE_MIN_BYTES
+    if isinstance(value, pd.Series):
+        return _mappable(value.dtype) and value.nbytes >= SHARE_MIN_BYTES
+    if isinstance(value, pd.DataFrame):
+        mappable = [_mappable(dtype) for dtype in value.dtypes]
+        return value.memory_usage(index=False)[mappable].sum() >= SHARE_MIN_BYTES
+
+    return False
+
+
+@contextmanager
+def broadcast(*values: Any, enabled: bool = True) -> Generator[Tuple, None, None]:
+    """Publish the search data once, for the workers.
+
+    The large DataFrames, Series and arrays are written to memory-mapped `.npy` files in `shared_folder()`, and replaced by their `SharedData` handles. The tasks pickle the handles instead of the data, and the workers call `attach` to map the data, sharing the page cache. The files are removed on exit, or by the next search if the process is killed(see `shared_root`).
+
+    Example:
+        >>> with broadcast(X, Y) as (X_shared, Y_shared):
+        >>>     dispatcher(delayed(search)(estimator, X_shared, Y_shared) for estimator in estimators)
+
+    Args:
+        values:
+            The values to publish. The other types, and the small values, are returned as is.
+        enabled: bool
+            Publish the values. Otherwise, they are returned as is, e.g. for a single worker.
+    """
+    if not enabled or not any(_shareable(value) for value in values):
+        yield values
+        return
+
+    with shared_root() as root:
+        try:
+            handles = tuple(
+                SharedData.publish(value, root / str(idx))
+                if _shareable(value)
+                else value
+                for idx, value in enumerate(values)
+            )
+        except OSError as e:
+            log.warning(f"failed to publish the search data in {root}: {e}")
+            shutil.rmtree(root, ignore_errors=True)
+            handles = values
+
+        yield handles
+
+
+def attach(value: Any) -> Any:
+    """The value behind a `SharedData` handle, or `value` itself."""
+    if isinstance(value, SharedData):
+        return value.attach()
+
+    return value
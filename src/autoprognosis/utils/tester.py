@@ -1,6 +1,5 @@
 # stdlib
-import copy
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 # third party
 import numpy as np
@@ -28,6 +27,7 @@ from sklearn.preprocessing import LabelEncoder
 
 # autoprognosis absolute
 import autoprognosis.logger as log
+from autoprognosis.utils.data_source import DataSource
 from autoprognosis.utils.distributions import enable_reproducible_results
 from autoprognosis.utils.metrics import (
     evaluate_auc,
@@ -36,7 +36,9 @@ from autoprognosis.utils.metrics import (
     generate_score,
     print_score,
 )
+import autoprognosis.utils.profiling as profiling
 from autoprognosis.utils.risk_estimation import generate_dataset_for_horizon
+import autoprognosis.utils.serialization as serialization
 
 clf_supported_metrics = [
     "aucroc",
@@ -182,6 +184,7 @@ def evaluate_estimator(
     seed: int = 0,
     pretrained: bool = False,
     group_ids: Optional[pd.Series] = None,
+    fold_callback: Optional[Callable] = None,
     *args: Any,
     **kwargs: Any,
 ) -> Dict:
@@ -202,6 +205,8 @@ def evaluate_estimator(
             If the estimator was already trained or not.
         group_ids: pd.Series
             The group_ids to use for stratified cross-validation
+        fold_callback: Callable
+            Optional callback, called as `fold_callback(fold, scores)` after each fold with the metrics of that fold. An exception raised by the callback stops the evaluation.
 
     Returns:
         Dict containing "raw" and "str" nodes. The "str" node contains prettified metrics, while the raw metrics includes tuples of form (`mean`, `std`) for each metric.
@@ -257,15 +262,19 @@ def evaluate_estimator(
         if pretrained:
             model = estimator[indx]
         else:
-            model = copy.deepcopy(estimator)
+            model = serialization.clone_model(estimator)
             model.fit(X_train, Y_train)
 
         preds = model.predict_proba(X_test)
 
-        scores = evaluator.score_proba(Y_test, preds)
+        with profiling.stage("metrics"):
+            scores = evaluator.score_proba(Y_test, preds)
         for metric in scores:
             results[metric][indx] = scores[metric]
 
+        if fold_callback is not None:
+            fold_callback(indx, scores)
+
         indx += 1
 
     output_clf = {}
@@ -366,7 +375,7 @@ def evaluate_estimator_multiple_seeds(
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
 def evaluate_survival_estimator(
     estimator: Any,
-    X: Union[pd.DataFrame, np.ndarray],
+    X: Union[pd.DataFrame, np.ndarray, DataSource],
     T: Union[pd.Series, np.ndarray, List],
     Y: Union[pd.Series, np.ndarray, List],
     time_horizons: Union[List[float], np.ndarray],
@@ -375,14 +384,15 @@ def evaluate_survival_estimator(
     pretrained: bool = False,
     risk_threshold: float = 0.5,
     group_ids: Optional[pd.Series] = None,
+    fold_callback: Optional[Callable] = None,
 ) -> Dict:
     """Helper for evaluating survival analysis tasks.
 
     Args:
         estimator:
             Baseline model to evaluate. if pretrained == False, it must not be fitted.
-        X: DataFrame or np.ndarray
-            The covariates
+        X: DataFrame or np.ndarray or DataSource
+            The covariates. The folds of a DataSource are views of its rows, for the estimators which train from a DataSource.
         T: Series or np.ndarray or list
             time to event/censoring values
         Y: Series or np.ndarray or list
@@ -397,6 +407,8 @@ def evaluate_survival_estimator(
             If the estimator was trained or not
         group_ids:
             Group labels for the samples used while splitting the dataset into train/test set.
+        fold_callback: Callable
+            Optional callback, called as `fold_callback(fold, scores)` after the survival metrics of each fold, with the "c_index" and "brier_score" of that fold averaged over the horizons. An exception raised by the callback stops the evaluation.
 
     Returns:
         Dict containing "raw", "str" and "horizons" nodes. The "str" node contains prettified metrics, while the raw metrics includes tuples of form (`mean`, `std`) for each metric. The "horizons" node splits the metrics by horizon.
@@ -414,7 +426,8 @@ def evaluate_survival_estimator(
         raise ValueError("n_folds must be >= 2")
     enable_reproducible_results(seed)
 
-    X = pd.DataFrame(X).reset_index(drop=True)
+    if not isinstance(X, DataSource):
+        X = pd.DataFrame(X).reset_index(drop=True)
     Y = pd.Series(Y).reset_index(drop=True)
     T = pd.Series(T).reset_index(drop=True)
     if group_ids is not None:
@@ -442,11 +455,12 @@ def evaluate_survival_estimator(
         if pretrained:
             model = estimator[cv_idx]
         else:
-            model = copy.deepcopy(estimator)
+            model = serialization.clone_model(estimator)
 
-            constant_cols = _constant_columns(X_train)
-            X_train = X_train.drop(columns=constant_cols)
-            X_test = X_test.drop(columns=constant_cols)
+            if not isinstance(X_train, DataSource):
+                constant_cols = _constant_columns(X_train)
+                X_train = X_train.drop(columns=constant_cols)
+                X_test = X_test.drop(columns=constant_cols)
 
             model.fit(X_train, T_train, Y_train)
 
@@ -455,18 +469,19 @@ def evaluate_survival_estimator(
         c_index = []
         brier_score = []
 
-        for k in range(len(time_horizons)):
-            eval_horizon = min(time_horizons[k], np.max(T_test) - 1)
-            c_index.append(
-                evaluate_c_index(
-                    T_train, Y_train, pred[:, k], T_test, Y_test, eval_horizon
+        with profiling.stage("metrics"):
+            for k in range(len(time_horizons)):
+                eval_horizon = min(time_horizons[k], np.max(T_test) - 1)
+                c_index.append(
+                    evaluate_c_index(
+                        T_train, Y_train, pred[:, k], T_test, Y_test, eval_horizon
+                    )
                 )
-            )
-            brier_score.append(
-                evaluate_brier_score(
-                    T_train, Y_train, pred[:, k], T_test, Y_test, eval_horizon
+                brier_score.append(
+                    evaluate_brier_score(
+                        T_train, Y_train, pred[:, k], T_test, Y_test, eval_horizon
+                    )
                 )
-            )
 
         return {
             "c_index": c_index,
@@ -489,11 +504,12 @@ def evaluate_survival_estimator(
         if pretrained:
             model = estimator[cv_idx]
         else:
-            model = copy.deepcopy(estimator)
+            model = serialization.clone_model(estimator)
 
-            constant_cols = _constant_columns(X_train)
-            X_train = X_train.drop(columns=constant_cols)
-            X_test = X_test.drop(columns=constant_cols)
+            if not isinstance(X_train, DataSource):
+                constant_cols = _constant_columns(X_train)
+                X_train = X_train.drop(columns=constant_cols)
+                X_test = X_test.drop(columns=constant_cols)
 
             model.fit(X_train, T_train, Y_train)
 
@@ -502,18 +518,23 @@ def evaluate_survival_estimator(
         local_scores = pd.DataFrame(pred[:, hidx]).squeeze()
         local_preds = (local_scores > risk_threshold).astype(int)
 
-        output = {
-            "aucroc": roc_auc_score(Y_test, local_scores),
-            "specificity": recall_score(
-                Y_test, local_preds, pos_label=0, zero_division=0
-            ),
-            "sensitivity": recall_score(
-                Y_test, local_preds, pos_label=1, zero_division=0
-            ),
-            "PPV": precision_score(Y_test, local_preds, pos_label=1, zero_division=0),
-            "NPV": precision_score(Y_test, local_preds, pos_label=0, zero_division=0),
-            "predicted_cases": local_preds.sum(),
-        }
+        with profiling.stage("metrics"):
+            output = {
+                "aucroc": roc_auc_score(Y_test, local_scores),
+                "specificity": recall_score(
+                    Y_test, local_preds, pos_label=0, zero_division=0
+                ),
+                "sensitivity": recall_score(
+                    Y_test, local_preds, pos_label=1, zero_division=0
+                ),
+                "PPV": precision_score(
+                    Y_test, local_preds, pos_label=1, zero_division=0
+                ),
+                "NPV": precision_score(
+                    Y_test, local_preds, pos_label=0, zero_division=0
+                ),
+                "predicted_cases": local_preds.sum(),
+            }
         return output
 
     if group_ids is not None:
@@ -522,14 +543,15 @@ def evaluate_survival_estimator(
         skf = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
 
     cv_idx = 0
-    for train_index, test_index in skf.split(X, Y, groups=group_ids):
+    # The splits only depend on the labels, and index the rows by position.
+    for train_index, test_index in skf.split(np.zeros(len(Y)), Y, groups=group_ids):
 
-        X_train = X.loc[X.index[train_index]]
-        Y_train = Y.loc[Y.index[train_index]]
-        T_train = T.loc[T.index[train_index]]
-        X_test = X.loc[X.index[test_index]]
-        Y_test = Y.loc[Y.index[test_index]]
-        T_test = T.loc[T.index[test_index]]
+        X_train = _take_rows(X, train_index)
+        Y_train = Y.iloc[train_index]
+        T_train = T.iloc[train_index]
+        X_test = _take_rows(X, test_index)
+        Y_test = Y.iloc[test_index]
+        T_test = T.iloc[test_index]
 
         local_time_horizons = [t for t in time_horizons if t > np.min(T_test)]
 
@@ -547,6 +569,15 @@ def evaluate_survival_estimator(
             for hidx, horizon in enumerate(local_time_horizons):
                 results[metric][horizon][cv_idx] = local_surv_metrics[metric][hidx]
 
+        if fold_callback is not None and len(local_time_horizons) > 0:
+            fold_callback(
+                cv_idx,
+                {
+                    metric: np.mean(local_surv_metrics[metric])
+                    for metric in local_surv_metrics
+                },
+            )
+
         cv_idx += 1
 
     for k in range(len(time_horizons)):
@@ -556,15 +587,15 @@ def evaluate_survival_estimator(
             X, T, Y, time_horizons[k]
         )
         for train_index, test_index in skf.split(
-            X_horizon, Y_horizon, groups=group_ids
+            np.zeros(len(Y_horizon)), Y_horizon, groups=group_ids
         ):
 
-            X_train = X_horizon.loc[X_horizon.index[train_index]]
-            Y_train = Y_horizon.loc[Y_horizon.index[train_index]]
-            T_train = T_horizon.loc[T_horizon.index[train_index]]
-            X_test = X_horizon.loc[X_horizon.index[test_index]]
-            Y_test = Y_horizon.loc[Y_horizon.index[test_index]]
-            T_test = T_horizon.loc[T_horizon.index[test_index]]
+            X_train = _take_rows(X_horizon, train_index)
+            Y_train = Y_horizon.iloc[train_index]
+            T_train = T_horizon.iloc[train_index]
+            X_test = _take_rows(X_horizon, test_index)
+            Y_test = Y_horizon.iloc[test_index]
+            T_test = T_horizon.iloc[test_index]
 
             clf_metrics = _get_clf_metrics(
                 cv_idx,
@@ -698,6 +729,7 @@ def evaluate_regression(
     seed: int = 0,
     pretrained: bool = False,
     group_ids: Optional[pd.Series] = None,
+    fold_callback: Optional[Callable] = None,
     *args: Any,
     **kwargs: Any,
 ) -> Dict:
@@ -716,6 +748,8 @@ def evaluate_regression(
             Random seed
         group_ids: pd.Series
             Optional group_ids for stratified cross-validation
+        fold_callback: Callable
+            Optional callback, called as `fold_callback(fold, scores)` after each fold with the metrics of that fold. An exception raised by the callback stops the evaluation.
 
     Returns:
         Dict containing "raw" and "str" nodes. The "str" node contains prettified metrics, while the raw metrics includes tuples of form (`mean`, `std`) for each metric.
@@ -757,14 +791,18 @@ def evaluate_regression(
         if pretrained:
             model = estimator[indx]
         else:
-            model = copy.deepcopy(estimator)
+            model = serialization.clone_model(estimator)
             model.fit(X_train, Y_train)
 
         preds = model.predict(X_test)
 
-        metrics_["mse"][indx] = mean_squared_error(Y_test, preds)
-        metrics_["mae"][indx] = mean_absolute_error(Y_test, preds)
-        metrics_["r2"][indx] = r2_score(Y_test, preds)
+        with profiling.stage("metrics"):
+            metrics_["mse"][indx] = mean_squared_error(Y_test, preds)
+            metrics_["mae"][indx] = mean_absolute_error(Y_test, preds)
+            metrics_["r2"][indx] = r2_score(Y_test, preds)
+
+        if fold_callback is not None:
+            fold_callback(indx, {metric: metrics_[metric][indx] for metric in metrics})
 
         indx += 1
 
@@ -861,12 +899,24 @@ def score_classification_model(
     y_train: pd.DataFrame,
     y_test: pd.DataFrame,
 ) -> float:
-    model = copy.deepcopy(estimator)
+    model = serialization.clone_model(estimator)
     model.fit(X_train, y_train)
 
     return model.score(X_test, y_test)
 
 
+def _take_rows(
+    X: Union[pd.DataFrame, DataSource], indices: np.ndarray
+) -> Union[pd.DataFrame, DataSource]:
+    """
+    The rows of X at the positions `indices`. A DataSource is not read, the result is a view.
+    """
+    if isinstance(X, DataSource):
+        return X.subset(indices)
+
+    return X.iloc[indices]
+
+
 def _constant_columns(dataframe: pd.DataFrame) -> list:
     """
     Drops constant value columns of pandas dataframe.
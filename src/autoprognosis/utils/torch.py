@@ -1,7 +1,19 @@
+# stdlib
+from contextlib import contextmanager
+import math
+from typing import Any, Callable, Iterator, Optional, Tuple
+
 # third party
 import numpy as np
 import torch
 
+# autoprognosis absolute
+from autoprognosis.utils.data_source import DataSource
+from autoprognosis.utils.parallel import active_thread_budget
+
+# Batch size of the predictions, the default of torchtuples.
+PREDICT_BATCH_SIZE = 8224
+
 
 def one_hot_encoder(arr: np.ndarray) -> torch.Tensor:
     arr = np.asarray(arr)
@@ -9,3 +21,115 @@ def one_hot_encoder(arr: np.ndarray) -> torch.Tensor:
 
     result = np.eye(n_values)[arr]
     return torch.from_numpy(result).long()
+
+
+class DataSourceLoader:
+    """Mini-batch loader over the rows of a `DataSource`, reading only one batch at a time. Each iteration is an epoch, and yields `(X, targets(indices))` for each batch, with `X` the float32 tensor of the rows and `indices` their positions in the source.
+
+    Args:
+        source: DataSource
+            The covariates.
+        targets: Callable
+            The targets of the rows at the given positions.
+        batch_size: int
+            Batch size
+        shuffle: bool
+            Shuffle the rows for each epoch, see `DataSource.batches`.
+        random_state: int
+            Random seed
+    """
+
+    def __init__(
+        self,
+        source: DataSource,
+        targets: Callable[[np.ndarray], Any],
+        batch_size: int,
+        shuffle: bool = False,
+        random_state: int = 0,
+    ) -> None:
+        self.source = source
+        self.targets = targets
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(random_state)
+
+    def __len__(self) -> int:
+        return math.ceil(len(self.source) / self.batch_size)
+
+    @property
+    def dataset(self) -> "DataSourceLoader":
+        """The loader itself: torchtuples reads `dataloader.dataset[:2]` for the shapes of the inputs."""
+        return self
+
+    def __getitem__(self, index: Any) -> Tuple[torch.Tensor, Any]:
+        """The batch of the rows `index`, a position or a slice."""
+        indices = np.atleast_1d(np.arange(len(self.source))[index])
+        return torch.from_numpy(self.source.take(indices)), self.targets(indices)
+
+    def __iter__(self) -> Iterator[Tuple[torch.Tensor, Any]]:
+        for indices in self.source.batches(
+            self.batch_size, shuffle=self.shuffle, random_state=self.rng
+        ):
+            X = torch.from_numpy(self.source.take(indices))
+            yield X, self.targets(indices)
+
+
+class TensorBatchLoader:
+    """Mini-batch loader over some rows of tensors already on the device. The tensors are not copied: each batch is gathered from them by index. Each iteration is an epoch, and yields `(X, y)` for each batch.
+
+    Args:
+        X: torch.Tensor
+            The covariates.
+        y: torch.Tensor
+            The targets.
+        indices: torch.Tensor
+            The positions of the rows to load.
+        batch_size: int
+            Batch size
+        shuffle: bool
+            Shuffle the rows for each epoch.
+    """
+
+    def __init__(
+        self,
+        X: torch.Tensor,
+        y: torch.Tensor,
+        indices: torch.Tensor,
+        batch_size: int,
+        shuffle: bool = False,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError(f"invalid batch_size {batch_size}")
+
+        self.X = X
+        self.y = y
+        self.indices = indices.to(X.device)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+
+    def __len__(self) -> int:
+        return math.ceil(len(self.indices) / self.batch_size)
+
+    def __iter__(self) -> Iterator[Tuple[torch.Tensor, torch.Tensor]]:
+        indices = self.indices
+        if self.shuffle:
+            indices = indices[torch.randperm(len(indices), device=indices.device)]
+
+        for start in range(0, len(indices), self.batch_size):
+            batch = indices[start : start + self.batch_size]
+            yield self.X[batch], self.y[batch]
+
+
+@contextmanager
+def num_threads(n_threads: Optional[int]) -> Iterator[None]:
+    """Run the block with `n_threads` torch intra-op threads, then restore the previous number. The setting is process-wide, so it is only meant for the fit. Does nothing if `n_threads` is None, or within a thread budget, which already sets the torch threads(see `thread_budget`)."""
+    if n_threads is None or active_thread_budget() is not None:
+        yield
+        return
+
+    previous = torch.get_num_threads()
+    torch.set_num_threads(n_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
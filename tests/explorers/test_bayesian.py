@@ -0,0 +1,104 @@
+# third party
+import numpy as np
+import optuna
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.explorers.core.optimizers.bayesian import (
+    BayesianOptimizer,
+    ParamRepeatPruner,
+    report_intermediate_score,
+)
+import autoprognosis.plugins.core.params as params
+
+
+def test_pruned_trials_are_seen_but_not_scored() -> None:
+    study = optuna.create_study(direction="maximize")
+
+    def objective(trial: optuna.Trial) -> float:
+        trial.suggest_int("x", 0, 10)
+        raise optuna.exceptions.TrialPruned()
+
+    study.enqueue_trial({"x": 3})
+    study.optimize(objective, n_trials=1)
+
+    pruner = ParamRepeatPruner(study, patience=10)
+
+    assert params.config_key({"x": 3}) in pruner.seen
+    assert pruner.best_score == -1
+    assert pruner.no_improvement_for == 0
+
+    pruner.report_pruned()
+    assert pruner.no_improvement_for == 1
+
+
+def test_repeats_are_quantized() -> None:
+    space = [params.Float("x", 0, 1), params.Categorical("y", ["a", "b"])]
+    study = optuna.create_study(direction="maximize")
+    study.enqueue_trial({"x": 0.5, "y": "a"})
+
+    def objective(trial: optuna.Trial) -> float:
+        trial.suggest_categorical("y", ["a", "b"])
+        return trial.suggest_float("x", 0, 1)
+
+    study.optimize(objective, n_trials=1)
+
+    pruner = ParamRepeatPruner(study, patience=10, space=space)
+
+    assert params.config_key({"y": "a", "x": 0.50001}, space) in pruner.seen
+    assert params.config_key({"x": 0.51, "y": "a"}, space) not in pruner.seen
+    assert params.config_key({"x": 0.5, "y": "b"}, space) not in pruner.seen
+
+
+def test_categorical_values_are_canonical() -> None:
+    param = params.Categorical("layers", [(1, 2), (2, 1)])
+
+    assert param.canonical([1, 2]) == param.canonical((1, 2))
+    assert param.canonical(np.array([1, 2])) == param.canonical((1, 2))
+    assert param.canonical((2, 1)) != param.canonical((1, 2))
+    assert param.canonical((3, 3)) == (3, 3)
+
+    param = params.Categorical("solver", ["auto", "lbfgs"])
+    assert param.canonical(np.str_("auto")) == param.canonical("auto")
+
+
+def test_wide_float_ranges_are_quantized_in_log_scale() -> None:
+    param = params.Float("l2_leaf_reg", 1e-4, 1e3)
+
+    assert param.canonical(1e-4) != param.canonical(2e-4)
+    assert param.canonical(1e-3) != param.canonical(5e-3)
+    assert param.canonical(100) == param.canonical(100.5)
+    assert param.canonical(100) != param.canonical(110)
+
+
+def test_report_intermediate_score() -> None:
+    study = optuna.create_study(
+        direction="maximize",
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=1, n_warmup_steps=0),
+    )
+
+    def objective(trial: optuna.Trial) -> float:
+        x = trial.suggest_float("x", 0, 1)
+        for fold in range(3):
+            report_intermediate_score(trial, x, fold)
+        return x
+
+    study.enqueue_trial({"x": 0.9})
+    study.enqueue_trial({"x": 0.1})
+    study.optimize(objective, n_trials=2)
+
+    states = [trial.state for trial in study.trials]
+    assert states == [
+        optuna.trial.TrialState.COMPLETE,
+        optuna.trial.TrialState.PRUNED,
+    ]
+
+    # No trial, no reporting.
+    report_intermediate_score(None, 0.5, 0)
+
+
+def test_invalid_fold_pruner() -> None:
+    with pytest.raises(ValueError):
+        BayesianOptimizer(
+            study_name="test", evaluation_cbk=lambda: 0, fold_pruner="invalid"
+        )
@@ -54,6 +54,18 @@ def test_fails() -> None:
     with pytest.raises(ValueError):
         ClassifierSeeker(study_name="test_classifiers", metric="invalid")
 
+    with pytest.raises(ValueError):
+        ClassifierSeeker(
+            study_name="test_classifiers", optimizer_type="hyperband", time_budget=60
+        )
+
+    with pytest.raises(ValueError):
+        ClassifierSeeker(
+            study_name="test_classifiers",
+            optimizer_type="hyperband",
+            progressive_search=True,
+        )
+
 
 @pytest.mark.skipif(sys.platform == "darwin", reason="slow")
 @pytest.mark.parametrize(
@@ -100,6 +112,29 @@ def test_search_clf(optimizer_type: str, group_id: Optional[bool], metric: str)
         assert evaluate_auc(Y, y_pred_proba)[0] > 0.9
 
 
+def test_search_progressive() -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+
+    seeker = ClassifierSeeker(
+        study_name="test_classifiers_progressive",
+        num_iter=5,
+        top_k=1,
+        classifiers=["logistic_regression"],
+        progressive_search=True,
+        min_search_sample_size=100,
+        sample_growth_rate=2,
+        strict=True,
+    )
+    best_models = seeker.search(X, Y)
+
+    assert len(best_models) == 1
+
+    model = best_models[0]
+    model.fit(X, Y)
+
+    assert evaluate_auc(Y, model.predict_proba(X))[0] > 0.9
+
+
 @pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband"])
 def test_hooks(optimizer_type: str) -> None:
     hook = MockHook()
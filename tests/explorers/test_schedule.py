@@ -0,0 +1,47 @@
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.explorers.core.schedule import DataSchedule
+
+
+def test_schedule_sizes() -> None:
+    Y = pd.Series(np.random.randint(0, 2, 1000))
+
+    schedule = DataSchedule(Y, min_size=50, eta=3)
+
+    assert schedule.sizes == [50, 150, 450, 1000]
+    assert len(schedule) == 4
+    assert (schedule.subset() == np.arange(1000)).all()
+    assert (schedule.subset(3) == np.arange(1000)).all()
+
+    assert len(DataSchedule(Y, min_size=5000)) == 1
+
+
+def test_schedule_nested_and_stratified() -> None:
+    Y = pd.Series([0] * 900 + [1] * 100)
+
+    schedule = DataSchedule(Y, min_size=100, eta=3, random_state=1)
+
+    prev: set = set()
+    for rung, size in enumerate(schedule.sizes[:-1]):
+        rows = schedule.subset(rung)
+
+        assert len(rows) == size
+        assert (np.diff(rows) > 0).all()
+        assert prev.issubset(set(rows))
+        assert abs(Y.iloc[rows].mean() - 0.1) <= 1 / size + 1e-8
+
+        prev = set(rows)
+
+
+def test_schedule_fails() -> None:
+    Y = pd.Series([0, 1] * 10)
+
+    with pytest.raises(ValueError):
+        DataSchedule(Y, min_size=0)
+
+    with pytest.raises(ValueError):
+        DataSchedule(Y, eta=1)
@@ -0,0 +1,87 @@
+# stdlib
+import time
+from typing import List
+
+# third party
+from joblib import delayed
+
+# autoprognosis absolute
+from autoprognosis.explorers.core.scheduler import (
+    BudgetScheduler,
+    EstimatorSearchState,
+    budgeted_search,
+)
+from autoprognosis.hooks import DefaultHooks
+from autoprognosis.utils.parallel import MemoryAwareDispatcher
+
+
+def _state(scores: List[float], finished: bool = False) -> EstimatorSearchState:
+    state = EstimatorSearchState()
+    state.update(scores, [{}] * len(scores), [], finished, duration=1)
+    return state
+
+
+def test_scheduler_allocation() -> None:
+    scheduler = BudgetScheduler(
+        ["fast", "slow", "done"], budget=100, n_workers=2, slice_duration=10
+    )
+
+    # The estimators never searched come first.
+    assert list(scheduler.allocate().keys()) == [0, 1]
+
+    scheduler.update(0, _state([0.5, 0.9]))
+    scheduler.update(1, _state([0.5, 0.5]))
+    scheduler.update(2, _state([0.5], finished=True))
+
+    slices = scheduler.allocate()
+    assert list(slices.keys()) == [0, 1]
+    assert all(duration <= 10 for duration in slices.values())
+
+    assert list(scheduler.allocate(running=[0]).keys()) == [1]
+    assert scheduler.allocation()["retired"] == ["done"]
+    assert not scheduler.done()
+
+
+def test_budgeted_search() -> None:
+    scheduler = BudgetScheduler(["a", "b"], budget=100, n_workers=1)
+
+    def search(idx: int, state: EstimatorSearchState) -> EstimatorSearchState:
+        state.update([0.5, 0.5 + idx / 10], [{}, {"x": idx}], [], True, duration=1)
+        return state
+
+    states = budgeted_search(
+        scheduler,
+        lambda idx, state, duration: delayed(search)(idx, state),
+        dispatcher=MemoryAwareDispatcher(n_jobs=1, backend="threading"),
+        hooks=DefaultHooks(),
+        topic="test",
+    )
+
+    assert scheduler.done()
+    assert [state.best_score() for state in states] == [0.5, 0.6]
+
+
+def test_budgeted_search_async() -> None:
+    scheduler = BudgetScheduler(
+        ["slow", "fast"], budget=100, n_workers=2, slice_duration=1
+    )
+
+    def search(idx: int, state: EstimatorSearchState) -> EstimatorSearchState:
+        n_slices = len(state.scores)
+        time.sleep(0.5 if idx == 0 else 0.01)
+        scores = [0.5 + 0.01 * step for step in range(n_slices + 1)]
+        state.update(scores, [{}] * len(scores), [], idx == 0 or n_slices >= 4, 1)
+        return state
+
+    states = budgeted_search(
+        scheduler,
+        lambda idx, state, duration: delayed(search)(idx, state),
+        dispatcher=MemoryAwareDispatcher(n_jobs=2, backend="threading"),
+        hooks=DefaultHooks(),
+        topic="test",
+    )
+
+    # The fast estimator gets the freed worker while the slow slice runs.
+    assert len(states[0].scores) == 1
+    assert len(states[1].scores) == 5
+    assert scheduler.pulls[0] == 1
@@ -1,5 +1,6 @@
 # autoprognosis absolute
 from autoprognosis.explorers.core.selector import PipelineSelector
+import autoprognosis.plugins.core.params as params
 
 
 def test_sanity() -> None:
@@ -12,3 +13,23 @@ def test_sanity() -> None:
     assert clf.name() == "lda"
 
     assert len(clf.hyperparameter_space()) > 0
+
+
+def test_sample_hyperparameters_np_batch() -> None:
+    clf = PipelineSelector("random_forest", imputers=["mean", "ice"])
+    space = clf.hyperparameter_space()
+
+    configs = clf.sample_hyperparameters_np_batch(100)
+
+    assert len(configs) == 100
+    for config in configs:
+        assert list(config) == [param.name for param in space]
+
+        for param in space:
+            value = config[param.name]
+            if isinstance(param, params.Float):
+                assert param.low <= value <= param.high
+            else:
+                assert value in param.choices
+
+    assert len({str(config) for config in configs}) > 1
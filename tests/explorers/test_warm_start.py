@@ -0,0 +1,88 @@
+# stdlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# third party
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_breast_cancer
+
+# autoprognosis absolute
+from autoprognosis.explorers.core.warm_start import (
+    WarmStartStore,
+    dataset_meta_features,
+)
+import autoprognosis.plugins.core.params as params
+
+
+def test_meta_features() -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+    X.iloc[0, 0] = np.nan
+
+    meta = dataset_meta_features(X, Y)
+
+    assert np.isclose(meta["rows"], np.log10(len(X)))
+    assert np.isclose(meta["columns"], np.log10(X.shape[1]))
+    assert meta["missingness"] == 1 / X.size
+    assert np.isclose(meta["class_balance"], Y.value_counts(normalize=True).min())
+    assert meta["censoring_rate"] == 0
+
+    survival_meta = dataset_meta_features(X, Y, censoring=True)
+    assert np.isclose(survival_meta["censoring_rate"], 1 - Y.mean())
+
+
+def test_store_suggest_nearest(tmp_path: Path) -> None:
+    store = WarmStartStore(tmp_path / "warm_start.p", n_configs=2)
+
+    X = pd.DataFrame(np.random.randn(1000, 10))
+    near = dataset_meta_features(X, pd.Series([0, 1] * 500))
+    far = dataset_meta_features(X.head(20), pd.Series([0] * 19 + [1]))
+
+    store.add(
+        "near", near, "lda", [0.5, 0.9, 0.8, 0.1], [{}, {"a": 1}, {"a": 2}, {"a": 3}]
+    )
+    store.add("far", far, "lda", [0.99], [{"a": 4}])
+    store.add("other", near, "knn", [0.9], [{"b": 1}])
+
+    assert store.suggest(near, "lda", n_neighbours=1) == [{"a": 1}, {"a": 2}]
+    assert store.suggest(near, "lda") == [{"a": 1}, {"a": 2}, {"a": 4}]
+    assert store.suggest(near, "missing") == []
+
+    # A new search on the same dataset replaces the record.
+    store.add("near", near, "lda", [0.7], [{"a": 5}])
+    assert store.suggest(near, "lda", n_neighbours=1) == [{"a": 5}]
+
+    # The configurations are restricted to the new search space.
+    space = [params.Integer("a", 0, 3)]
+    assert store.suggest(near, "lda", space=space) == []
+    store.add("near", near, "lda", [0.7, 0.6], [{"a": 2, "c": 0}, {"a": 5}])
+    assert store.suggest(near, "lda", space=space, n_neighbours=1) == [{"a": 2}]
+
+
+def test_store_concurrent_add(tmp_path: Path) -> None:
+    meta = dataset_meta_features(pd.DataFrame(np.ones((10, 2))), pd.Series([0, 1] * 5))
+
+    def add(idx: int) -> None:
+        # One store per study, sharing the file.
+        store = WarmStartStore(tmp_path / "warm_start.p")
+        store.add("study", meta, f"estimator_{idx}", [0.5], [{"a": idx}])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(add, range(16)))
+
+    store = WarmStartStore(tmp_path / "warm_start.p")
+    for idx in range(16):
+        assert store.suggest(meta, f"estimator_{idx}") == [{"a": idx}]
+
+
+def test_store_suggest_by_horizon(tmp_path: Path) -> None:
+    store = WarmStartStore(tmp_path / "warm_start.p")
+    meta = dataset_meta_features(pd.DataFrame(np.ones((10, 2))), pd.Series([0, 1] * 5))
+
+    store.add("study", meta, "coxnet", [0.5], [{"a": 1}], horizon=10)
+    store.add("study", meta, "coxnet", [0.5], [{"a": 2}], horizon=20)
+
+    assert store.suggest(meta, "coxnet", horizon=10) == [{"a": 1}]
+    assert store.suggest(meta, "coxnet", horizon=20) == [{"a": 2}]
+    assert store.suggest(meta, "coxnet", horizon=30) == []
+    assert store.suggest(meta, "coxnet") == []
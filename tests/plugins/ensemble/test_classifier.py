@@ -2,6 +2,7 @@
 from typing import Any, List
 
 # third party
+import numpy as np
 import pytest
 from sklearn.datasets import load_breast_cancer
 from sklearn.model_selection import train_test_split
@@ -49,6 +50,33 @@ def test_weighted_ensemble_sanity(serialize: bool) -> None:
     assert evaluate_auc(y_test, y_pred.to_numpy())[0] > 0.5
 
 
+def test_weighted_ensemble_clone() -> None:
+    dtype = Pipeline(
+        ["imputer.default.ice", "prediction.classifier.logistic_regression"]
+    )
+    dtype2 = Pipeline(["prediction.classifier.xgboost"])
+
+    ens = WeightedEnsemble([dtype(), dtype2()], [0.5, 0.5], explainer_plugins=[])
+    ens_cv = WeightedEnsembleCV(models=[dtype(), dtype2()], weights=[0.5, 0.5])
+
+    clone = ens.clone()
+    assert clone.name() == ens.name()
+    assert not clone.is_fitted()
+    for model, ref in zip(clone.models, ens.models):
+        assert type(model) is type(ref)
+        assert model is not ref
+
+    clone_cv = ens_cv.clone()
+    assert len(clone_cv.models) == len(ens_cv.models)
+    assert clone_cv.name() == ens_cv.name()
+
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+    clone.fit(X, y)
+
+    assert clone.is_fitted()
+    assert not ens.is_fitted()
+
+
 @pytest.mark.slow
 def test_weighted_ensemble_explainer() -> None:
     dtype = Pipeline(
@@ -114,6 +142,41 @@ def test_weighted_ensemble_cv_sanity(serialize: bool) -> None:
     assert y_pred.shape == (len(X_test), 2)
 
 
+def test_weighted_ensemble_cv_concurrent_inference() -> None:
+    dtype = Pipeline(
+        [
+            "preprocessor.feature_scaling.scaler",
+            "prediction.classifier.logistic_regression",
+        ]
+    )
+    dtype2 = Pipeline(
+        ["preprocessor.feature_scaling.scaler", "prediction.classifier.xgboost"]
+    )
+
+    ens = WeightedEnsembleCV(
+        models=[dtype(), dtype2()],
+        weights=[0.5, 0.5],
+        n_folds=3,
+    )
+
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+    ens.fit(X, y)
+
+    ens.n_jobs = 1
+    seq_pred, seq_uncert = ens.predict_proba_with_uncertainity(X)
+
+    ens.n_jobs = 4
+    par_pred, par_uncert = ens.predict_proba_with_uncertainity(X)
+
+    assert np.allclose(seq_pred, par_pred)
+    assert np.allclose(seq_uncert, par_uncert)
+
+    for fold in ens.models:
+        assert (
+            fold.models[0].prefix_fingerprint() == fold.models[1].prefix_fingerprint()
+        )
+
+
 @pytest.mark.slow
 def test_weighted_ensemble_cv_explainer() -> None:
     dtype = Pipeline(
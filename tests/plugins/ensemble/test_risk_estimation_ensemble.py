@@ -1,3 +1,6 @@
+# stdlib
+from typing import Any
+
 # third party
 from lifelines.datasets import load_rossi
 import numpy as np
@@ -5,6 +8,8 @@ import pytest
 from sklearn.model_selection import train_test_split
 
 # autoprognosis absolute
+from autoprognosis.exceptions import StudyCancelled
+from autoprognosis.hooks import Hooks
 from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble, RiskEnsembleCV
 from autoprognosis.plugins.prediction import Predictions
 from autoprognosis.utils.metrics import evaluate_brier_score, evaluate_c_index
@@ -19,6 +24,24 @@ tr_X, te_X, tr_T, te_T, tr_Y, te_Y = train_test_split(
     X, T, Y, test_size=0.1, random_state=0
 )
 
+
+class ProgressHooks(Hooks):
+    def __init__(self, cancel_after: int = -1) -> None:
+        self.cancel_after = cancel_after
+        self.events: list = []
+
+    def cancel(self) -> bool:
+        return self.cancel_after >= 0 and len(self.events) >= self.cancel_after
+
+    def heartbeat(
+        self, topic: str, subtopic: str, event_type: str, **kwargs: Any
+    ) -> None:
+        self.events.append(kwargs)
+
+    def finish(self) -> None:
+        pass
+
+
 eval_time_horizons = [
     int(T[Y.iloc[:] == 1].quantile(0.25)),
     int(T[Y.iloc[:] == 1].quantile(0.50)),
@@ -118,7 +141,7 @@ def test_risk_estimation_model_compression() -> None:
     assert len(surv_ensemble.models) == 1
 
 
-@pytest.mark.parametrize("src", ["ensemble", "models"])
+@pytest.mark.parametrize("src", ["ensemble", "models", "plugin"])
 def test_risk_estimation_cv_fit_predict(src: str) -> None:
     cox_ph = Predictions(category="risk_estimation").get("cox_ph")
 
@@ -142,6 +165,12 @@ def test_risk_estimation_cv_fit_predict(src: str) -> None:
             ensemble=base_ensemble,
             n_folds=4,
         )
+    elif src == "plugin":
+        surv_ensemble = RiskEnsembleCV(
+            time_horizons=eval_time_horizons,
+            ensemble=cox_ph,
+            n_folds=4,
+        )
     else:
         surv_ensemble = RiskEnsembleCV(
             time_horizons=eval_time_horizons,
@@ -158,3 +187,70 @@ def test_risk_estimation_cv_fit_predict(src: str) -> None:
 
     assert mean.shape == (len(X), len(eval_time_horizons))
     assert uncert.shape == (len(X), len(eval_time_horizons))
+
+
+def test_risk_estimation_cv_concurrent_inference() -> None:
+    cox_ph = Predictions(category="risk_estimation").get("cox_ph")
+    weibull_aft = Predictions(category="risk_estimation").get("weibull_aft")
+
+    weights = np.asarray(
+        [
+            [0.5, 0.5],
+            [0.2, 0.8],
+            [0.8, 0.2],
+        ]
+    )
+
+    surv_ensemble = RiskEnsembleCV(
+        time_horizons=eval_time_horizons,
+        models=[cox_ph, weibull_aft],
+        weights=weights,
+        n_folds=3,
+    )
+    surv_ensemble.fit(X, T, Y)
+
+    surv_ensemble.n_jobs = 1
+    seq_mean, seq_uncert = surv_ensemble.predict_with_uncertainty(X)
+
+    surv_ensemble.n_jobs = 4
+    par_mean, par_uncert = surv_ensemble.predict_with_uncertainty(X)
+
+    assert np.allclose(seq_mean, par_mean)
+    assert np.allclose(seq_uncert, par_uncert)
+
+
+@pytest.mark.parametrize("cancel_after", [-1, 2])
+def test_risk_estimation_cv_fit_progress(cancel_after: int) -> None:
+    cox_ph = Predictions(category="risk_estimation").get("cox_ph")
+    weibull_aft = Predictions(category="risk_estimation").get("weibull_aft")
+
+    weights = np.asarray(
+        [
+            [0.5, 0.5],
+            [0.2, 0.8],
+            [0.8, 0.2],
+        ]
+    )
+
+    hooks = ProgressHooks(cancel_after=cancel_after)
+    surv_ensemble = RiskEnsembleCV(
+        time_horizons=eval_time_horizons,
+        models=[cox_ph, weibull_aft],
+        weights=weights,
+        n_folds=3,
+        hooks=hooks,
+    )
+
+    if cancel_after >= 0:
+        with pytest.raises(StudyCancelled):
+            surv_ensemble.fit(X, T, Y)
+        assert len(hooks.events) == cancel_after
+        return
+
+    surv_ensemble.fit(X, T, Y)
+
+    n_tasks = sum(len(fold.models) for fold in surv_ensemble.models)
+
+    assert surv_ensemble.is_fitted()
+    assert [ev["done"] for ev in hooks.events] == list(range(1, n_tasks + 1))
+    assert all(ev["total"] == n_tasks for ev in hooks.events)
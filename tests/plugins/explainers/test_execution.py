@@ -0,0 +1,45 @@
+# stdlib
+import operator
+from pathlib import Path
+from typing import List
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.plugins.explainers.execution import explain_rows
+
+
+@pytest.mark.parametrize("n_jobs,processes", [(1, False), (2, False), (2, True)])
+def test_explain_rows(
+    n_jobs: int, processes: bool, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SHARED_DATA_FOLDER", str(tmp_path))
+    X = pd.DataFrame(np.arange(20).reshape(10, 2))
+
+    outputs = explain_rows(
+        operator.methodcaller("sum", axis=1),
+        X,
+        n_jobs=n_jobs,
+        chunk_size=3,
+        processes=processes,
+    )
+
+    assert list(outputs) == list(X.sum(axis=1))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_explain_rows_seeds() -> None:
+    X = pd.DataFrame(np.zeros((5, 2)))
+
+    def explain_fn(chunk: pd.DataFrame, seeds: List[int]) -> List[int]:
+        assert len(chunk) == len(seeds)
+        return seeds
+
+    for chunk_size in [1, 2, 5]:
+        outputs = explain_rows(
+            explain_fn, X, n_jobs=2, chunk_size=chunk_size, random_state=10
+        )
+        assert list(outputs) == [10, 11, 12, 13, 14]
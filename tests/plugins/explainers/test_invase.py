@@ -11,7 +11,12 @@ from sklearn.model_selection import train_test_split
 
 # autoprognosis absolute
 from autoprognosis.plugins.explainers import Explainers
-from autoprognosis.plugins.explainers.plugin_invase import plugin
+from autoprognosis.plugins.explainers.plugin_invase import (
+    bitmask_intervals,
+    bitmask_sizes,
+    plugin,
+    random_masks,
+)
 from autoprognosis.plugins.pipeline import Pipeline
 from autoprognosis.plugins.prediction.classifiers import Classifiers
 from autoprognosis.plugins.prediction.risk_estimation.plugin_cox_ph import (
@@ -29,6 +34,22 @@ def dataset() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     return train_test_split(X, y, test_size=0.2)
 
 
+@pytest.mark.parametrize("n_features", [1, 4, 7])
+def test_bitmask_schedule(n_features: int) -> None:
+    for low, high in [
+        (n_features - 3, n_features - 1),
+        (n_features - 2, n_features - 1),
+    ]:
+        sizes = bitmask_sizes(n_features, low, high)
+        masks = list(bitmask_intervals(n_features, low, high))
+
+        assert sizes.tolist() == [int(mask.sum()) for mask in masks]
+
+        drawn = random_masks(sizes, n_features)
+        assert drawn.shape == (len(masks), n_features)
+        assert drawn.sum(dim=-1).tolist() == sizes.tolist()
+
+
 def test_sanity() -> None:
     classifier = "logistic_regression"
 
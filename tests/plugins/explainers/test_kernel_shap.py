@@ -4,11 +4,13 @@ from typing import Tuple
 # third party
 from lifelines.datasets import load_rossi
 import numpy as np
+import pandas as pd
 import pytest
 from sklearn.datasets import load_breast_cancer
 from sklearn.model_selection import train_test_split
 
 # autoprognosis absolute
+from autoprognosis.plugins.explainers.execution import CachedModelFn
 from autoprognosis.plugins.explainers.plugin_kernel_shap import plugin
 from autoprognosis.plugins.pipeline import Pipeline
 from autoprognosis.plugins.prediction.classifiers import Classifiers
@@ -75,3 +77,50 @@ def test_plugin_kernel_shap_survival_prediction() -> None:
     result = explainer.explain(X[:3])
 
     assert result.shape == (3, X.shape[1])
+
+
+def test_cached_model_fn() -> None:
+    calls = []
+
+    def predict_fn(X: pd.DataFrame) -> np.ndarray:
+        calls.append(len(X))
+        return X.sum(axis=1).values
+
+    model_fn = CachedModelFn(predict_fn, ["a", "b"])
+
+    X = np.asarray([[0, 1], [1, 1], [0, 1], [2, 2]])
+    assert (model_fn(X) == [1, 2, 1, 4]).all()
+    assert calls == [3]
+
+    assert (model_fn(np.asarray([[2, 2], [3, 3]])) == [4, 6]).all()
+    assert calls == [3, 1]
+
+
+def test_plugin_kernel_shap_concurrent_rows() -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    Y = rossi["arrest"]
+    T = rossi["week"]
+
+    surv = CoxPH().fit(X, T, Y)
+    eval_times = [
+        int(T[Y.iloc[:] == 1].quantile(0.50)),
+        int(T[Y.iloc[:] == 1].quantile(0.75)),
+    ]
+
+    results = []
+    for n_jobs in [1, 4]:
+        explainer = plugin(
+            surv,
+            X,
+            Y,
+            time_to_event=T,
+            eval_times=eval_times,
+            task_type="risk_estimation",
+            n_jobs=n_jobs,
+        )
+        results.append(explainer.explain(X[:4]))
+
+    assert results[0].shape == (4, X.shape[1])
+    assert np.allclose(results[0], results[1])
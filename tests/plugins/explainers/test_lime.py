@@ -73,3 +73,33 @@ def test_plugin_lime_survival_prediction() -> None:
     result = explainer.explain(X.head(1))
 
     assert result.shape == (1, X.shape[1])
+
+
+def test_plugin_lime_concurrent_rows() -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    Y = rossi["arrest"]
+    T = rossi["week"]
+
+    surv = CoxPH().fit(X, T, Y)
+
+    explainer = plugin(
+        surv,
+        X,
+        Y,
+        time_to_event=T,
+        eval_times=[int(T[Y.iloc[:] == 1].quantile(0.50))],
+        task_type="risk_estimation",
+    )
+
+    reference = explainer.explain(X.head(4), n_jobs=1)
+    result = explainer.explain(X.head(4), n_jobs=2, chunk_size=3)
+
+    assert result.shape == (4, X.shape[1])
+    np.testing.assert_allclose(result.values, reference.values)
+
+    stream = explainer.explain_iter(X.head(4), n_jobs=2)
+    first = next(stream)
+    assert len(first) == X.shape[1]
+    assert len(list(stream)) == 3
@@ -1,5 +1,5 @@
 # stdlib
-from typing import Tuple, Type
+from typing import Callable, Tuple, Type
 
 # third party
 from lifelines.datasets import load_rossi
@@ -102,3 +102,73 @@ def test_plugin_risk_effect_size_survival_prediction() -> None:
 
     assert value_of_inf.isna().sum().sum() == 0
     assert (value_of_inf < 0).sum().sum() == 0
+
+
+def _reference_shifts(
+    predict_cbk: Callable, X: pd.DataFrame, effect_size: float
+) -> pd.DataFrame:
+    preds = predict_cbk(X).values.squeeze()
+    buckets = pd.cut(preds, bins=2, duplicates="drop", labels=range(2))
+    X = X.reset_index(drop=True)
+
+    output = []
+    index = []
+    for bucket in range(2):
+        d1 = X[buckets == bucket]
+        d2 = X[buckets > bucket]
+        if len(d1) < 2 or len(d2) < 2:
+            continue
+
+        n1, n2 = len(d1), len(d2)
+        s = np.sqrt(
+            ((n1 - 1) * d1.var(ddof=1) + (n2 - 1) * d2.var(ddof=1)) / (n1 + n2 - 2)
+        )
+        diffs = np.abs((d1.mean() - d2.mean()) / s)
+        output.append(diffs.mask(diffs < effect_size, 0))
+        index.append(f"Risk lvl {bucket}")
+
+    return pd.DataFrame(output, index=index).astype(float).clip(upper=3)
+
+
+def test_plugin_risk_effect_size_precomputed_population() -> None:
+    X_train, X_test, y_train, y_test = dataset()
+
+    pipeline = Pipeline(
+        [
+            Classifiers().get_type("logistic_regression").fqdn(),
+        ]
+    )()
+    pipeline.fit(X_train, y_train)
+
+    explainer = plugin(pipeline, X_train, y_train, prefit=True, effect_size=0.1)
+
+    for X in [X_train, X_test]:
+        expected = _reference_shifts(explainer.predict_cbk, X, 0.1)
+        shifts = explainer._get_population_shifts(explainer.predict_cbk, X)
+
+        assert list(shifts.index) == list(expected.index)
+        np.testing.assert_allclose(shifts.values, expected.values, rtol=1e-6)
+
+    np.testing.assert_allclose(
+        explainer.explain(X_train).values, explainer.explain().values
+    )
+
+    # incremental update
+    explainer.update(X_test)
+    stats = explainer._population
+
+    assert stats["rows"].sum() == len(X_train) + len(X_test)
+
+    X_full = pd.concat([X_train, X_test])
+    expected_stats = explainer._population_stats(
+        X_full,
+        explainer.predict_cbk(X_full),
+        edges=stats["edges"],
+        center=stats["center"],
+    )
+    for key in ["rows", "count", "sum", "sum_sq"]:
+        np.testing.assert_allclose(stats[key], expected_stats[key], atol=1e-6)
+
+    value_of_inf = explainer.explain()
+    assert value_of_inf.isna().sum() == 0
+    assert (value_of_inf < 0).sum() == 0
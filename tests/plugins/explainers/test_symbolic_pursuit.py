@@ -112,3 +112,26 @@ def test_plugin_symbolic_pursuit_survival_prediction() -> None:
     value_of_inf = explainer.explain(X)
 
     assert len(value_of_inf) == len(X)
+
+
+@pytest.mark.slow
+def test_plugin_symbolic_pursuit_concurrent_rows() -> None:
+    X_train, X_test, y_train, y_test = dataset()
+
+    pipeline = Pipeline(
+        [
+            Classifiers().get_type("logistic_regression").fqdn(),
+        ]
+    )()
+    pipeline.fit(X_train, y_train)
+
+    explainer = plugin(
+        pipeline, X_train, y_train, prefit=True, maxiter=5, ratio_tol=1.5, patience=2
+    )
+
+    reference = explainer.explain(X_test[:4], n_jobs=1)
+    result = explainer.explain(X_test[:4], n_jobs=2, chunk_size=3)
+
+    assert result.shape == reference.shape
+    np.testing.assert_allclose(result.astype(float), reference.astype(float))
+    assert len(list(explainer.explain_iter(X_test[:4], n_jobs=2))) == 4
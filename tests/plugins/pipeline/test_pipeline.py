@@ -1,4 +1,5 @@
 # stdlib
+import copy
 from typing import Any, List, Tuple
 
 # third party
@@ -15,7 +16,7 @@ from autoprognosis.plugins.pipeline import Pipeline, PipelineMeta
 from autoprognosis.plugins.prediction.classifiers import Classifiers
 from autoprognosis.plugins.preprocessors import Preprocessors
 from autoprognosis.plugins.utils.simulate import simulate_nan
-from autoprognosis.utils.serialization import load_model, save_model
+from autoprognosis.utils.serialization import clone_model, load_model, save_model
 
 
 def dataset() -> Tuple:
@@ -232,3 +233,52 @@ def test_pipeline_pickle() -> None:
     assert pipeline.get_args() == new_pipeline.get_args()
 
     pipeline.predict(pd.DataFrame(X_test))
+
+
+def test_pipeline_class_cache() -> None:
+    plugins_str = [
+        Imputers().get_type("mean").fqdn(),
+        Preprocessors().get_type("minmax_scaler").fqdn(),
+        Classifiers().get_type("logistic_regression").fqdn(),
+    ]
+
+    template = Pipeline(plugins_str)
+
+    assert Pipeline(list(plugins_str)) is template
+    assert group(plugins_str) == tuple(template.plugin_types)
+    assert Pipeline(plugins_str[1:]).plugin_types[0] is template.plugin_types[1]
+
+    pipeline = template({"logistic_regression": {"C": 1}})
+
+    assert type(copy.deepcopy(pipeline)) is template
+    assert type(load_model(save_model(pipeline))) is template
+    assert type(PipelineMeta.load(pipeline.save())) is template
+    assert copy.deepcopy(pipeline).get_args() == pipeline.get_args()
+
+
+def test_pipeline_clone() -> None:
+    X_train, X_test, y_train, y_test = dataset()
+
+    template = Pipeline(
+        [
+            Preprocessors().get_type("minmax_scaler").fqdn(),
+            Classifiers().get_type("logistic_regression").fqdn(),
+        ]
+    )
+    pipeline = template({"logistic_regression": {"C": 0.5}}, output="numpy")
+
+    clone = pipeline.clone()
+
+    assert type(clone) is template
+    assert clone.get_args() == pipeline.get_args()
+    assert clone.get_args() is not pipeline.get_args()
+    assert clone.output is np.asarray
+    assert clone.stages[-1] is not pipeline.stages[-1]
+    assert not clone.is_fitted()
+
+    pipeline.fit(pd.DataFrame(X_train), pd.Series(y_train))
+
+    assert not clone.is_fitted()
+    assert not pipeline.clone().is_fitted()
+    assert clone_model(pipeline).is_fitted()
+    assert not clone_model(template()).is_fitted()
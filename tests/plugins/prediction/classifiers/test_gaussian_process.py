@@ -6,11 +6,15 @@ import numpy as np
 import optuna
 import pytest
 from sklearn.datasets import load_iris
+from sklearn.gaussian_process import GaussianProcessClassifier
 from sklearn.model_selection import train_test_split
 
 # autoprognosis absolute
 from autoprognosis.plugins.prediction import PredictionPlugin, Predictions
-from autoprognosis.plugins.prediction.classifiers.plugin_gaussian_process import plugin
+from autoprognosis.plugins.prediction.classifiers.plugin_gaussian_process import (
+    NystroemGaussianProcessClassifier,
+    plugin,
+)
 from autoprognosis.utils.serialization import load_model, save_model
 from autoprognosis.utils.tester import evaluate_estimator
 
@@ -74,6 +78,30 @@ def test_gaussian_process_plugin_fit_predict(test_plugin: PredictionPlugin) -> N
     assert np.abs(np.subtract(y_pred, y_test)).mean() < 1
 
 
+def test_gaussian_process_plugin_approximate() -> None:
+    X, y = load_iris(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, stratify=y, random_state=0
+    )
+
+    test_plugin = plugin(max_exact_rows=50, n_inducing=30)
+    test_plugin.fit(X_train, y_train)
+
+    assert isinstance(test_plugin.model, NystroemGaussianProcessClassifier)
+    # The kernel hyperparameters are fitted on the inducing rows.
+    assert test_plugin.model.features_.kernel.k2.length_scale != 1.0
+
+    y_pred = test_plugin.predict_proba(X_test)
+    assert y_pred.shape == (len(X_test), 3)
+    assert (y_pred.to_numpy().argmax(axis=1) == y_test).mean() > 0.8
+
+    # A refit on a small dataset is exact again.
+    test_plugin.fit(X_train[:40], y_train[:40])
+    assert isinstance(test_plugin.model, GaussianProcessClassifier)
+
+    assert test_plugin.memory_footprint(1000, 4) < plugin.memory_footprint(1000, 4)
+
+
 def test_param_search() -> None:
     if len(plugin.hyperparameter_space()) == 0:
         return
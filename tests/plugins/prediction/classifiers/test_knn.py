@@ -78,6 +78,21 @@ def test_knn_plugin_fit_predict(test_plugin: PredictionPlugin) -> None:
     assert np.abs(np.subtract(y_pred, y_test)).mean() < 1
 
 
+def test_knn_plugin_approximate() -> None:
+    X, y = load_iris(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, stratify=y, random_state=0
+    )
+
+    test_plugin = plugin(approximate=True, n_trees=5, leaf_size=10)
+    test_plugin.fit(X_train, y_train)
+    test_plugin = plugin.load(test_plugin.save())
+
+    y_pred = test_plugin.predict(X_test).to_numpy().ravel()
+
+    assert (y_pred == y_test).mean() > 0.8
+
+
 def test_param_search() -> None:
     if len(plugin.hyperparameter_space()) == 0:
         return
@@ -7,12 +7,15 @@ import optuna
 import pytest
 from sklearn.datasets import load_iris
 from sklearn.model_selection import train_test_split
+import torch
 
 # autoprognosis absolute
 from autoprognosis.plugins.prediction import PredictionPlugin, Predictions
 from autoprognosis.plugins.prediction.classifiers.plugin_neural_nets import plugin
+from autoprognosis.utils.parallel import thread_budget
 from autoprognosis.utils.serialization import load_model, save_model
 from autoprognosis.utils.tester import evaluate_estimator
+from autoprognosis.utils.torch import num_threads
 
 
 def from_api() -> PredictionPlugin:
@@ -74,6 +77,22 @@ def test_neural_nets_plugin_fit_predict(test_plugin: PredictionPlugin) -> None:
     assert np.abs(np.subtract(y_pred, y_test)).mean() < 1
 
 
+def test_neural_nets_plugin_threads() -> None:
+    X, y = load_iris(return_X_y=True)
+    threads = torch.get_num_threads()
+
+    test_plugin = plugin(n_iter=10, n_threads=1)
+    y_pred = test_plugin.fit(X, y).predict_proba(X)
+
+    assert y_pred.shape == (len(X), 3)
+    assert torch.get_num_threads() == threads
+
+    # The thread budget of the task wins over the plugin setting.
+    with thread_budget(2):
+        with num_threads(1):
+            assert torch.get_num_threads() == 2
+
+
 @pytest.mark.slow
 def test_param_search() -> None:
     if len(plugin.hyperparameter_space()) == 0:
@@ -73,6 +73,18 @@ def test_kneighbors_regressor_plugin_fit_predict(test_plugin: PredictionPlugin)
     assert score["raw"]["mse"][0] < 5000
 
 
+def test_kneighbors_regressor_plugin_approximate() -> None:
+    X, y = load_diabetes(return_X_y=True)
+
+    test_plugin = plugin(approximate=True, n_trees=5, leaf_size=20)
+    test_plugin.fit(X, y)
+    test_plugin = plugin.load(test_plugin.save())
+
+    score = evaluate_regression(test_plugin, X, y)
+
+    assert score["raw"]["mse"][0] < 5000
+
+
 def test_param_search() -> None:
     if len(plugin.hyperparameter_space()) == 0:
         return
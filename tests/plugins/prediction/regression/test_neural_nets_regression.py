@@ -5,6 +5,7 @@ from typing import Any
 import optuna
 import pytest
 from sklearn.datasets import load_diabetes
+import torch
 
 # autoprognosis absolute
 from autoprognosis.plugins.prediction import PredictionPlugin, Predictions
@@ -77,6 +78,17 @@ def test_neural_nets_regression_plugin_fit_predict(
     assert score["raw"]["mse"][0] < 5000
 
 
+def test_neural_nets_regression_plugin_threads() -> None:
+    X, y = load_diabetes(return_X_y=True)
+    threads = torch.get_num_threads()
+
+    test_plugin = plugin(n_iter=10, n_threads=1)
+    y_pred = test_plugin.fit(X, y).predict(X)
+
+    assert len(y_pred) == len(X)
+    assert torch.get_num_threads() == threads
+
+
 @pytest.mark.slow
 def test_param_search() -> None:
     if len(plugin.hyperparameter_space()) == 0:
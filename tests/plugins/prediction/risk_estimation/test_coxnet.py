@@ -1,4 +1,9 @@
+# stdlib
+from pathlib import Path
+
 # third party
+import numpy as np
+import pandas as pd
 from pycox.datasets import metabric
 import pytest
 from sklearn.model_selection import train_test_split
@@ -6,6 +11,7 @@ from sklearn.model_selection import train_test_split
 # autoprognosis absolute
 from autoprognosis.plugins.prediction import PredictionPlugin, Predictions
 from autoprognosis.plugins.prediction.risk_estimation.plugin_coxnet import plugin
+from autoprognosis.utils.data_source import to_numpy_shards
 from autoprognosis.utils.metrics import evaluate_brier_score, evaluate_c_index
 
 
@@ -82,3 +88,48 @@ def test_coxnet_plugin_fit_predict(test_plugin: PredictionPlugin) -> None:
             T_train, Y_train, y_pred[:, e_idx], T_test, Y_test, eval_time
         )
         assert brier_score < 0.5
+
+
+def test_coxnet_plugin_fit_predict_data_source(tmp_path: Path) -> None:
+    df = metabric.read_df()
+
+    X = df.drop(["duration", "event"], axis=1)
+    Y = df["event"]
+    T = df["duration"]
+
+    X_train, X_test, T_train, T_test, Y_train, Y_test = train_test_split(
+        X, T, Y, test_size=0.1, random_state=0
+    )
+    source = to_numpy_shards(X_train, tmp_path, shard_size=500)
+
+    eval_time_horizons = [int(T[Y.iloc[:] == 1].quantile(0.50))]
+
+    test_plugin = plugin().fit(source, T_train, Y_train)
+    y_pred = test_plugin.predict(X_test, eval_time_horizons).to_numpy()
+
+    c_index = evaluate_c_index(
+        T_train, Y_train, y_pred[:, 0], T_test, Y_test, eval_time_horizons[0]
+    )
+    assert c_index > 0.5
+
+    # The predictions from a data source match the ones from the DataFrame.
+    test_source = to_numpy_shards(X_test, tmp_path / "test", shard_size=100)
+    np.testing.assert_allclose(
+        test_plugin.predict(test_source, eval_time_horizons).to_numpy(),
+        y_pred,
+        rtol=1e-4,
+    )
+
+
+def test_coxnet_plugin_fit_predict_loader() -> None:
+    # The training batches are streamed to torchtuples by a DataSourceLoader.
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.standard_normal((300, 4)), columns=["a", "b", "c", "d"])
+    T = pd.Series(rng.integers(1, 100, 300))
+    Y = pd.Series(rng.integers(0, 2, 300))
+
+    test_plugin = plugin(epochs=2).fit(X, T, Y)
+    y_pred = test_plugin.predict(X, [30, 60]).to_numpy()
+
+    assert y_pred.shape == (300, 2)
+    assert np.isfinite(y_pred).all()
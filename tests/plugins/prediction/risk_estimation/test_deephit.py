@@ -1,4 +1,6 @@
 # third party
+import numpy as np
+import pandas as pd
 from pycox.datasets import metabric
 import pytest
 from sklearn.model_selection import train_test_split
@@ -88,3 +90,17 @@ def test_deephit_plugin_fit_predict(test_plugin: PredictionPlugin) -> None:
             T_train, Y_train, y_pred[:, e_idx], T_test, Y_test, eval_time
         )
         assert brier_score < 0.5
+
+
+def test_deephit_plugin_fit_predict_loader() -> None:
+    # The training batches are streamed to torchtuples by a DataSourceLoader.
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.standard_normal((300, 4)), columns=["a", "b", "c", "d"])
+    T = pd.Series(rng.integers(1, 100, 300))
+    Y = pd.Series(rng.integers(0, 2, 300))
+
+    test_plugin = plugin(epochs=2).fit(X, T, Y)
+    y_pred = test_plugin.predict(X, [30, 60]).to_numpy()
+
+    assert y_pred.shape == (300, 2)
+    assert np.isfinite(y_pred).all()
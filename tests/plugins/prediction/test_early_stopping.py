@@ -0,0 +1,44 @@
+# stdlib
+import sys
+from typing import Callable
+
+# third party
+import pytest
+from sklearn.datasets import load_diabetes, load_iris
+
+# autoprognosis absolute
+from autoprognosis.plugins.prediction import Predictions
+
+
+@pytest.mark.parametrize(
+    "category,name,learning_rate,load_data",
+    [
+        ("classifier", "catboost", {"learning_rate": 0.3}, load_iris),
+        pytest.param(
+            "classifier",
+            "lgbm",
+            {"learning_rate": 0.3},
+            load_iris,
+            marks=pytest.mark.skipif(
+                sys.platform == "darwin", reason="LGBM crash on OSX"
+            ),
+        ),
+        ("classifier", "xgboost", {"learning_rate": 0.3}, load_iris),
+        ("regression", "catboost_regressor", {"learning_rate": 0.3}, load_diabetes),
+        ("regression", "xgboost_regressor", {"eta": 0.3}, load_diabetes),
+    ],
+)
+def test_early_stopping(
+    category: str, name: str, learning_rate: dict, load_data: Callable
+) -> None:
+    X, y = load_data(return_X_y=True)
+    predictions = Predictions(category=category)
+
+    test_plugin = predictions.get(name, n_estimators=1000, **learning_rate).fit(X, y)
+
+    # The boosting stops on the validation plateau, before the n_estimators ceiling.
+    assert test_plugin.best_iteration is not None
+    assert test_plugin.best_iteration < 999
+
+    test_plugin = predictions.get(name, n_estimators=20, early_stopping_rounds=0)
+    assert test_plugin.fit(X, y).best_iteration is None
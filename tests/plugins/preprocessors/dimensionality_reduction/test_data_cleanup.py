@@ -1,9 +1,13 @@
 # third party
+import numpy as np
+import pandas as pd
 import pytest
+from statsmodels.stats.outliers_influence import variance_inflation_factor
 
 # autoprognosis absolute
 from autoprognosis.plugins.preprocessors import PreprocessorPlugin, Preprocessors
 from autoprognosis.plugins.preprocessors.dimensionality_reduction.plugin_data_cleanup import (
+    VIFEngine,
     plugin,
 )
 from autoprognosis.utils.serialization import load_model, save_model
@@ -69,3 +73,33 @@ def test_variance_threshold_plugin_fit_transform(
     )
 
     assert res.shape == (4, 2)
+
+
+def test_vif_engine_matches_statsmodels() -> None:
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame(rng.uniform(size=(100, 6)))
+    X[6] = X[0] + 0.1 * X[1] + 0.01 * rng.uniform(size=100)
+
+    vif = VIFEngine(X).vif()
+    reference = [variance_inflation_factor(X.values, i) for i in range(X.shape[1])]
+
+    np.testing.assert_allclose(vif["VIF"].values, reference, rtol=1e-5)
+    assert list(vif["features"]) == list(X.columns)
+
+
+def test_vif_engine_downdate() -> None:
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame(rng.uniform(size=(100, 8)))
+    X[8] = X[0] + X[1] + 0.01 * rng.uniform(size=100)
+    X[9] = X[2] - X[3] + 0.01 * rng.uniform(size=100)
+
+    engine = VIFEngine(X)
+    drop = engine.eliminate(10)
+
+    assert len(drop) > 0
+    np.testing.assert_allclose(
+        engine.vif()["VIF"].values,
+        VIFEngine(X.drop(columns=drop)).vif()["VIF"].values,
+        rtol=1e-6,
+    )
+    assert engine.vif()["VIF"].max() <= 10
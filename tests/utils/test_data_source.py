@@ -0,0 +1,89 @@
+# stdlib
+from pathlib import Path
+import pickle
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.utils.data_source import (
+    ArrayDataSource,
+    NumpyShardDataSource,
+    to_numpy_shards,
+)
+
+
+def _dataset() -> pd.DataFrame:
+    return pd.DataFrame(np.random.randn(250, 4), columns=["a", "b", "c", "d"])
+
+
+def test_array_data_source() -> None:
+    X = _dataset()
+    source = ArrayDataSource(X)
+
+    assert len(source) == 250
+    assert source.shape == (250, 4)
+    assert source.columns == ["a", "b", "c", "d"]
+
+    rows = source.take([7, 3, 200])
+    assert rows.dtype == np.float32
+    np.testing.assert_allclose(rows, X.iloc[[7, 3, 200]].values, rtol=1e-6)
+
+    with pytest.raises(IndexError):
+        source.take([250])
+
+
+def test_numpy_shards(tmp_path: Path) -> None:
+    X = _dataset()
+    source = to_numpy_shards(X, tmp_path, shard_size=100)
+
+    assert isinstance(source, NumpyShardDataSource)
+    assert len(source.blocks()) == 3
+    assert source.shape == X.shape
+    assert source.columns == list(X.columns)
+
+    indices = [249, 0, 150, 99, 100]
+    np.testing.assert_allclose(source.take(indices), X.iloc[indices].values, rtol=1e-6)
+    np.testing.assert_allclose(source.to_dataframe().values, X.values, rtol=1e-6)
+
+    # The pickled source reopens the shards.
+    restored = pickle.loads(pickle.dumps(source))
+    np.testing.assert_array_equal(restored.take(indices), source.take(indices))
+
+
+def test_subset(tmp_path: Path) -> None:
+    X = _dataset()
+    source = to_numpy_shards(X, tmp_path, shard_size=100)
+
+    subset = source.subset(np.arange(50, 250, 2))
+    assert len(subset) == 100
+    np.testing.assert_allclose(
+        subset.take([0, 99]), X.iloc[[50, 248]].values, rtol=1e-6
+    )
+
+    nested = subset.subset([1, 2])
+    np.testing.assert_allclose(nested.take([0, 1]), X.iloc[[52, 54]].values, rtol=1e-6)
+
+    # The blocks of the subset follow the shards.
+    assert [len(block) for block in subset.blocks()] == [25, 50, 25]
+
+
+def test_batches(tmp_path: Path) -> None:
+    source = to_numpy_shards(_dataset(), tmp_path, shard_size=100)
+
+    batches = list(source.batches(64))
+    assert [len(batch) for batch in batches] == [64, 64, 64, 58]
+    np.testing.assert_array_equal(np.concatenate(batches), np.arange(250))
+
+    shuffled = np.concatenate(list(source.batches(64, shuffle=True, random_state=1)))
+    assert sorted(shuffled) == list(range(250))
+    assert list(shuffled) != list(range(250))
+
+    # The shuffled rows are grouped by shard.
+    shards = shuffled // 100
+    assert (np.diff(shards) != 0).sum() == 2
+
+    with pytest.raises(ValueError):
+        list(source.batches(0))
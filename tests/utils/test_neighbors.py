@@ -0,0 +1,99 @@
+# stdlib
+import time
+
+# third party
+import numpy as np
+import pytest
+from sklearn.neighbors import NearestNeighbors
+
+# autoprognosis absolute
+from autoprognosis.utils.neighbors import (
+    ApproximateKNeighborsClassifier,
+    ApproximateKNeighborsRegressor,
+    RandomProjectionIndex,
+)
+from autoprognosis.utils.serialization import load_model, save_model
+
+
+def _dataset(n_rows: int, n_features: int, n_latent: int = 10) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    latent = rng.standard_normal((n_rows, n_latent))
+    noise = 0.1 * rng.standard_normal((n_rows, n_features))
+
+    return latent @ rng.standard_normal((n_latent, n_features)) + noise
+
+
+def _recall(approximate: np.ndarray, exact: np.ndarray) -> float:
+    found = [len(np.intersect1d(row, ref)) for row, ref in zip(approximate, exact)]
+
+    return np.sum(found) / exact.size
+
+
+@pytest.mark.parametrize("p", [1, 2])
+def test_index_exact_for_large_leaves(p: int) -> None:
+    X = _dataset(200, 8)
+
+    index = RandomProjectionIndex(n_trees=1, leaf_size=200, p=p).fit(X)
+    _, neighbors = index.query(X, 5)
+    _, exact = NearestNeighbors(n_neighbors=5, p=p).fit(X).kneighbors(X)
+
+    assert _recall(neighbors, exact) == 1
+    assert (neighbors[:, 0] == np.arange(len(X))).all()
+
+
+def test_index_recall() -> None:
+    X = _dataset(5000, 50)
+
+    distances, neighbors = (
+        RandomProjectionIndex(n_trees=10, leaf_size=30).fit(X).query(X[:500], 10)
+    )
+    _, exact = NearestNeighbors(n_neighbors=10).fit(X).kneighbors(X[:500])
+
+    assert distances.shape == neighbors.shape == (500, 10)
+    assert (np.diff(distances, axis=1) >= 0).all()
+    assert len(np.unique(neighbors[0])) == 10
+    assert _recall(neighbors, exact) > 0.8
+
+
+def test_index_missing_candidates() -> None:
+    X = _dataset(3, 4)
+
+    distances, neighbors = RandomProjectionIndex().fit(X).query(X, 5)
+
+    assert (neighbors[:, 3:] == -1).all()
+    assert np.isinf(distances[:, 3:]).all()
+
+
+def test_approximate_estimators() -> None:
+    X = _dataset(1000, 20)
+    y = (X[:, 0] > 0).astype(int)
+
+    classifier = ApproximateKNeighborsClassifier(weights="distance").fit(X, y)
+    classifier = load_model(save_model(classifier))
+
+    proba = classifier.predict_proba(X)
+    assert proba.shape == (1000, 2)
+    np.testing.assert_allclose(proba.sum(axis=1), 1)
+    assert (classifier.predict(X) == y).mean() > 0.9
+
+    regressor = ApproximateKNeighborsRegressor().fit(X, X[:, 0])
+    assert np.abs(regressor.predict(X) - X[:, 0]).mean() < 0.5
+
+
+@pytest.mark.slow
+def test_index_benchmark() -> None:
+    data = _dataset(102000, 200)
+    X, queries = data[:100000], data[100000:]
+
+    exact_index = NearestNeighbors(n_neighbors=5).fit(X)
+    start = time.time()
+    _, exact = exact_index.kneighbors(queries)
+    exact_duration = time.time() - start
+
+    index = RandomProjectionIndex(n_trees=10).fit(X)
+    start = time.time()
+    _, neighbors = index.query(queries, 5)
+    approximate_duration = time.time() - start
+
+    assert _recall(neighbors, exact) > 0.8
+    assert approximate_duration < exact_duration
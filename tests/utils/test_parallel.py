@@ -1,9 +1,25 @@
 # stdlib
 import multiprocessing
 import os
+import threading
+import time
+
+# third party
+from joblib import delayed
 
 # autoprognosis absolute
-from autoprognosis.utils.parallel import n_learner_jobs, n_opt_jobs
+from autoprognosis.plugins.prediction.classifiers import Classifiers
+from autoprognosis.utils.parallel import (
+    WORKER_MEMORY_OVERHEAD,
+    MemoryAwareDispatcher,
+    _process_memory,
+    budgeted,
+    n_learner_jobs,
+    n_opt_jobs,
+    n_worker_threads,
+    set_learner_threads,
+    thread_budget,
+)
 
 
 def test_n_opt_jobs() -> None:
@@ -24,3 +40,102 @@ def test_n_learner_jobs() -> None:
     del os.environ["N_LEARNER_JOBS"]
 
     assert n_learner_jobs() == multiprocessing.cpu_count()
+
+
+def test_n_worker_threads() -> None:
+    os.environ["N_CPUS"] = "32"
+    os.environ["N_OPT_JOBS"] = "8"
+
+    assert n_worker_threads() == 4
+
+    os.environ["N_OPT_JOBS"] = "64"
+
+    assert n_worker_threads() == 1
+
+    del os.environ["N_CPUS"]
+    del os.environ["N_OPT_JOBS"]
+
+
+def test_thread_budget() -> None:
+    with thread_budget(3):
+        assert n_learner_jobs() == 3
+
+    assert n_learner_jobs() == multiprocessing.cpu_count()
+
+    os.environ["N_LEARNER_JOBS"] = "1"
+    with thread_budget(3):
+        assert n_learner_jobs() == 1
+
+    del os.environ["N_LEARNER_JOBS"]
+
+
+def test_budgeted() -> None:
+    task = budgeted(n_learner_jobs, n_threads=2)
+
+    assert task() == 2
+    assert n_learner_jobs() == multiprocessing.cpu_count()
+
+
+
+def test_set_learner_threads() -> None:
+    model = Classifiers().get("random_forest", calibration=1)
+    calibrated = model.model
+    forest = getattr(calibrated, "estimator", None) or calibrated.base_estimator
+    calibrated.n_jobs = 8
+    forest.n_jobs = 1
+
+    set_learner_threads(model, n_threads=2)
+
+    assert calibrated.n_jobs == 2
+    assert forest.n_jobs == 1
+
+
+def test_memory_aware_dispatcher() -> None:
+    def square(x: int) -> int:
+        return x * x
+
+    tasks = [
+        delayed(budgeted(square, n_threads=1, memory=2**20))(x) for x in range(6)
+    ]
+
+    dispatcher = MemoryAwareDispatcher(
+        memory_limit=2 * WORKER_MEMORY_OVERHEAD, n_jobs=2, backend="threading"
+    )
+    assert dispatcher(tasks) == [x * x for x in range(6)]
+
+    dispatcher = MemoryAwareDispatcher(n_jobs=2, backend="threading")
+    assert list(dispatcher(tasks)) == [x * x for x in range(6)]
+
+
+def test_memory_aware_dispatcher_in_flight() -> None:
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+    finished = []
+
+    def task(idx: int, duration: float) -> int:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(duration)
+        with lock:
+            running[0] -= 1
+            finished.append(idx)
+        return idx
+
+    # Two tasks fit at once: the short tasks run next to the long one, as the
+    # memory frees up.
+    durations = [1.0, 0.05, 0.05, 0.05, 0.05]
+    tasks = [
+        delayed(budgeted(task, n_threads=1, memory=WORKER_MEMORY_OVERHEAD))(idx, dur)
+        for idx, dur in enumerate(durations)
+    ]
+    dispatcher = MemoryAwareDispatcher(
+        memory_limit=5 * WORKER_MEMORY_OVERHEAD + _process_memory(),
+        n_jobs=4,
+        backend="threading",
+    )
+
+    assert dispatcher(tasks) == list(range(len(durations)))
+    assert peak[0] == 2
+    assert finished[-1] == 0
@@ -0,0 +1,103 @@
+# stdlib
+from pathlib import Path
+import time
+
+# third party
+import pytest
+from sklearn.datasets import load_iris
+
+# autoprognosis absolute
+from autoprognosis.hooks import DefaultHooks, ProfilingHooks
+from autoprognosis.plugins.prediction.classifiers import Classifiers
+from autoprognosis.utils.parallel import budgeted
+import autoprognosis.utils.profiling as profiling
+from autoprognosis.utils.serialization import load_model, save_model
+
+
+def test_record_nested() -> None:
+    with profiling.stage("ignored"):
+        pass
+
+    with profiling.record() as outer:
+        with profiling.stage("fit"):
+            time.sleep(0.01)
+
+        with profiling.record() as inner:
+            with profiling.stage("fit"):
+                pass
+            profiling.add("wait", 1.5)
+
+        with profiling.record(reuse=True) as reused:
+            assert reused is outer
+
+    assert outer.counts == {"fit": 2, "wait": 1}
+    assert inner.counts == {"fit": 1, "wait": 1}
+    assert outer.totals["fit"] >= 0.01
+    assert outer.summary()["wait"] == {"count": 1, "seconds": 1.5}
+
+
+def test_instrumented_stages() -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    model = Classifiers().get("logistic_regression")
+
+    with profiling.record() as timings:
+        model = load_model(save_model(model.fit(X, y)))
+        model.predict_proba(X)
+
+    assert {"prediction.fit", "prediction.predict", "serialization"} <= set(
+        timings.counts
+    )
+
+
+def test_nested_plugins(monkeypatch: pytest.MonkeyPatch) -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    inner = Classifiers().get("logistic_regression").fit(X, y)
+    outer = Classifiers().get("lda").fit(X, y)
+
+    # The outer plugin predicts through the inner one.
+    monkeypatch.setattr(
+        outer, "_predict_proba", lambda X, *args, **kwargs: inner.predict_proba(X)
+    )
+
+    with profiling.record() as timings:
+        outer.predict_proba(X)
+
+    assert timings.counts["prediction.predict"] == 1
+
+
+def test_dispatch_wait() -> None:
+    def stages() -> dict:
+        with profiling.record(reuse=True) as timings:
+            return timings.summary()
+
+    task = budgeted(stages, n_threads=1)
+    time.sleep(0.01)
+
+    assert task()["dispatch_wait"]["seconds"] >= 0.01
+
+
+def test_profiling_hooks(tmp_path: Path) -> None:
+    hooks = ProfilingHooks(
+        tmp_path / "timings.jsonl",
+        prometheus_path=tmp_path / "timings.prom",
+        hooks=DefaultHooks(),
+    )
+    for scope in ["trial", "estimator", "estimator"]:
+        hooks.heartbeat(
+            topic="classification",
+            subtopic="model_search",
+            event_type="timings",
+            scope=scope,
+            name="lda",
+            timings={"metrics": {"count": 2, "seconds": 0.5}},
+        )
+    hooks.heartbeat("classification", "model_search", "performance", score=1)
+    hooks.finish()
+
+    events = profiling.read_jsonl(tmp_path / "timings.jsonl")
+    assert [event["scope"] for event in events] == ["trial", "estimator", "estimator"]
+
+    prometheus = (tmp_path / "timings.prom").read_text()
+    labels = 'topic="classification",estimator="lda",stage="metrics"'
+    assert f"autoprognosis_stage_calls_total{{{labels}}} 4" in prometheus
+    assert f"autoprognosis_stage_seconds_total{{{labels}}} 1.000000" in prometheus
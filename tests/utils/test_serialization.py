@@ -0,0 +1,78 @@
+# stdlib
+import os
+import time
+import tracemalloc
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.utils.serialization import dataframe_hash
+
+
+def test_dataframe_hash() -> None:
+    df = pd.DataFrame(
+        {
+            0: np.arange(100),
+            "b": np.random.randn(100),
+            "c": ["x", "y"] * 50,
+        }
+    )
+    df.loc[3, "b"] = np.nan
+    orig = df.copy()
+
+    ref = dataframe_hash(df)
+
+    # The dataframe is not modified, and the column order does not matter.
+    pd.testing.assert_frame_equal(df, orig)
+    assert dataframe_hash(df[["c", "b", 0]]) == ref
+
+    # The values, dtypes, column names and index are hashed.
+    changed = df.copy()
+    changed.loc[3, "b"] = 0
+    assert dataframe_hash(changed) != ref
+    assert dataframe_hash(df.astype({0: float})) != ref
+    assert dataframe_hash(df.rename(columns={"b": "d"})) != ref
+    assert dataframe_hash(df.set_index(df.index + 1)) != ref
+
+
+def test_dataframe_hash_sampling() -> None:
+    df = pd.DataFrame(np.random.randn(10000, 3), columns=["a", "b", "c"])
+
+    ref = dataframe_hash(df, sample_size=1000)
+    assert ref != dataframe_hash(df)
+    assert dataframe_hash(df, sample_size=20000) == dataframe_hash(df)
+
+    # The first and the last rows are always sampled.
+    changed = df.copy()
+    changed.iloc[-1, 0] += 1
+    assert dataframe_hash(changed, sample_size=1000) != ref
+
+
+@pytest.mark.skipif("HASH_BENCHMARK_GB" not in os.environ, reason="slow")
+def test_dataframe_hash_benchmark() -> None:
+    # e.g. HASH_BENCHMARK_GB=2 pytest tests/utils/test_serialization.py -k benchmark
+    n_columns = 20
+    n_rows = int(float(os.environ["HASH_BENCHMARK_GB"]) * 2**30 / (8 * n_columns))
+    df = pd.DataFrame(
+        np.random.default_rng(0).standard_normal((n_rows, n_columns)),
+        columns=[f"col_{idx}" for idx in range(n_columns)],
+    )
+    size = df.memory_usage(index=False).sum()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    dataframe_hash(df)
+    full_duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    dataframe_hash(df, sample_size=100000)
+    sampled_duration = time.perf_counter() - start
+
+    # A few columns of row hashes at a time, instead of copies of the frame.
+    assert peak < size / 2
+    assert sampled_duration < full_duration / 10
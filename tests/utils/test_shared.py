@@ -0,0 +1,88 @@
+# stdlib
+import os
+from pathlib import Path
+import pickle
+import subprocess
+import sys
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
+# autoprognosis absolute
+import autoprognosis.utils.shared as shared
+from autoprognosis.utils.shared import SharedData, attach, broadcast
+
+
+@pytest.fixture
+def shared_folder(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("SHARED_DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(shared, "SHARE_MIN_BYTES", 0)
+
+    return tmp_path
+
+
+def test_broadcast_frame(shared_folder: Path) -> None:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(
+        {
+            "a": rng.standard_normal(1000),
+            "b": rng.integers(0, 10, 1000),
+            "c": ["x", "y"] * 500,
+            "d": rng.standard_normal(1000),
+        },
+        index=np.arange(1000) * 2,
+    )
+
+    with broadcast(X) as (X_shared,):
+        assert isinstance(X_shared, SharedData)
+        assert len(pickle.dumps(X_shared)) < 10000
+
+        X_attached = attach(pickle.loads(pickle.dumps(X_shared)))
+        pd.testing.assert_frame_equal(X_attached, X)
+
+        # Copy-on-write: the published data is unchanged.
+        X_attached.loc[:, "a"] = 0
+        pd.testing.assert_frame_equal(attach(X_shared), X)
+
+    assert list(shared_folder.iterdir()) == []
+
+
+def test_broadcast_series_and_arrays(shared_folder: Path) -> None:
+    Y = pd.Series(np.arange(1000) % 2, name="target")
+    T = np.linspace(0, 1, 1000)
+
+    with broadcast(Y, T, None, [1, 2]) as (Y_shared, T_shared, empty, horizons):
+        assert isinstance(Y_shared, SharedData)
+        assert isinstance(T_shared, SharedData)
+        assert empty is None
+        assert horizons == [1, 2]
+
+        pd.testing.assert_series_equal(attach(Y_shared), Y)
+        np.testing.assert_array_equal(attach(T_shared), T)
+
+
+def test_broadcast_disabled(shared_folder: Path) -> None:
+    X = pd.DataFrame(np.ones((10, 3)))
+
+    with broadcast(X, enabled=False) as (X_shared,):
+        assert X_shared is X
+        assert attach(X_shared) is X
+
+    assert list(shared_folder.iterdir()) == []
+
+
+def test_sweep_stale_folders(shared_folder: Path) -> None:
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+
+    stale = shared_folder / f"autoprognosis_{dead.pid}_0"
+    alive = shared_folder / f"autoprognosis_{os.getpid()}_0"
+    for folder in [stale, alive]:
+        folder.mkdir()
+
+    with broadcast(np.ones(10)) as (X_shared,):
+        assert X_shared.path.parent.name.startswith(f"autoprognosis_{os.getpid()}_")
+
+    assert sorted(shared_folder.iterdir()) == [alive]